@@ -0,0 +1,116 @@
+"""Per-keystroke code completion latency on a 200-cell notebook.
+
+Simulates typing attribute chains of Blender's API (`bpy.context.object.`,
+`mathutils.Vector(...).`, ...) one character at a time in a new cell, and
+times the completion of every keystroke. Compares the previous worker (a
+new script of the whole notebook, with every docstring rendered, on every
+keystroke) with `CompletionEngine`. Install `fake-bpy-module` for the
+Blender stubs; without them, only the standard library is completed.
+
+    python benchmarks/bench_completion.py [n_cells]
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+import jedi  # noqa: E402
+
+from marimo._ast.compiler import compile_cell  # noqa: E402
+from marimo._messaging.types import Stream  # noqa: E402
+from marimo._runtime.complete import (  # noqa: E402
+    CompletionEngine,
+    _get_completion_options,
+)
+from marimo._runtime.dataflow import DirectedGraph  # noqa: E402
+from marimo._runtime.requests import CompletionRequest  # noqa: E402
+
+TYPED = (
+    "bpy.context.object.location",
+    "bpy.types.Object",
+    "bpy.data.objects.new",
+    "mathutils.Vector((0, 0, 1)).normalized",
+    "obj_42.location",
+    "os.path.join",
+)
+
+
+class _Sink(Stream):
+    def write(self, op: str, data: Dict[Any, Any]) -> None:
+        del op, data
+
+
+def build_graph(n_cells: int) -> DirectedGraph:
+    graph = DirectedGraph()
+    cells = ["import os\nimport bpy\nimport mathutils"] + [
+        f"obj_{i} = bpy.data.objects.new('o{i}', None)\n"
+        f"obj_{i}.location = mathutils.Vector(({i}, 0, 0))"
+        for i in range(1, n_cells)
+    ]
+    for i, code in enumerate(cells):
+        graph.register_cell(str(i), compile_cell(code, cell_id=str(i)))
+    return graph
+
+
+def _complete_previous(
+    graph: DirectedGraph, request: CompletionRequest
+) -> None:
+    """What the worker did per request before `CompletionEngine`."""
+    with graph.lock:
+        codes = [
+            graph.cells[cid].code
+            for cid in graph.topological_order()
+            if cid != request.cell_id
+        ]
+    script = jedi.Script("\n".join(codes + [request.document]))
+    for completion in script.complete():
+        _get_completion_options(completion, script)
+
+
+def measure(complete: Callable[[CompletionRequest], None]) -> list[float]:
+    latencies = []
+    for text in TYPED:
+        # start completing after the first dot
+        for end in range(text.index(".") + 1, len(text) + 1):
+            request = CompletionRequest(
+                id="bench", document=text[:end], cell_id="new"
+            )
+            start = time.perf_counter()
+            complete(request)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(
+        f"{name:<26} {statistics.median(ms):>9.1f} {p99:>9.1f}"
+        f" {sum(ms) / 1000:>9.2f}"
+    )
+
+
+def main() -> None:
+    n_cells = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    graph = build_graph(n_cells)
+    engine = CompletionEngine(graph, _Sink())
+
+    start = time.perf_counter()
+    engine.prewarm()
+    print(f"prewarm: {time.perf_counter() - start:.2f}s")
+    print(f"{len(TYPED)} names typed in a notebook of {n_cells} cells\n")
+
+    print(f"{'':<26} {'p50 (ms)':>9} {'p99 (ms)':>9} {'total (s)':>9}")
+    report("previous", measure(lambda r: _complete_previous(graph, r)))
+    report("engine", measure(engine.handle))
+
+
+if __name__ == "__main__":
+    main()
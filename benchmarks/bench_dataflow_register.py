@@ -0,0 +1,74 @@
+"""Time to build (and tear down) a dataflow graph as the cell count grows.
+
+Cells mimic generated scene-building notebooks: one import cell, then cells
+that each define an object and refer to a few earlier ones. Registering the
+cells in reverse order makes every new edge point against the existing
+order, which exercises cycle detection.
+
+    python benchmarks/bench_dataflow_register.py
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+from marimo._ast.cell import Cell  # noqa: E402
+from marimo._ast.compiler import compile_cell  # noqa: E402
+from marimo._runtime.dataflow import DirectedGraph  # noqa: E402
+
+SIZES = (10, 100, 500, 800, 1000, 2000, 5000)
+
+
+def generate_cells(n_cells: int, seed: int = 0) -> list[tuple[str, Cell]]:
+    rng = random.Random(seed)
+    cells = [("0", compile_cell("import math", cell_id="0"))]
+    for i in range(1, n_cells):
+        parents = rng.sample(range(1, i), min(i - 1, 3))
+        rhs = " + ".join(f"obj_{j}" for j in parents) or "0"
+        code = f"obj_{i} = math.sqrt({i}) + {rhs}"
+        cells.append((str(i), compile_cell(code, cell_id=str(i))))
+    return cells
+
+
+def register_all(
+    cells: list[tuple[str, Cell]]
+) -> tuple[DirectedGraph, float]:
+    graph = DirectedGraph()
+    start = time.perf_counter()
+    for cell_id, cell in cells:
+        graph.register_cell(cell_id, cell)
+    elapsed = time.perf_counter() - start
+    assert not graph.cycles
+    return graph, elapsed
+
+
+def main() -> None:
+    print(
+        f"{'cells':>6} {'register (s)':>14} {'per cell (us)':>14}"
+        f" {'reversed (s)':>14} {'delete (s)':>12}"
+    )
+    for n_cells in SIZES:
+        cells = generate_cells(n_cells)
+        _, reverse = register_all(cells[::-1])
+        graph, register = register_all(cells)
+
+        start = time.perf_counter()
+        for cell_id, _ in cells:
+            graph.delete_cell(cell_id)
+        delete = time.perf_counter() - start
+
+        print(
+            f"{n_cells:>6} {register:>14.4f} "
+            f"{register / n_cells * 1e6:>14.1f} {reverse:>14.4f}"
+            f" {delete:>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Latency/throughput of main-thread dispatch vs. running on the kernel thread.
+
+Runs headless: a fake `bpy.app.timers` loop on this script's main thread
+stands in for Blender's event loop, and a worker thread stands in for the
+kernel thread.
+
+    python benchmarks/bench_main_thread_dispatch.py [n_ops]
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+from marimo._runtime.main_thread import MainThreadDispatcher  # noqa: E402
+
+# Blender redraws at roughly 60Hz when idle
+FRAME_SECONDS = 1 / 60
+
+
+class FakeTimers:
+    """Single-threaded stand-in for `bpy.app.timers`."""
+
+    def __init__(self) -> None:
+        self._due: dict[Callable[[], Optional[float]], float] = {}
+
+    def register(
+        self,
+        function: Callable[[], Optional[float]],
+        first_interval: float = 0,
+        persistent: bool = False,
+    ) -> None:
+        del persistent
+        self._due[function] = time.perf_counter() + first_interval
+
+    def unregister(self, function: Callable[[], Optional[float]]) -> None:
+        self._due.pop(function, None)
+
+    def is_registered(self, function: Callable[[], Optional[float]]) -> bool:
+        return function in self._due
+
+    def run(self, until: threading.Event) -> None:
+        """Event loop: fire due timers, then "redraw" until the next one."""
+        while not until.is_set():
+            now = time.perf_counter()
+            for function, due in list(self._due.items()):
+                if due <= now:
+                    interval = function()
+                    if interval is None:
+                        self.unregister(function)
+                    else:
+                        self._due[function] = time.perf_counter() + interval
+            # a frame's worth of other work, unless a timer asked to be
+            # called again immediately
+            if all(due > time.perf_counter() for due in self._due.values()):
+                time.sleep(FRAME_SECONDS / 4)
+
+
+def small_op(data: list[int], i: int) -> None:
+    data.append(i * i)
+
+
+def bench_thread(n_ops: int) -> tuple[float, list[float]]:
+    data: list[int] = []
+    latencies = []
+    start = time.perf_counter()
+    for i in range(n_ops):
+        t0 = time.perf_counter()
+        small_op(data, i)
+        latencies.append(time.perf_counter() - t0)
+    return time.perf_counter() - start, latencies
+
+
+def bench_dispatch(
+    n_ops: int, batched: bool
+) -> tuple[float, list[float]]:
+    timers = FakeTimers()
+    dispatcher = MainThreadDispatcher(interval=FRAME_SECONDS)
+    dispatcher.start(timers)
+    done = threading.Event()
+    result: dict[str, object] = {}
+
+    def worker() -> None:
+        data: list[int] = []
+        latencies = []
+        start = time.perf_counter()
+        if batched:
+            futures = [
+                dispatcher.submit(small_op, data, i) for i in range(n_ops)
+            ]
+            for future in futures:
+                future.result()
+        else:
+            for i in range(n_ops):
+                t0 = time.perf_counter()
+                dispatcher.call(small_op, data, i)
+                latencies.append(time.perf_counter() - t0)
+        result["elapsed"] = time.perf_counter() - start
+        result["latencies"] = latencies
+        done.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    timers.run(until=done)
+    thread.join()
+    dispatcher.stop()
+    return result["elapsed"], result["latencies"]  # type: ignore
+
+
+def report(name: str, n_ops: int, elapsed: float, lat: list[float]) -> None:
+    line = f"{name:<28} {n_ops / elapsed:>12.0f} ops/s"
+    if lat:
+        lat_ms = sorted(x * 1000 for x in lat)
+        p99 = lat_ms[min(len(lat_ms) - 1, int(len(lat_ms) * 0.99))]
+        line += (
+            f"   p50 {statistics.median(lat_ms):8.3f} ms"
+            f"   p99 {p99:8.3f} ms"
+        )
+    print(line)
+
+
+def main() -> None:
+    n_ops = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{n_ops} small ops\n")
+    report("thread (no dispatch)", n_ops, *bench_thread(n_ops))
+    report("dispatch, batched submit", n_ops, *bench_dispatch(n_ops, True))
+    # one round trip per op is bounded by the frame rate; keep it short
+    n_calls = min(n_ops, 200)
+    report(
+        "dispatch, call per op", n_calls, *bench_dispatch(n_calls, False)
+    )
+
+
+if __name__ == "__main__":
+    main()
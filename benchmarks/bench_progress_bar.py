@@ -0,0 +1,88 @@
+"""Loop overhead of `mo.status.progress_bar`.
+
+Runs a cell that iterates over `range(n)` with an empty loop body, bare and
+wrapped in a progress bar, with and without the rate limit on re-renders
+(`PROGRESS_MAX_UPDATES_PER_SECOND`), and reports the overhead per
+iteration and the number of messages the kernel sent.
+
+    python benchmarks/bench_progress_bar.py [n_iterations]
+"""
+from __future__ import annotations
+
+import math
+import os
+import sys
+import time
+from typing import Any, Dict
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+import marimo._plugins.stateless.status._progress as progress  # noqa: E402
+from marimo._messaging.types import Stream  # noqa: E402
+from marimo._runtime.context import (  # noqa: E402
+    initialize_context,
+    teardown_context,
+)
+from marimo._runtime.requests import (  # noqa: E402
+    AppMetadata,
+    ExecutionRequest,
+)
+from marimo._runtime.runtime import Kernel  # noqa: E402
+
+
+class _CountingSink(Stream):
+    def __init__(self) -> None:
+        self.n_messages = 0
+
+    def write(self, op: str, data: Dict[Any, Any]) -> None:
+        del op, data
+        self.n_messages += 1
+
+
+def measure(code: str) -> tuple[float, int]:
+    """Returns (seconds to run `code` in a cell, messages sent)."""
+    stream = _CountingSink()
+    kernel = Kernel(
+        cell_configs={},
+        app_metadata=AppMetadata(),
+        stream=stream,
+        stdout=None,  # type: ignore[arg-type]
+        stderr=None,  # type: ignore[arg-type]
+        stdin=None,  # type: ignore[arg-type]
+    )
+    initialize_context(kernel=kernel, stream=stream)
+    try:
+        kernel.run([ExecutionRequest(cell_id="setup", code="import marimo")])
+        stream.n_messages = 0
+        start = time.perf_counter()
+        kernel.run([ExecutionRequest(cell_id="loop", code=code)])
+        return time.perf_counter() - start, stream.n_messages
+    finally:
+        teardown_context()
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    bare, _ = measure(f"for _ in range({n}): pass")
+    code = f"for _ in marimo.status.progress_bar(range({n})): pass"
+
+    rate_limit = progress.PROGRESS_MAX_UPDATES_PER_SECOND
+    progress.PROGRESS_MAX_UPDATES_PER_SECOND = math.inf
+    unlimited = measure(code)
+    progress.PROGRESS_MAX_UPDATES_PER_SECOND = rate_limit
+    limited = measure(code)
+
+    print(f"{n} iterations, bare loop: {bare:.3f}s")
+    print(f"{'progress bar':<24} {'total s':>9} {'us/iter':>9} {'msgs':>8}")
+    for name, (seconds, n_messages) in {
+        "every update": unlimited,
+        f"<= {rate_limit:g} updates/s": limited,
+    }.items():
+        overhead = (seconds - bare) / n * 1e6
+        print(f"{name:<24} {seconds:>9.3f} {overhead:>9.2f} {n_messages:>8}")
+
+
+if __name__ == "__main__":
+    main()
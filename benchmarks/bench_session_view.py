@@ -0,0 +1,155 @@
+"""Throughput of kernel messages through the session's distributor.
+
+Sends a mix of kernel messages (console output, cell status, UI element
+removals, completed runs, variables) over a pipe to a `Distributor` whose
+only consumer is `SessionView.add_raw_operation`, as in a `Session`, and
+reports messages per second. Compares the previous decoding (every message
+parsed against the whole `MessageOperation` union) with decoding by op
+name, which parses only the operations the view tracks.
+
+    python benchmarks/bench_session_view.py [n_messages]
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+from marimo._messaging import framing  # noqa: E402
+from marimo._messaging.cell_output import (  # noqa: E402
+    CellChannel,
+    CellOutput,
+)
+from marimo._messaging.ops import (  # noqa: E402
+    CellOp,
+    CompletedRun,
+    MessageOperation,
+    RemoveUIElements,
+    Variables,
+    VariableDeclaration,
+    serialize,
+)
+from marimo._messaging.types import KernelMessage  # noqa: E402
+from marimo._server.session.session_view import SessionView  # noqa: E402
+from marimo._utils.distributor import Distributor  # noqa: E402
+from marimo._utils.parse_dataclass import parse_raw  # noqa: E402
+
+
+def make_messages() -> List[KernelMessage]:
+    """One run of a cell: status changes, console output, and bookkeeping."""
+    ops: List[Any] = [
+        CellOp(cell_id="c", status="queued"),
+        RemoveUIElements(cell_id="c"),
+        CellOp(cell_id="c", status="running", console=[]),
+    ]
+    ops.extend(
+        CellOp(
+            cell_id="c",
+            console=CellOutput(
+                channel=CellChannel.STDOUT,
+                mimetype="text/plain",
+                data=f"line {i}\n",
+            ),
+        )
+        for i in range(12)
+    )
+    ops.extend(
+        [
+            CellOp(
+                cell_id="c",
+                output=CellOutput(
+                    channel=CellChannel.OUTPUT,
+                    mimetype="text/html",
+                    data="<span>done</span>",
+                ),
+                status="idle",
+            ),
+            Variables(
+                variables=[
+                    VariableDeclaration(
+                        name=f"x{i}", declared_by=["c"], used_by=[]
+                    )
+                    for i in range(10)
+                ]
+            ),
+            CompletedRun(),
+        ]
+    )
+    return [(op.name, serialize(op)) for op in ops]
+
+
+def add_raw_operation_by_union(view: SessionView) -> Callable[[Any], None]:
+    """The previous `add_raw_operation`."""
+
+    def add(message: KernelMessage) -> None:
+        @dataclass
+        class _Container:
+            operation: MessageOperation
+
+        operation = parse_raw({"operation": message[1]}, _Container)
+        view.add_operation(operation.operation)
+
+    return add
+
+
+def measure(consumer: Callable[[SessionView], Callable[[Any], None]]) -> float:
+    """Returns messages per second through the distributor."""
+    n = N_MESSAGES
+    run = make_messages()
+    payloads = [framing.dumps(m) for m in run]
+    reader, writer = mp.Pipe(duplex=False)
+    view = SessionView()
+    distributor = Distributor[KernelMessage](
+        reader, decoder=framing.FrameAssembler().feed
+    )
+    received = 0
+    add = consumer(view)
+
+    def count(message: KernelMessage) -> None:
+        nonlocal received
+        add(message)
+        received += 1
+
+    distributor.add_consumer(count)
+
+    def write() -> None:
+        for i in range(n):
+            writer.send_bytes(payloads[i % len(payloads)])
+
+    async def main() -> float:
+        distributor.start()
+        thread = threading.Thread(target=write, daemon=True)
+        start = time.perf_counter()
+        thread.start()
+        while received < n:
+            await asyncio.sleep(0.001)
+        elapsed = time.perf_counter() - start
+        distributor.stop()
+        return n / elapsed
+
+    return asyncio.run(main())
+
+
+N_MESSAGES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def main() -> None:
+    by_union = measure(add_raw_operation_by_union)
+    by_name = measure(lambda view: view.add_raw_operation)
+    print(f"{N_MESSAGES} messages")
+    print(f"{'decoding':<24} {'msgs/s':>10}")
+    print(f"{'whole union':<24} {by_union:>10.0f}")
+    print(f"{'by op name':<24} {by_name:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
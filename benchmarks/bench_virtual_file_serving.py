@@ -0,0 +1,132 @@
+"""Copies and latency per MB when registering and serving virtual files.
+
+Compares the shared-memory backend (used when the kernel is a separate
+process) with the in-process backend (the kernel is a thread of the server,
+as in Blender), for whole-file and range requests. The `/@file/` handler is
+called directly, with the response sent to a sink that only counts bytes.
+"Copies" is the memory allocated while serving, divided by the file size.
+
+    python benchmarks/bench_virtual_file_serving.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)
+
+from starlette.requests import Request  # noqa: E402
+
+from marimo._runtime.virtual_file import (  # noqa: E402
+    VirtualFile,
+    VirtualFileRegistry,
+)
+from marimo._server.api.endpoints.assets import virtual_file  # noqa: E402
+
+SIZES_MB = (1, 10, 100)
+REPEATS = 5
+
+
+class _Context:
+    virtual_files_supported = True
+
+
+def _serve(path: str, range_header: Optional[str] = None) -> int:
+    headers = []
+    if range_header is not None:
+        headers.append((b"range", range_header.encode()))
+    scope: dict[str, Any] = {
+        "type": "http",
+        "method": "GET",
+        "path": "/@file/" + path,
+        "headers": headers,
+        "query_string": b"",
+        "path_params": {"filename_and_length": path},
+    }
+    response = virtual_file(Request(scope))
+    n_bytes = 0
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal n_bytes
+        n_bytes += len(message.get("body", b""))
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request"}
+
+    asyncio.run(response(scope, receive, send))
+    return n_bytes
+
+
+def _serve_previous(path: str, range_header: Optional[str]) -> int:
+    """What the handler did before the in-process backend existed."""
+    del range_header
+    byte_length, key = path.split("-", 1)
+    shm = shared_memory.SharedMemory(name=key)
+    try:
+        return len(bytes(shm.buf)[: int(byte_length)])
+    finally:
+        shm.close()
+
+
+def measure(
+    size_mb: int,
+    in_process: bool,
+    serve: Callable[[str, Optional[str]], int] = _serve,
+    range_header: Optional[str] = None,
+) -> tuple[float, float, float]:
+    """Returns (add ms/MB, serve ms/MB, copies per request)."""
+    buffer = os.urandom(size_mb << 20)
+    registry = VirtualFileRegistry(in_process=in_process)
+    add_s = serve_s = 0.0
+    peak = 0
+    for i in range(REPEATS):
+        vfile = VirtualFile(f"bench{i}-{int(in_process)}.bin", buffer)
+        start = time.perf_counter()
+        registry.add(vfile, _Context())  # type: ignore[arg-type]
+        add_s += time.perf_counter() - start
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        serve(vfile.url[len("./@file/") :], range_header)
+        serve_s += time.perf_counter() - start
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        registry.remove(vfile)
+    registry.shutdown()
+
+    per_mb = 1000 / (REPEATS * size_mb)
+    return add_s * per_mb, serve_s * per_mb, peak / len(buffer)
+
+
+def main() -> None:
+    print(
+        f"{'MB':>5} {'backend':<26} {'add ms/MB':>10} {'serve ms/MB':>12}"
+        f" {'copies':>7}"
+    )
+    for size_mb in SIZES_MB:
+        rows = {
+            "shared memory (previous)": measure(
+                size_mb, False, serve=_serve_previous
+            ),
+            "shared memory": measure(size_mb, False),
+            "in-process": measure(size_mb, True),
+            "in-process, 1MB range": measure(
+                size_mb, True, range_header="bytes=0-1048575"
+            ),
+        }
+        for name, (add, serve, copies) in rows.items():
+            print(
+                f"{size_mb:>5} {name:<26} {add:>10.3f} {serve:>12.3f}"
+                f" {copies:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
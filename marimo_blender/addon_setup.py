@@ -265,23 +265,34 @@ class Server(Executor):
         thread.daemon = True
         thread.start()
 
-    def start(self, port, filename, line_callback=None, finally_callback=None):
+    def start(self, port, filename, execution_mode='THREAD', line_callback=None, finally_callback=None):
+        # Called from Blender's main thread: the dispatcher's timer drains
+        # bpy work queued by notebook cells running on the kernel thread.
+        from marimo._runtime.main_thread import get_dispatcher
+        dispatcher = get_dispatcher()
+        dispatcher.run_cells_on_main_thread = execution_mode == 'MAIN_THREAD'
+        dispatcher.start()
 
         def server_thread_function(port: int, filename: str):
             from marimo._server.start import start
             from marimo._server.utils import find_free_port
-            self._port = find_free_port(port)
-            start(
-                development_mode=True,
-                quiet=False,
-                host="",
-                port=self._port,
-                headless=False,
-                filename=filename or None,
-                mode='edit',
-                include_code=True,
-                watch=False,
-            )
+            try:
+                self._port = find_free_port(port)
+                start(
+                    development_mode=True,
+                    quiet=False,
+                    host="",
+                    port=self._port,
+                    headless=False,
+                    filename=filename or None,
+                    mode='edit',
+                    include_code=True,
+                    watch=False,
+                )
+            finally:
+                # The timer is persistent: without this, it would keep
+                # ticking after the server exits, across file loads.
+                dispatcher.stop()
         self.exec_function(server_thread_function, port, filename, line_callback=line_callback, finally_callback=finally_callback)
 
     def stop(self):
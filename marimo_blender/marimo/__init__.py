@@ -33,6 +33,7 @@ __all__ = [
     "md",
     "mermaid",
     "mpl",
+    "on_main_thread",
     "output",
     "plain_text",
     "pdf",
@@ -83,5 +84,6 @@ from marimo._runtime.capture import (
     redirect_stdout,
 )
 from marimo._runtime.control_flow import MarimoStopError, stop
+from marimo._runtime.main_thread import on_main_thread
 from marimo._runtime.runtime import defs, refs
 from marimo._runtime.state import state
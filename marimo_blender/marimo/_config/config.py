@@ -64,9 +64,14 @@ class RuntimeConfig(TypedDict, total=False):
         run on startup. This only applies when editing a notebook,
         and not when running as an application.
         The default is `True`.
+    - `max_parallel_cells`: maximum number of cells that run at the same
+        time. Cells that don't depend on each other run concurrently on
+        worker threads when this is greater than 1. Disabled when cells are
+        run on Blender's main thread. The default is `1`.
     """
 
     auto_instantiate: bool
+    max_parallel_cells: int
 
 
 @mddoc
@@ -148,7 +153,7 @@ DEFAULT_CONFIG: MarimoConfig = {
     },
     "formatting": {"line_length": 79},
     "keymap": {"preset": "default"},
-    "runtime": {"auto_instantiate": True},
+    "runtime": {"auto_instantiate": True, "max_parallel_cells": 1},
     "save": {
         "autosave": "after_delay",
         "autosave_delay": 1000,
@@ -0,0 +1,102 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Framing of kernel messages sent over a multiprocessing Connection.
+
+A `Connection` pickles each message and sends it in one piece, which
+breaks down for very large messages: the Connection chokes on payloads
+beyond ~32MiB, and the sender is blocked until the reader has consumed the
+whole payload.
+
+Messages that pickle to at most `FRAME_MAX_BYTES` are sent as-is. Larger
+messages are pickled once, split into frames of `FRAME_MAX_BYTES`, and each
+frame is sent as its own `(FRAME_OP, frame)` message; frames of different
+messages may interleave. The reader passes every received message through a
+`FrameAssembler`, which returns ordinary messages unchanged and rebuilds
+framed messages once their last frame arrives.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Iterator, Optional, TypedDict
+
+from marimo import _loggers
+from marimo._messaging.types import KernelMessage
+
+LOGGER = _loggers.marimo_logger()
+
+FRAME_OP = "__marimo-frame__"
+
+FRAME_MAX_BYTES = int(os.getenv("MARIMO_FRAME_MAX_BYTES", 1 << 20))
+
+
+class Frame(TypedDict):
+    # id of the message the frame belongs to, unique per sender
+    message_id: int
+    index: int
+    n_frames: int
+    payload: bytes
+
+
+def dumps(message: KernelMessage) -> memoryview:
+    """Pickle a message the way `Connection.send` does."""
+    return ForkingPickler.dumps(message)  # type: ignore[no-any-return]
+
+
+def split(
+    message_id: int,
+    payload: memoryview,
+    frame_max_bytes: int = FRAME_MAX_BYTES,
+) -> Iterator[KernelMessage]:
+    """Split a pickled message into frame messages."""
+    n_frames = -(-len(payload) // frame_max_bytes)
+    for index in range(n_frames):
+        start = index * frame_max_bytes
+        frame = Frame(
+            message_id=message_id,
+            index=index,
+            n_frames=n_frames,
+            payload=bytes(payload[start : start + frame_max_bytes]),
+        )
+        yield (FRAME_OP, frame)
+
+
+class FrameAssembler:
+    """Rebuilds framed messages on the receiving end."""
+
+    def __init__(self) -> None:
+        self._partial: dict[int, list[bytes]] = {}
+
+    @property
+    def n_pending(self) -> int:
+        """Number of messages that are partially received."""
+        return len(self._partial)
+
+    def feed(self, message: KernelMessage) -> Optional[KernelMessage]:
+        """Process a received message.
+
+        Returns the message itself if it wasn't framed, the rebuilt message
+        if `message` was its last frame, and `None` otherwise.
+        """
+        op, data = message
+        if op != FRAME_OP:
+            return message
+
+        frame: Frame = data
+        parts = self._partial.setdefault(frame["message_id"], [])
+        if frame["index"] != len(parts):
+            LOGGER.error(
+                "Dropping message %s: expected frame %s, got %s",
+                frame["message_id"],
+                len(parts),
+                frame["index"],
+            )
+            del self._partial[frame["message_id"]]
+            return None
+        parts.append(frame["payload"])
+        if len(parts) < frame["n_frames"]:
+            return None
+
+        del self._partial[frame["message_id"]]
+        rebuilt: Any = pickle.loads(b"".join(parts))
+        return rebuilt  # type: ignore[no-any-return]
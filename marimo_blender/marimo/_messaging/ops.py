@@ -29,6 +29,7 @@ from marimo._messaging.cell_output import CellChannel, CellOutput
 from marimo._messaging.completion_option import CompletionOption
 from marimo._messaging.errors import Error
 from marimo._messaging.mimetypes import KnownMimeType
+from marimo._messaging.previews import PreviewCache, format_preview
 from marimo._messaging.streams import OUTPUT_MAX_BYTES
 from marimo._messaging.types import Stream
 from marimo._output.hypertext import Html
@@ -84,37 +85,42 @@ class CellOp(Op):
         mimetype: KnownMimeType, data: str
     ) -> tuple[KnownMimeType, str]:
         if (size := sys.getsizeof(data)) > OUTPUT_MAX_BYTES:
-            from marimo._output.md import md
-            from marimo._plugins.stateless.callout import callout
-
-            text = f"""
-                <span class="text-error">**Your output is too large**</span>
-
-                Your output is too large for marimo to show. It has a size
-                of {size} bytes. Did you output this object by accident?
-
-                If this limitation is a problem for you, you can configure
-                the max output size with the environment variable
-                `MARIMO_OUTPUT_MAX_BYTES`. For example, to increase
-                the max output to 10 MB, use:
-
-                ```
-                export MARIMO_OUTPUT_MAX_BYTES=10_000_000
-                ```
-
-                Increasing the max output size may cause performance issues.
-                If you run into problems, please reach out
-                to us on [Discord](https://discord.gg/JE7nhX6mD8) or
-                [Github](https://github.com/marimo-team/marimo/issues).
-                """
-
-            warning = callout(
-                md(text),
-                kind="warn",
-            )
-            mimetype, data = warning._mime_()
+            mimetype, data = CellOp.output_too_large(size)
         return mimetype, data
 
+    @staticmethod
+    def output_too_large(size: int) -> tuple[KnownMimeType, str]:
+        """The output shown in place of one of `size` bytes."""
+        from marimo._output.md import md
+        from marimo._plugins.stateless.callout import callout
+
+        text = f"""
+            <span class="text-error">**Your output is too large**</span>
+
+            Your output is too large for marimo to show. It has a size
+            of {size} bytes. Did you output this object by accident?
+
+            If this limitation is a problem for you, you can configure
+            the max output size with the environment variable
+            `MARIMO_OUTPUT_MAX_BYTES`. For example, to increase
+            the max output to 10 MB, use:
+
+            ```
+            export MARIMO_OUTPUT_MAX_BYTES=10_000_000
+            ```
+
+            Increasing the max output size may cause performance issues.
+            If you run into problems, please reach out
+            to us on [Discord](https://discord.gg/JE7nhX6mD8) or
+            [Github](https://github.com/marimo-team/marimo/issues).
+            """
+
+        warning = callout(
+            md(text),
+            kind="warn",
+        )
+        return warning._mime_()
+
     @staticmethod
     def broadcast_output(
         channel: CellChannel,
@@ -208,6 +214,23 @@ class CellOp(Op):
         ).broadcast()
 
 
+@dataclass
+class CellOutputAppend(Op):
+    """Op to append an item to a cell's output.
+
+    `mo.output.append` sends only the appended item, instead of the cell's
+    whole output. The cell's output is the vertical stack of the items
+    appended since the output was last set; the item with `index` 0 starts
+    a new stack. Consumers receive whole outputs, merged by the server
+    (see `SessionView`).
+    """
+
+    name: ClassVar[str] = "cell-output-append"
+    cell_id: CellId_t
+    index: int
+    output: CellOutput
+
+
 @dataclass
 class HumanReadableStatus(Op):
     """Human-readable status."""
@@ -248,6 +271,50 @@ class CompletedRun(Op):
     """Written on run completion (of submitted cells and their descendants."""
 
     name: ClassVar[str] = "completed-run"
+    # seconds taken to handle the request
+    run_time: Optional[float] = None
+    # seconds spent running each cell; when cells run in parallel, these
+    # can add up to more than `run_time`
+    cell_run_times: Dict[CellId_t, float] = field(default_factory=dict)
+    # UI value updates that were skipped because a later value for the same
+    # element was already waiting, per element
+    dropped_ui_updates: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class CellProfile:
+    """Where a cell's time went in a profiled run; times are in seconds."""
+
+    cell_id: CellId_t
+    # running the cell's code
+    run_time: float = 0.0
+    # CPU time of the thread that ran the cell's code
+    cpu_time: float = 0.0
+    # cleaning up the cell's previous state: deleting its definitions,
+    # disposing its UI elements and other resources
+    cleanup_time: float = 0.0
+    # formatting the cell's output
+    format_time: float = 0.0
+    # sending the cell's variables, status and output, besides formatting
+    broadcast_time: float = 0.0
+    # size of the messages sent while the cell ran or its results were
+    # broadcast, and the time spent serializing and sending them (which is
+    # included in the times above)
+    bytes_sent: int = 0
+    send_time: float = 0.0
+
+
+@dataclass
+class KernelProfile(Op):
+    """Profile of a run, written after `CompletedRun` if profiling is on."""
+
+    name: ClassVar[str] = "kernel-profile"
+    # seconds taken to handle the request
+    run_time: float
+    cells: List[CellProfile]
+    # the most expensive functions called by the cells' code, as formatted
+    # by `pstats`, if code profiling is on
+    code_profile: Optional[str] = None
 
 
 @dataclass
@@ -321,7 +388,11 @@ class VariableValue:
     value: Optional[str]
 
     def __init__(
-        self, name: str, value: object, datatype: Optional[str] = None
+        self,
+        name: str,
+        value: object,
+        datatype: Optional[str] = None,
+        previews: Optional[PreviewCache] = None,
     ) -> None:
         self.name = name
 
@@ -333,14 +404,13 @@ class VariableValue:
             self.datatype = datatype
 
         try:
-            self.value = self._format_value(value)
+            self.value = self._format_value(value, previews)
         except Exception:
             self.value = None
 
-    def _stringify(self, value: object) -> str:
-        return str(value)[:50]
-
-    def _format_value(self, value: object) -> str:
+    def _format_value(
+        self, value: object, previews: Optional[PreviewCache]
+    ) -> str:
         resolved = value
         if isinstance(value, UIElement):
             resolved = value.value
@@ -348,7 +418,9 @@ class VariableValue:
             resolved = value.text
         elif isinstance(value, ModuleType):
             resolved = value.__name__
-        return self._stringify(resolved)
+        if previews is not None:
+            return previews.preview(resolved)
+        return format_preview(resolved)
 
 
 @dataclass
@@ -359,6 +431,21 @@ class Variables(Op):
     variables: List[VariableDeclaration]
 
 
+@dataclass
+class VariablesDelta(Op):
+    """Changes to the variable declarations since they were last sent.
+
+    Consumers are sent the resulting `Variables`: the server keeps the
+    declarations (see `SessionView`) and applies the changes to them.
+    """
+
+    name: ClassVar[str] = "variables-delta"
+    # declarations that were added or changed
+    variables: List[VariableDeclaration]
+    # names that are no longer declared
+    removed: List[str]
+
+
 @dataclass
 class VariableValues(Op):
     """List of variables and their types/values."""
@@ -369,6 +456,7 @@ class VariableValues(Op):
 
 MessageOperation = Union[
     CellOp,
+    CellOutputAppend,
     HumanReadableStatus,
     Reload,
     Reconnected,
@@ -382,4 +470,6 @@ MessageOperation = Union[
     Banner,
     Variables,
     VariableValues,
+    KernelProfile,
+    VariablesDelta,
 ]
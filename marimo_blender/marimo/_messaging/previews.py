@@ -0,0 +1,256 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Short previews of variables' values, for the variables panel.
+
+The panel shows the first `PREVIEW_MAX_LENGTH` characters of each value,
+which are computed after every run of the cell that defines it. Formatting
+the whole value to keep a few characters can take longer than the cell
+itself, for example for a large array, DataFrame, or collection of `bpy`
+data. `format_preview` formats values the way `reprlib` does: containers
+and bytes are cut short, and arrays, DataFrames, Series and `bpy`
+collections have handlers that only look at their first items. Subclasses
+of these types (such as `OrderedDict` or named tuples) use the same
+handlers.
+"""
+from __future__ import annotations
+
+import reprlib
+import sys
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Optional
+
+PREVIEW_MAX_LENGTH = 50
+
+# Types whose previews are cheap, and not worth caching
+_SIMPLE_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+# Types whose subclasses are formatted by the type's handler; `reprlib`
+# looks handlers up by the name of the value's own type
+_BASE_TYPES: tuple[type, ...] = (
+    dict,
+    list,
+    tuple,
+    set,
+    frozenset,
+    deque,
+    bytes,
+    bytearray,
+)
+
+
+class _PreviewRepr(reprlib.Repr):
+    def __init__(self) -> None:
+        super().__init__()
+        # containers are cut to the preview's length anyway
+        self.maxlevel = 3
+        self.maxtuple = self.maxlist = self.maxarray = 12
+        self.maxdict = self.maxset = self.maxfrozenset = self.maxdeque = 8
+        self.maxstring = self.maxlong = self.maxother = PREVIEW_MAX_LENGTH
+
+    def handles(self, x: Any) -> bool:
+        """Whether `x` has a handler that formats only what is shown."""
+        return (
+            hasattr(self, "repr_" + _type_name(x))
+            or self._base_handler(x) is not None
+        )
+
+    def _base_handler(self, x: Any) -> Optional[str]:
+        for base in _BASE_TYPES:
+            if isinstance(x, base):
+                return "repr_" + base.__name__
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(x, np.ndarray):
+            return "repr_ndarray"
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(x, pd.DataFrame):
+            return "repr_DataFrame"
+        if pd is not None and isinstance(x, pd.Series):
+            return "repr_Series"
+        return None
+
+    def repr1(self, x: Any, level: int) -> str:
+        if hasattr(self, "repr_" + _type_name(x)):
+            return super().repr1(x, level)
+        handler = self._base_handler(x)
+        if handler is None:
+            return self.repr_instance(x, level)
+        if isinstance(x, tuple) and hasattr(x, "_fields"):
+            return self._repr_namedtuple(x, level)
+        preview = getattr(self, handler)(x, level)
+        if isinstance(x, _BASE_TYPES):
+            return f"{type(x).__name__}({preview})"
+        return preview
+
+    def _repr_namedtuple(self, x: Any, level: int) -> str:
+        name = type(x).__name__
+        if level <= 0:
+            return f"{name}(...)"
+        items = [
+            f"{field}={self.repr1(v, level - 1)}"
+            for field, v in islice(zip(x._fields, x), self.maxtuple)
+        ]
+        return f"{name}({self._join(items, len(x))})"
+
+    def repr_bytes(self, x: Any, level: int) -> str:
+        del level
+        # only the bytes that are shown are formatted
+        preview = repr(bytes(x[: self.maxstring]))
+        if len(x) > self.maxstring:
+            preview = preview[:-1] + "..." + preview[-1]
+        return preview
+
+    def repr_bytearray(self, x: Any, level: int) -> str:
+        return f"bytearray({self.repr_bytes(x, level)})"
+
+    def repr_instance(self, x: Any, level: int) -> str:
+        del level
+        try:
+            return repr(x)[: self.maxother]
+        except Exception:
+            return f"<{type(x).__name__} instance>"
+
+    def _join(self, items: list[str], n_items: int) -> str:
+        return ", ".join(items) + (", ..." if n_items > len(items) else "")
+
+    # reprlib sorts dicts and sets, which formats nothing more but takes
+    # time proportional to their size; these keep their order instead
+
+    def _repr_items(
+        self, x: Any, level: int, left: str, right: str, max_items: int
+    ) -> str:
+        if level <= 0:
+            return f"{left}...{right}"
+        items = [self.repr1(v, level - 1) for v in islice(x, max_items)]
+        return f"{left}{self._join(items, len(x))}{right}"
+
+    def repr_dict(self, x: Any, level: int) -> str:
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        items = [
+            f"{self.repr1(k, level - 1)}: {self.repr1(v, level - 1)}"
+            for k, v in islice(x.items(), self.maxdict)
+        ]
+        return f"{{{self._join(items, len(x))}}}"
+
+    def repr_set(self, x: Any, level: int) -> str:
+        if not x:
+            return "set()"
+        return self._repr_items(x, level, "{", "}", self.maxset)
+
+    def repr_frozenset(self, x: Any, level: int) -> str:
+        if not x:
+            return "frozenset()"
+        return self._repr_items(
+            x, level, "frozenset({", "})", self.maxfrozenset
+        )
+
+    def repr_ndarray(self, x: Any, level: int) -> str:
+        np = sys.modules.get("numpy")
+        if np is None or not isinstance(x, np.ndarray):
+            return self.repr_instance(x, level)
+        # only the edge items of a summarized array are formatted
+        return str(
+            np.array2string(
+                x,
+                threshold=self.maxlist,
+                edgeitems=3,
+                max_line_width=PREVIEW_MAX_LENGTH * 2,
+            )
+        )
+
+    def repr_DataFrame(self, x: Any, level: int) -> str:
+        # pandas and polars
+        shape = getattr(x, "shape", None)
+        if not (isinstance(shape, tuple) and len(shape) == 2):
+            return self.repr_instance(x, level)
+        columns = [str(c) for c in islice(x.columns, self.maxlist)]
+        return (
+            f"DataFrame {shape[0]}x{shape[1]}: "
+            f"{self._join(columns, shape[1])}"
+        )
+
+    def repr_Series(self, x: Any, level: int) -> str:
+        # pandas and polars
+        n_items = len(x)
+        if level <= 0:
+            return f"Series[{n_items}]"
+        items = [
+            self.repr1(_to_python(v), level - 1)
+            for v in islice(x, self.maxlist)
+        ]
+        return f"Series[{n_items}]: {self._join(items, n_items)}"
+
+    def repr_bpy_prop_collection(self, x: Any, level: int) -> str:
+        del level
+        n_items = len(x)
+        names = [
+            str(getattr(item, "name", "?"))
+            for item in islice(x, self.maxlist)
+        ]
+        return f"bpy_collection[{n_items}]: {self._join(names, n_items)}"
+
+
+def _type_name(value: Any) -> str:
+    return type(value).__name__.replace(" ", "_")
+
+
+def _to_python(value: Any) -> Any:
+    # NumPy scalars are shown like Python's, as in `str(series)`
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+_repr = _PreviewRepr()
+
+
+def format_preview(value: object) -> str:
+    """A preview of `value`, of at most `PREVIEW_MAX_LENGTH` characters.
+
+    Like `str(value)` cut to length, but without formatting more of the
+    value than the preview shows, for known types.
+    """
+    if isinstance(value, str):
+        return value[:PREVIEW_MAX_LENGTH]
+    if _repr.handles(value):
+        preview = _repr.repr(value)
+    else:
+        preview = str(value)
+    return preview[:PREVIEW_MAX_LENGTH]
+
+
+class PreviewCache:
+    """Previews of objects, cached per object until invalidated.
+
+    An object can only change when code runs, so the kernel calls
+    `invalidate` before it runs code; meanwhile, an object's preview is
+    computed once, however many variables refer to it. The cache keeps
+    the objects alive, so the kernel also calls `invalidate` once it has
+    sent the previews.
+    """
+
+    def __init__(self) -> None:
+        # cells can run in parallel
+        self._lock = threading.Lock()
+        # id of object -> (object, preview); the object is kept so that
+        # its id isn't reused
+        self._previews: dict[int, tuple[object, str]] = {}
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._previews = {}
+
+    def preview(self, value: object) -> str:
+        if isinstance(value, _SIMPLE_TYPES):
+            return format_preview(value)
+        with self._lock:
+            cached = self._previews.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        preview = format_preview(value)
+        with self._lock:
+            self._previews[id(value)] = (value, preview)
+        return preview
@@ -3,14 +3,17 @@ from __future__ import annotations
 
 import contextlib
 import io
+import itertools
 import os
 import sys
 import threading
+import time
 from collections import deque
 from typing import Any, Iterable, Iterator, Optional
 
 from marimo import _loggers
 from marimo._ast.cell import CellId_t
+from marimo._messaging import framing
 from marimo._messaging.cell_output import CellChannel
 from marimo._messaging.console_output_worker import ConsoleMsg, buffered_writer
 from marimo._messaging.types import (
@@ -33,8 +36,8 @@ LOGGER = _loggers.marimo_logger()
 #    of ~32MiB that it can send before it chokes
 #    (https://docs.python.org/3/library/multiprocessing.html#multiprocessing.connection.Connection.send).
 #
-#    TODO(akshayka): Get around this by breaking up the message sent
-#    over the Connection or plumbing the websocket into the kernel.
+#    Large messages are split into frames (see framing.py), so this
+#    reason no longer applies; the limits below exist because of 2.
 #
 # 2. The frontend chokes when we send outputs that are too big, i.e.
 #    it freezes and sometimes even crashes. That can lead to lost work.
@@ -62,9 +65,15 @@ class ThreadSafeStream(Stream):
     ):
         self.pipe = pipe
         self.cell_id = cell_id
+        # ids of messages split into frames
+        self._message_ids = itertools.count()
         # A single stream is shared by the kernel and the code completion
         # worker. The lock should almost always be uncontended.
         self.stream_lock = threading.Lock()
+        # Totals over the stream's lifetime, for profiling: bytes sent, and
+        # seconds spent serializing and sending them
+        self.bytes_written = 0
+        self.write_time = 0.0
 
         # Console outputs are buffered
         self.console_msg_cv = threading.Condition(threading.Lock())
@@ -79,13 +88,41 @@ class ThreadSafeStream(Stream):
         self.input_queue = input_queue
 
     def write(self, op: str, data: dict[Any, Any]) -> None:
-        with self.stream_lock:
-            try:
-                self.pipe.send((op, data))
-            except OSError as e:
-                # Most likely a BrokenPipeError, caused by the
-                # server process shutting down
-                LOGGER.debug("Error when writing (op: %s) to pipe: %s", op, e)
+        """Send a message.
+
+        Messages written by one thread are sent in order. Messages are
+        pickled before the lock is taken, so that other writers aren't held
+        up: when threads (e.g. the kernel and a parallel cell or the code
+        completion worker) write at the same time, their messages are sent
+        in the order that they finish pickling, not in the order `write`
+        was called. Frames of a large message may interleave with other
+        messages.
+        """
+        start = time.perf_counter()
+        payload = framing.dumps((op, data))
+        try:
+            if len(payload) <= framing.FRAME_MAX_BYTES:
+                with self.stream_lock:
+                    self.pipe.send_bytes(payload)
+                    self._count_write(len(payload), start)
+                return
+
+            # Release the lock between frames, so that small messages
+            # (console output, completions) aren't stuck behind a big one
+            message_id = next(self._message_ids)
+            for frame in framing.split(message_id, payload):
+                with self.stream_lock:
+                    self.pipe.send(frame)
+            with self.stream_lock:
+                self._count_write(len(payload), start)
+        except OSError as e:
+            # Most likely a BrokenPipeError, caused by the
+            # server process shutting down
+            LOGGER.debug("Error when writing (op: %s) to pipe: %s", op, e)
+
+    def _count_write(self, n_bytes: int, start: float) -> None:
+        self.bytes_written += n_bytes
+        self.write_time += time.perf_counter() - start
 
 
 def _forward_os_stream(standard_stream: Stdout | Stderr, fd: int) -> None:
@@ -1,7 +1,9 @@
 # Copyright 2024 Marimo. All rights reserved.
 import abc
+import contextlib
 import io
-from typing import Any, Dict, Optional, Tuple
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from marimo._ast.cell import CellId_t
 
@@ -17,7 +19,40 @@ class Stream(abc.ABC):
     The `write` method is called by the kernel.
     """
 
-    cell_id: Optional[CellId_t] = None
+    _cell_id: Optional[CellId_t] = None
+
+    @property
+    def cell_id(self) -> Optional[CellId_t]:
+        """The cell that writes to this stream are attributed to.
+
+        A thread inside `thread_cell_id` sees its own cell; every other
+        thread sees the stream-wide cell.
+        """
+        local = self.__dict__.get("_thread_local")
+        if local is not None:
+            cell_id: Optional[CellId_t] = getattr(local, "cell_id", None)
+            if cell_id is not None:
+                return cell_id
+        return self._cell_id
+
+    @cell_id.setter
+    def cell_id(self, cell_id: Optional[CellId_t]) -> None:
+        self._cell_id = cell_id
+
+    @contextlib.contextmanager
+    def thread_cell_id(self, cell_id: Optional[CellId_t]) -> Iterator[None]:
+        """Attribute writes made by the calling thread to `cell_id`.
+
+        Used when cells run concurrently on several threads.
+        """
+        # created lazily, since subclasses don't call Stream.__init__
+        local = self.__dict__.setdefault("_thread_local", threading.local())
+        previous = getattr(local, "cell_id", None)
+        local.cell_id = cell_id
+        try:
+            yield
+        finally:
+            local.cell_id = previous
 
     @abc.abstractmethod
     def write(self, op: str, data: Dict[Any, Any]) -> None:
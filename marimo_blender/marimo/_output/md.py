@@ -1,9 +1,13 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import functools
+import threading
 from inspect import cleandoc
+from typing import Optional
 
 import markdown  # type: ignore
+from markdown.extensions.footnotes import FootnoteExtension  # type: ignore
 
 from marimo._output.hypertext import Html
 from marimo._output.md_extensions.external_links import ExternalLinksExtension
@@ -32,43 +36,93 @@ extension_configs = {
 }
 
 
-def _md(text: str, apply_markdown_class: bool = True) -> Html:
+_EXTENSIONS = [
+    # Syntax highlighting
+    "codehilite",
+    # Markdown tables
+    "tables",
+    # LaTeX
+    "pymdownx.arithmatex",
+    # Subscripts and strikethrough
+    "pymdownx.tilde",
+    # Better code blocks
+    "pymdownx.superfences",
+    # Table of contents
+    # This adds ids to the HTML headers
+    "toc",
+    # Footnotes
+    "footnotes",
+]
+
+# Number of rendered markdown strings to keep
+MD_CACHE_MAX_ITEMS = 1024
+
+
+class _Renderer:
+    """A reusable `Markdown` instance.
+
+    Creating a `Markdown` instance loads every extension, which costs more
+    than converting most documents, so each thread keeps one (see
+    `_get_renderer`) and resets it between conversions.
+    """
+
+    def __init__(self) -> None:
+        self.markdown = markdown.Markdown(
+            extensions=_EXTENSIONS + [ExternalLinksExtension()],
+            extension_configs=extension_configs,
+        )
+        self._footnotes = next(
+            extension
+            for extension in self.markdown.registeredExtensions
+            if isinstance(extension, FootnoteExtension)
+        )
+        self._footnotes_prefix = self._footnotes.unique_prefix
+
+    def convert(self, text: str) -> str:
+        self.markdown.reset()
+        # resetting bumps the prefix of footnote ids; keep the one a new
+        # instance would use, so that output doesn't depend on history
+        self._footnotes.unique_prefix = self._footnotes_prefix
+        return self.markdown.convert(text)  # type: ignore[no-any-return]
+
+
+_thread_local = threading.local()
+
+
+def _get_renderer() -> _Renderer:
+    renderer: Optional[_Renderer] = getattr(_thread_local, "renderer", None)
+    if renderer is None:
+        renderer = _Renderer()
+        _thread_local.renderer = renderer
+    return renderer
+
+
+@functools.lru_cache(maxsize=MD_CACHE_MAX_ITEMS)
+def _render(text: str, apply_markdown_class: bool) -> str:
     # cleandoc uniformly strips leading whitespace; useful for
     # indented multiline strings
     text = cleandoc(text)
-    # markdown.markdown appends a newline, hence strip
-    html_text = markdown.markdown(
-        text,
-        extensions=[
-            # Syntax highlighting
-            "codehilite",
-            # Markdown tables
-            "tables",
-            # LaTeX
-            "pymdownx.arithmatex",
-            # Subscripts and strikethrough
-            "pymdownx.tilde",
-            # Better code blocks
-            "pymdownx.superfences",
-            # Table of contents
-            # This adds ids to the HTML headers
-            "toc",
-            # Footnotes
-            "footnotes",
-            # Links
-            ExternalLinksExtension(),
-        ],
-        extension_configs=extension_configs,
-    ).strip()
+    # markdown appends a newline, hence strip
+    html_text = _get_renderer().convert(text).strip()
     # replace <p> tags with <span> as HTML doesn't allow nested <div>s in <p>s
     html_text = html_text.replace("<p>", '<span class="paragraph">').replace(
         "</p>", "</span>"
     )
 
     if apply_markdown_class:
-        return Html('<span class="markdown">' + html_text + "</span>")
+        return '<span class="markdown">' + html_text + "</span>"
     else:
-        return Html(html_text)
+        return html_text
+
+
+def _md(text: str, apply_markdown_class: bool = True) -> Html:
+    return Html(_render(text, apply_markdown_class))
+
+
+def md_cache_info() -> dict[str, int]:
+    """Hits, misses and size of the cache of rendered markdown."""
+    info = _render.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
 
 
 @mddoc
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import contextlib
+import os
+import threading
 import time
 from collections.abc import Collection
 from typing import Iterable, Iterator, Optional, TypeVar
@@ -10,17 +12,42 @@ import marimo._runtime.output._output as output
 from marimo._output.hypertext import Html
 from marimo._output.rich_help import mddoc
 from marimo._plugins.core.web_component import build_stateless_plugin
+from marimo._runtime.context import (
+    ContextNotInitializedError,
+    borrow_context,
+    get_context,
+)
 
 S = TypeVar("S")
 T = TypeVar("T")
 
+# Maximum number of times per second a progress indicator is re-rendered;
+# each re-render sends the cell's output to the frontend. Zero or less
+# means no limit.
+PROGRESS_MAX_UPDATES_PER_SECOND = float(
+    os.getenv("MARIMO_PROGRESS_MAX_UPDATES_PER_SECOND", 10)
+)
+
+# Minimum number of seconds between re-renders
+_FLUSH_INTERVAL = (
+    1 / PROGRESS_MAX_UPDATES_PER_SECOND
+    if PROGRESS_MAX_UPDATES_PER_SECOND > 0
+    else 0.0
+)
+
 
 def _remove_none_values(d: dict[S, T]) -> dict[S, T]:
     return {k: v for k, v in d.items() if v is not None}
 
 
 class _Progress(Html):
-    """A mutable class to represent a progress indicator in the UI."""
+    """A mutable class to represent a progress indicator in the UI.
+
+    Updates are rate-limited to `PROGRESS_MAX_UPDATES_PER_SECOND`: an
+    update that comes too soon after the last re-render is recorded, and
+    shown once the interval has passed (by a timer, unless another update,
+    completion, or closing the indicator shows it first).
+    """
 
     def __init__(
         self,
@@ -40,6 +67,13 @@ class _Progress(Html):
         self.show_rate = show_rate
         self.show_eta = show_eta
         self.start_time = time.time()
+        # time of the last re-render, and whether updates were made since
+        self._last_flush_time = time.monotonic()
+        self._has_pending_update = False
+        # re-renders pending updates if no other update comes in time
+        self._timer: Optional[threading.Timer] = None
+        # held while updating, since the timer re-renders from its thread
+        self._lock = threading.Lock()
         super().__init__(self._get_text())
 
     def __del__(self) -> None:
@@ -75,25 +109,75 @@ class _Progress(Html):
                 "Progress indicators cannot be updated after exiting "
                 "the context manager that created them. "
             )
-        self.current += increment
-        if title is not None:
-            self.title = title
-        if subtitle is not None:
-            self.subtitle = subtitle
-
+        with self._lock:
+            self.current += increment
+            if title is not None:
+                self.title = title
+            if subtitle is not None:
+                self.subtitle = subtitle
+
+            self._has_pending_update = True
+            done = self.total is not None and self.current >= self.total
+            delay = self._last_flush_time + _FLUSH_INTERVAL - time.monotonic()
+            if done or delay <= 0:
+                self._flush()
+            elif self._timer is None:
+                self._schedule_flush(delay)
+
+    def _flush(self) -> None:
+        self._cancel_timer()
         self._text = self._get_text()
+        self._last_flush_time = time.monotonic()
+        self._has_pending_update = False
         output.flush()
 
+    def _schedule_flush(self, delay: float) -> None:
+        """Re-render pending updates after `delay` seconds."""
+        try:
+            ctx = get_context()
+        except ContextNotInitializedError:
+            return
+        execution_context = ctx.kernel.execution_context
+        if execution_context is None:
+            return
+
+        def flush() -> None:
+            # re-render as the cell that made the update
+            with borrow_context(ctx), ctx.kernel.thread_execution_context(
+                execution_context
+            ), ctx.stream.thread_cell_id(execution_context.cell_id):
+                with self._lock:
+                    if self._timer is timer and self._has_pending_update:
+                        self._flush()
+
+        timer = threading.Timer(delay, flush)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
     def clear(self) -> None:
         if self.closed:
             raise RuntimeError(
                 "Progress indicators cannot be updated after exiting "
                 "the context manager that created them. "
             )
+        with self._lock:
+            self._cancel_timer()
+            self._has_pending_update = False
         output.remove(self)
 
     def close(self) -> None:
-        self.closed = True
+        with self._lock:
+            # show the final state
+            if self._has_pending_update:
+                self._flush()
+            self._cancel_timer()
+            self.closed = True
 
     def _get_text(self) -> str:
         return build_stateless_plugin(
@@ -285,10 +369,13 @@ def progress_bar(
         show_eta=show_eta,
     )
     output.append(progress)
-    for item in collection:
-        yield item
-        progress.update(increment=step)
-    progress.update(
-        increment=0, title=completion_title, subtitle=completion_subtitle
-    )
-    progress.close()
+    try:
+        for item in collection:
+            yield item
+            progress.update(increment=step)
+        progress.update(
+            increment=0, title=completion_title, subtitle=completion_subtitle
+        )
+    finally:
+        # also stops the pending re-render if the loop is left early
+        progress.close()
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import sys
+import threading
 import weakref
 from typing import Any, Dict, Iterable, TypeVar, Union
 
@@ -26,10 +27,19 @@ class UIElementRegistry:
     def __init__(self) -> None:
         # mapping from object id to UIElement object that has that id
         self._objects: dict[UIElementId, weakref.ref[UIElement[Any, Any]]] = {}
-        # mapping from object id to set of names that are bound to it
+        # mapping from object id to set of names that are bound to it or
+        # to one of its views
         self._bindings: dict[UIElementId, set[str]] = {}
+        # mapping from a global name bound to a UI element to the ids that
+        # it is counted under in `_bindings`: the element's id, followed by
+        # the ids of the elements it is a view of
+        self._bound_ids: dict[str, tuple[UIElementId, ...]] = {}
+        # bindings are updated by cells, which may run in parallel
+        self._bindings_lock = threading.Lock()
         # mapping from object id to cell that created it
         self._constructing_cells: dict[UIElementId, CellId_t] = {}
+        # mapping from object id to seconds to hold back its value updates
+        self._debounce_windows: dict[UIElementId, float] = {}
 
     def register(
         self,
@@ -43,50 +53,60 @@ class UIElementRegistry:
             # here
             self.delete(object_id, id(self._objects[object_id]))
         self._objects[object_id] = weakref.ref(ui_element)
+        self._debounce_windows.pop(object_id, None)
         assert kernel.execution_context is not None
         self._constructing_cells[object_id] = kernel.execution_context.cell_id
-        # bindings must be lazily registered, since there aren't any
-        # bindings at UIElement object creation time
-        if object_id in self._bindings:
-            # If `register` is called on an object_id that is being
-            # reused before `delete` is called, bindings won't have been
-            # cleaned up
-            del self._bindings[object_id]
+        # Bindings are kept across re-registration: names bound to the
+        # element that previously had this id are unbound when the cells
+        # that define them are invalidated.
 
     def bound_names(self, object_id: UIElementId) -> Iterable[str]:
-        if object_id not in self._bindings:
-            self._register_bindings(object_id)
-        return self._bindings[object_id]
-
-    def _has_parent_id(
-        self, child: UIElement[Any, Any], parent_id: UIElementId
-    ) -> bool:
-        """Returns True if `child` has id `parent_id` or is a view of it"""
-        if child._id == parent_id:
-            return True
-        elif child._lens is not None:
-            element_ref = self._objects.get(child._lens.parent_id)
-            element = element_ref() if element_ref is not None else None
-            if element is not None:
-                return self._has_parent_id(element, parent_id)
-        return False
-
-    def _register_bindings(self, object_id: UIElementId) -> None:
-        kernel = get_context().kernel
-        # Get all variable names that are either:
-        #   1. bound to this UI element, or
-        #   2. bound to a view (child) of this element
-        names = set(
-            [
-                name
-                for name in kernel.globals
-                if (
-                    isinstance(kernel.globals[name], UIElement)
-                    and self._has_parent_id(kernel.globals[name], object_id)
-                )
-            ]
-        )
-        self._bindings[object_id] = names
+        """Global names bound to this element or to a view of it."""
+        with self._bindings_lock:
+            return set(self._bindings.get(object_id, ()))
+
+    def bind(self, name: str, value: Any) -> None:
+        """Record that the global `name` was (re)defined as `value`.
+
+        The kernel calls this for the definitions of every cell it runs, so
+        that bindings are indexed instead of being searched for in the
+        globals.
+        """
+        with self._bindings_lock:
+            self._unbind(name)
+            if not isinstance(value, UIElement):
+                return
+            object_ids = self._lens_chain(value)
+            self._bound_ids[name] = object_ids
+            for object_id in object_ids:
+                self._bindings.setdefault(object_id, set()).add(name)
+
+    def unbind(self, name: str) -> None:
+        """Record that the global `name` was deleted."""
+        with self._bindings_lock:
+            self._unbind(name)
+
+    def _unbind(self, name: str) -> None:
+        for object_id in self._bound_ids.pop(name, ()):
+            names = self._bindings.get(object_id)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._bindings[object_id]
+
+    def _lens_chain(
+        self, element: UIElement[Any, Any]
+    ) -> tuple[UIElementId, ...]:
+        """The element's id, followed by the ids of the elements it views"""
+        object_ids = [element._id]
+        while element._lens is not None:
+            element_ref = self._objects.get(element._lens.parent_id)
+            parent = element_ref() if element_ref is not None else None
+            if parent is None:
+                break
+            object_ids.append(parent._id)
+            element = parent
+        return tuple(object_ids)
 
     def get_object(self, object_id: UIElementId) -> UIElement[Any, Any]:
         if object_id not in self._objects:
@@ -103,6 +123,18 @@ class UIElementRegistry:
     def get_cell(self, object_id: UIElementId) -> CellId_t:
         return self._constructing_cells[object_id]
 
+    def set_debounce_window(
+        self, object_id: UIElementId, seconds: float
+    ) -> None:
+        if seconds <= 0:
+            self._debounce_windows.pop(object_id, None)
+        else:
+            self._debounce_windows[object_id] = seconds
+
+    def debounce_window(self, object_id: UIElementId) -> float:
+        """Seconds to hold back value updates of an element, if any."""
+        return self._debounce_windows.get(object_id, 0.0)
+
     def resolve_lens(
         self, object_id: UIElementId, value: LensValue[T]
     ) -> tuple[str, LensValue[T]]:
@@ -154,7 +186,6 @@ class UIElementRegistry:
         if ui_element is not None:
             del self._objects[object_id]
             ui_element._dispose()
-        if object_id in self._bindings:
-            del self._bindings[object_id]
         if object_id in self._constructing_cells:
             del self._constructing_cells[object_id]
+        self._debounce_windows.pop(object_id, None)
@@ -367,6 +367,39 @@ class UIElement(Html, Generic[S, T], metaclass=abc.ABCMeta):
             on_change=on_change,
         )
 
+    @mddoc
+    def debounce_updates(self, seconds: float) -> UIElement[S, T]:
+        """Apply this element's value updates at most once per `seconds`.
+
+        Dragging a slider sends a stream of value updates, and each one
+        re-runs the cells that use the slider. The kernel already skips
+        updates that are superseded by one waiting behind them. With a
+        debounce window, it also waits up to `seconds` after an update
+        for the ones that follow, and applies only the last value. This
+        is useful when the dependent cells are expensive, like cells that
+        rebuild a Blender mesh.
+
+        **Example.**
+
+        ```python
+        subdivisions = mo.ui.slider(0, 6).debounce_updates(0.2)
+        ```
+
+        **Args.**
+
+        - `seconds`: the debounce window, in seconds
+
+        **Returns.**
+
+        - This element
+        """
+        try:
+            ctx = get_context()
+        except ContextNotInitializedError:
+            return self
+        ctx.ui_element_registry.set_debounce_window(self._id, seconds)
+        return self
+
     def _update(self, value: S) -> None:
         """Update value, given a value from the frontend
 
@@ -4,10 +4,13 @@ from __future__ import annotations
 import base64
 import dataclasses
 import datetime as dt
+import io
+import os
 import traceback
 from dataclasses import dataclass
 from typing import (
     Any,
+    BinaryIO,
     Callable,
     Final,
     List,
@@ -26,6 +29,7 @@ from marimo._plugins.core.web_component import JSONType
 from marimo._plugins.ui._core.ui_element import S as JSONTypeBound
 from marimo._plugins.ui._core.ui_element import UIElement
 from marimo._runtime.functions import Function
+from marimo._runtime.uploads import map_file, parse_upload_reference
 
 LOGGER = _loggers.marimo_logger()
 
@@ -752,10 +756,71 @@ class button(UIElement[Any, Any]):
 
 @dataclass
 class FileUploadResults:
-    """A file's name and its contents."""
+    """A file's name and its contents.
+
+    A file that was streamed to the server (see `marimo._runtime.uploads`)
+    stays on disk, at `path`, and its `contents` are read from disk each
+    time they're accessed; use `open()` or `buffer()` to avoid loading a
+    large file into memory. For other files, `path` is `None`.
+    """
 
     name: str
-    contents: bytes
+    contents: bytes = b""
+    path: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        if self.path is None:
+            return len(self._contents)
+        return os.path.getsize(self.path)
+
+    def open(self) -> BinaryIO:
+        """Open the file for reading, as a binary file-like object."""
+        if self.path is None:
+            return io.BytesIO(self._contents)
+        return open(self.path, "rb")
+
+    def buffer(self) -> memoryview:
+        """A read-only view of the file's bytes, memory-mapped if on disk."""
+        if self.path is None:
+            return memoryview(self._contents).toreadonly()
+        return map_file(self.path)
+
+    # Comparing and showing a file on disk doesn't read it
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileUploadResults):
+            return NotImplemented
+        if self.path is not None or other.path is not None:
+            return (self.name, self.path) == (other.name, other.path)
+        return (self.name, self._contents) == (other.name, other._contents)
+
+    def __repr__(self) -> str:
+        if self.path is None:
+            return (
+                f"FileUploadResults(name={self.name!r}, "
+                f"contents={self._contents!r})"
+            )
+        return f"FileUploadResults(name={self.name!r}, path={self.path!r})"
+
+
+def _get_contents(self: FileUploadResults) -> bytes:
+    if self.path is None:
+        return self._contents
+    with open(self.path, "rb") as f:
+        return f.read()
+
+
+def _set_contents(self: FileUploadResults, contents: bytes) -> None:
+    self._contents = contents
+
+
+# `contents` stays a dataclass field (for `dataclasses.asdict`, `replace`,
+# ...), but the contents of a file on disk are only read on access
+FileUploadResults.contents = property(  # type: ignore[assignment]
+    _get_contents, _set_contents
+)
 
 
 @mddoc
@@ -772,7 +837,11 @@ class file(UIElement[List[Tuple[str, str]], Sequence[FileUploadResults]]):
     Use the `kind` argument to switch between a button and a drop-and-drop
     area.
 
-    The maximum file size is 100MB.
+    Files are streamed to the server, and aren't loaded into memory: they
+    are stored on disk until the session closes, and their `path`,
+    `open()` and `buffer()` give access to them without reading them
+    whole. A session's uploads are limited to 10GB in total; set
+    `MARIMO_UPLOAD_SESSION_QUOTA_BYTES` to change the limit.
 
     **Examples.**
 
@@ -812,7 +881,7 @@ class file(UIElement[List[Tuple[str, str]], Sequence[FileUploadResults]]):
     **Attributes.**
 
     - `value`: a sequence of `FileUploadResults`, which have string `name` and
-               `bytes` `contents` fields
+               `bytes` `contents` fields, and an optional `path` on disk
 
     **Methods.**
 
@@ -861,10 +930,18 @@ class file(UIElement[List[Tuple[str, str]], Sequence[FileUploadResults]]):
     def _convert_value(
         self, value: list[tuple[str, str]]
     ) -> Sequence[FileUploadResults]:
-        return tuple(
-            FileUploadResults(name=e[0], contents=base64.b64decode(e[1]))
-            for e in value
-        )
+        results = []
+        for name, data in value:
+            path = parse_upload_reference(data)
+            if path is not None:
+                results.append(FileUploadResults(name=name, path=path))
+            else:
+                results.append(
+                    FileUploadResults(
+                        name=name, contents=base64.b64decode(data)
+                    )
+                )
+        return tuple(results)
 
     def name(self, index: int = 0) -> Optional[str]:
         """Get file name at index."""
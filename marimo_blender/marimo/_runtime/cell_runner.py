@@ -1,9 +1,12 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import cProfile
 import sys
+import time
 import traceback
-from collections.abc import Container
+from collections import deque
+from collections.abc import Container, Iterable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -12,6 +15,7 @@ from marimo._ast.compiler import cell_id_from_filename
 from marimo._loggers import marimo_logger
 from marimo._runtime import dataflow
 from marimo._runtime.control_flow import MarimoInterrupt, MarimoStopError
+from marimo._runtime.main_thread import get_dispatcher
 from marimo._runtime.marimo_pdb import MarimoPdb
 
 LOGGER = marimo_logger()
@@ -100,7 +104,7 @@ class Runner:
         # runtime globals
         self.glbls = glbls
         # cells that the runner will run.
-        self.cells_to_run = dataflow.topological_sort(graph, cell_ids)
+        self.cells_to_run = deque(dataflow.topological_sort(graph, cell_ids))
         # map from a cell that was cancelled to its descendants that have
         # not yet run:
         self.cells_cancelled: dict[CellId_t, set[CellId_t]] = {}
@@ -108,6 +112,25 @@ class Runner:
         self.interrupted = False
         # mapping from cell_id to exception it raised
         self.exceptions: dict[CellId_t, BaseException] = {}
+        # mapping from cell_id to the seconds it took to run
+        self.run_times: dict[CellId_t, float] = {}
+        # ... and to the CPU time of the thread that ran it
+        self.cpu_times: dict[CellId_t, float] = {}
+        # if set, enabled while cells' code runs; cProfile can only profile
+        # one thread at a time, so don't set it for parallel runs
+        self.code_profiler: Optional[cProfile.Profile] = None
+
+        # For parallel runs (see `pop_ready_cell`): the number of unfinished
+        # cells in this run that each queued cell depends on, the cells with
+        # no such dependencies, and the number of cells popped but not yet
+        # finished. Built on first use.
+        self._n_waiting_on: Optional[dict[CellId_t, int]] = None
+        self._ready: deque[CellId_t] = deque()
+        self._n_in_flight = 0
+        # ready cells put back with `defer`, until a cell finishes
+        self._deferred: list[CellId_t] = []
+        # descendants of cells, computed once per run (see `related_to_any`)
+        self._descendants: dict[CellId_t, set[CellId_t]] = {}
 
         # each cell's position in the run queue
         self._run_position = {
@@ -115,12 +138,14 @@ class Runner:
         }
 
     def cancel(self, cell_id: CellId_t) -> None:
-        """Mark a cell (and its descendants) as cancelled."""
-        self.cells_cancelled[cell_id] = set(
-            cid
-            for cid in dataflow.transitive_closure(self.graph, set([cell_id]))
-            if cid in self.cells_to_run
-        )
+        """Mark a cell (and its descendants) as cancelled.
+
+        Like all bookkeeping of the run queue, must be called on the thread
+        that pops cells, not on the thread that ran the cell.
+        """
+        self.cells_cancelled[cell_id] = dataflow.transitive_closure(
+            self.graph, set([cell_id])
+        ).intersection(self.cells_to_run)
 
     def cancelled(self, cell_id: CellId_t) -> bool:
         """Return whether a cell has been cancelled."""
@@ -209,7 +234,101 @@ class Runner:
 
     def pop_cell(self) -> CellId_t:
         """Get the next cell to run."""
-        return self.cells_to_run.pop(0)
+        return self.cells_to_run.popleft()
+
+    def pop_ready_cell(self) -> Optional[CellId_t]:
+        """Get a cell that can run concurrently with the in-flight cells.
+
+        A cell is ready once every cell in this run that it depends on has
+        been passed to `finish`. Returns `None` if no cell is ready yet.
+        Cells are returned in topological order among the ready cells.
+        """
+        if self._n_waiting_on is None:
+            self._build_schedule()
+        if self._ready:
+            cell_id = self._ready.popleft()
+        elif self._n_in_flight == 0 and self._deferred:
+            # no cell is left to finish and make deferred cells ready
+            cell_id = self._deferred.pop(0)
+        elif self._n_in_flight == 0 and self.cells_to_run:
+            # Nothing is running and nothing is ready: only possible if the
+            # queued cells depend on each other cyclically. Run them in
+            # queue order rather than deadlocking.
+            cell_id = self.cells_to_run[0]
+        else:
+            return None
+        self.cells_to_run.remove(cell_id)
+        self._n_in_flight += 1
+        return cell_id
+
+    def cancel_if_failed(
+        self, cell_id: CellId_t, run_result: RunResult
+    ) -> None:
+        """Cancel a cell's descendants if it raised or called `mo.stop`."""
+        exception = run_result.exception
+        if exception is not None and not isinstance(
+            exception, MarimoInterrupt
+        ):
+            self.cancel(cell_id)
+
+    def defer(self, cell_id: CellId_t) -> None:
+        """Put back a cell returned by `pop_ready_cell`.
+
+        The cell is ready again once another cell finishes; meanwhile,
+        `pop_ready_cell` returns the other ready cells.
+        """
+        self._n_in_flight -= 1
+        self.cells_to_run.appendleft(cell_id)
+        self._deferred.append(cell_id)
+
+    def related_to_any(
+        self, cell_id: CellId_t, cell_ids: Iterable[CellId_t]
+    ) -> bool:
+        """Whether any of `cell_ids` is an ancestor or descendant of a cell."""
+        descendants = self._get_descendants(cell_id)
+        return any(
+            other in descendants or cell_id in self._get_descendants(other)
+            for other in cell_ids
+        )
+
+    def _get_descendants(self, cell_id: CellId_t) -> set[CellId_t]:
+        descendants = self._descendants.get(cell_id)
+        if descendants is None:
+            descendants = dataflow.transitive_closure(self.graph, {cell_id})
+            self._descendants[cell_id] = descendants
+        return descendants
+
+    def finish(self, cell_id: CellId_t) -> None:
+        """Mark a cell returned by `pop_ready_cell` as done.
+
+        Must be called whether the cell ran, failed, or was skipped.
+        """
+        assert self._n_waiting_on is not None
+        self._n_in_flight -= 1
+        # deferred cells go first, in the order they were popped
+        self._ready.extendleft(reversed(self._deferred))
+        self._deferred.clear()
+        for child in self.graph.children[cell_id]:
+            if child not in self._n_waiting_on:
+                continue
+            self._n_waiting_on[child] -= 1
+            if self._n_waiting_on[child] == 0:
+                del self._n_waiting_on[child]
+                self._ready.append(child)
+
+    def _build_schedule(self) -> None:
+        # The kernel runs sets of cells closed under descendants, so a
+        # cell's dependencies in the run are among its direct parents.
+        queued = set(self.cells_to_run)
+        self._n_waiting_on = {}
+        for cell_id in self.cells_to_run:
+            n_parents = sum(
+                parent in queued for parent in self.graph.parents[cell_id]
+            )
+            if n_parents:
+                self._n_waiting_on[cell_id] = n_parents
+            else:
+                self._ready.append(cell_id)
 
     def print_traceback(self) -> None:
         """Print a traceback to stderr.
@@ -219,11 +338,32 @@ class Runner:
         error_msg = format_traceback(self.graph)
         sys.stderr.write(error_msg)
 
+    def _execute(self, cell_id: CellId_t) -> Any:
+        """Execute a cell's code on the calling thread."""
+        start = time.thread_time()
+        code_profiler = self.code_profiler
+        if code_profiler is not None:
+            code_profiler.enable()
+        try:
+            return execute_cell(self.graph.cells[cell_id], self.glbls)
+        finally:
+            if code_profiler is not None:
+                code_profiler.disable()
+            self.cpu_times[cell_id] = time.thread_time() - start
+
     def run(self, cell_id: CellId_t) -> RunResult:
-        """Run a cell."""
-        cell = self.graph.cells[cell_id]
+        """Run a cell.
+
+        Can be called on a worker thread, so it doesn't touch the run queue:
+        the caller must pass the result to `cancel_if_failed`.
+        """
+        dispatcher = get_dispatcher()
+        start = time.perf_counter()
         try:
-            return_value = execute_cell(cell, self.glbls)
+            if dispatcher.run_cells_on_main_thread:
+                return_value = dispatcher.call(self._execute, cell_id)
+            else:
+                return_value = self._execute(cell_id)
             run_result = RunResult(output=return_value, exception=None)
         except MarimoInterrupt as e:
             # User interrupt
@@ -233,8 +373,7 @@ class Runner:
             self.print_traceback()
         except MarimoStopError as e:
             # Raised by mo.stop().
-            # cancel only the descendants of this cell
-            self.cancel(cell_id)
+            # only the descendants of this cell will be cancelled
             run_result = RunResult(output=e.output, exception=e)
             # don't print a traceback, since quitting is the intended
             # behavior (like sys.exit())
@@ -243,10 +382,10 @@ class Runner:
             # - KeyboardInterrupt shouldn't be raised, since marimo
             #   redirects it to a MarimoInterrupt
             # - SystemExit should kill the process
-            self.cancel(cell_id)
             run_result = RunResult(output=None, exception=e)
             self.print_traceback()
         finally:
+            self.run_times[cell_id] = time.perf_counter() - start
             # if a debugger is active, force it to skip past marimo code.
             try:
                 # Bdb defines the botframe attribute and sets it to non-None
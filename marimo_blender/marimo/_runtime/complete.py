@@ -2,17 +2,25 @@
 from __future__ import annotations
 
 import html
-from typing import cast
+import os
+import re
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Union, cast
 
 import jedi  # type: ignore # noqa: F401
 import jedi.api  # type: ignore # noqa: F401
 
 from marimo import _loggers as loggers
+from marimo._ast.cell import Cell, CellId_t
 from marimo._messaging.completion_option import CompletionOption
 from marimo._messaging.ops import CompletionResult
 from marimo._messaging.types import Stream
 from marimo._output.md import _md
 from marimo._runtime import dataflow
+from marimo._runtime.live_completion import LiveCompleter, LiveCompletion
 from marimo._runtime.requests import CompletionRequest
 from marimo._server.types import QueueType
 from marimo._utils.format_signature import format_signature
@@ -20,6 +28,26 @@ from marimo._utils.rst_to_html import convert_rst_to_html
 
 LOGGER = loggers.marimo_logger()
 
+# Seconds spent rendering the completion info of a result's options.
+# Rendering docstrings dominates the cost of long completion lists (such as
+# the members of `bpy.types`), so options left when the time is up carry no
+# info; their info is rendered by the next requests, as it is cached.
+INFO_TIME_BUDGET = 0.2
+
+# Completion infos of names outside the notebook, which don't change
+_INFO_CACHE_MAX_ITEMS = 2048
+
+# Completed when the worker starts, so that the first completion of a
+# Blender name doesn't pay for parsing the (large) stubs of its module
+_PREWARM_DOCUMENTS = (
+    "import bpy\nbpy.types.",
+    "import bpy\nbpy.context.",
+    "import mathutils\nmathutils.",
+)
+
+# The identifier being typed at the end of a document
+_TYPED_NAME = re.compile(r"\w*$")
+
 
 def _is_dunder_name(name: str) -> bool:
     return name.startswith("__") and name.endswith("__")
@@ -152,7 +180,9 @@ def _get_completion_info(completion: jedi.api.classes.BaseName) -> str:
 
 
 def _get_completion_options(
-    completion: jedi.api.classes.BaseName, script: jedi.Script
+    completion: jedi.api.classes.BaseName,
+    script: jedi.Script,
+    info_cache: Optional[OrderedDict[tuple[str, ...], str]] = None,
 ) -> CompletionOption:
     name = completion.name
     kind = completion.type
@@ -165,13 +195,46 @@ def _get_completion_options(
         signatures = script.get_signatures()
         if len(signatures) == 1:
             symbol_to_lookup = signatures[0]
-    completion_info = _get_completion_info(symbol_to_lookup)
+
+    key = _info_cache_key(symbol_to_lookup)
+    if info_cache is None or key is None:
+        completion_info = _get_completion_info(symbol_to_lookup)
+    elif key in info_cache:
+        info_cache.move_to_end(key)
+        completion_info = info_cache[key]
+    else:
+        completion_info = _get_completion_info(symbol_to_lookup)
+        info_cache[key] = completion_info
+        if len(info_cache) > _INFO_CACHE_MAX_ITEMS:
+            info_cache.popitem(last=False)
 
     return CompletionOption(
         name=name, type=kind, completion_info=completion_info
     )
 
 
+def _info_cache_key(
+    completion: jedi.api.classes.BaseName,
+) -> Optional[tuple[str, ...]]:
+    """Key under which the info of a completion can be cached, if any.
+
+    Names defined in the notebook are not cached, since their code changes.
+    """
+    try:
+        module_name = completion.module_name
+        full_name = completion.full_name
+    except Exception:
+        return None
+    if (
+        not full_name
+        or not module_name
+        or module_name == "__main__"
+        or completion.type == "statement"
+    ):
+        return None
+    return (completion.type, module_name, full_name)
+
+
 def _write_completion_result(
     stream: Stream,
     completion_id: str,
@@ -200,89 +263,277 @@ def _drain_queue(
     return request
 
 
-def complete(
-    completion_queue: QueueType[CompletionRequest],
-    graph: dataflow.DirectedGraph,
-    stream: Stream,
-) -> None:
-    """Code completion worker"""
+_Candidate = Union[jedi.api.classes.Completion, LiveCompletion]
 
-    while True:
-        request = _drain_queue(completion_queue)
+
+def _sort_like_jedi(completions: list[_Candidate], typed: str) -> None:
+    completions.sort(
+        key=lambda c: (
+            not c.name.startswith(typed),
+            c.name.startswith("__"),
+            c.name.startswith("_"),
+            c.name.lower(),
+        )
+    )
+
+
+@dataclass
+class _Completions:
+    """Candidates of the last completion."""
+
+    # the document, without the name being typed
+    base: str
+    # the name being typed when the candidates were computed
+    typed: str
+    generation: int
+    script: jedi.Script
+    completions: list[_Candidate]
+
+
+class CompletionEngine:
+    """Completes code in the context of the notebook's other cells.
+
+    State is kept across requests, so that a keystroke only pays for what
+    changed:
+
+    - the code of the other cells is joined only when the graph changes
+      or the request comes from another cell;
+    - while a name is being typed, the candidates computed for its first
+      characters are filtered instead of being recomputed;
+    - scripts share one jedi project, and one path, so that jedi's parser
+      only re-parses the lines that changed since the last script (the
+      edited document, or the cells that changed);
+    - docstrings are rendered within a time budget, and are cached for
+      names that don't belong to the notebook.
+
+    When given the kernel's namespace, the attributes of live objects
+    (see `LiveCompleter`) are merged with jedi's completions.
+    """
+
+    def __init__(
+        self,
+        graph: dataflow.DirectedGraph,
+        stream: Stream,
+        namespace: Optional[dict[str, Any]] = None,
+    ):
+        self.graph = graph
+        self.stream = stream
+        self._live = (
+            LiveCompleter(namespace) if namespace is not None else None
+        )
+        # the cells whose code makes up the context, and the cell being
+        # edited, as of the last request
+        self._cells: list[Cell] = []
+        self._cell_id: Optional[CellId_t] = None
+        self._context = ""
+        # incremented whenever the context changes
+        self._generation = 0
+        self._last: Optional[_Completions] = None
+        self._info_cache: OrderedDict[tuple[str, ...], str] = OrderedDict()
+        self._project = jedi.Project(os.getcwd())
+        # parsed code is cached per path; the file doesn't exist, and each
+        # engine has its own, since the cached tree is updated in place
+        self._path = os.path.join(
+            os.getcwd(), f"__marimo_completion_{secrets.token_hex(8)}__.py"
+        )
+
+    def prewarm(self) -> None:
+        """Load the stubs of large modules ahead of the first request."""
+        for document in _PREWARM_DOCUMENTS:
+            try:
+                jedi.Script(document, project=self._project).complete()
+            except Exception as e:
+                LOGGER.debug("Failed to prewarm completions: %s", str(e))
+
+    def handle(self, request: CompletionRequest) -> None:
         if not request.document.strip():
-            _write_no_completions(stream, request.id)
-            continue
-
-        with graph.lock:
-            codes = [
-                graph.cells[cid].code
-                for cid in dataflow.topological_sort(
-                    graph,
-                    set(graph.cells.keys()) - set([request.cell_id]),
-                )
-            ]
+            _write_no_completions(self.stream, request.id)
+            return
 
+        self._update_context(request.cell_id)
         try:
-            script = jedi.Script("\n".join(codes + [request.document]))
-            completions = script.complete()
-            prefix_length = (
-                completions[0].get_completion_prefix_length()
-                if completions
-                else 0
+            self._complete(request)
+        except Exception as e:
+            # jedi failed to provide completion
+            LOGGER.debug("Completion with jedi failed: %s", str(e))
+            _write_no_completions(self.stream, request.id)
+
+    def _update_context(self, cell_id: CellId_t) -> None:
+        with self.graph.lock:
+            cells = [
+                self.graph.cells[cid]
+                for cid in self.graph.topological_order()
+                if cid != cell_id
+            ]
+        # registering a cell replaces its Cell object
+        if cell_id == self._cell_id and len(cells) == len(self._cells):
+            if all(a is b for a, b in zip(cells, self._cells)):
+                return
+        self._cells = cells
+        self._cell_id = cell_id
+        self._context = "\n".join(cell.code for cell in cells)
+        self._generation += 1
+        self._last = None
+
+    def _script(self, document: str) -> jedi.Script:
+        # the new script's parse updates the tree of the previous one
+        self._last = None
+        code = self._context + "\n" + document if self._context else document
+        return jedi.Script(code, path=self._path, project=self._project)
+
+    def _candidates(
+        self, document: str
+    ) -> tuple[jedi.Script, list[_Candidate], int]:
+        """The script and completions of a document, and the prefix length.
+
+        Reuses the candidates of the last completion when the document only
+        extends the name that was being typed.
+        """
+        typed = cast(re.Match[str], _TYPED_NAME.search(document)).group()
+        base = document[: len(document) - len(typed)]
+        last = self._last
+        if (
+            last is not None
+            and last.generation == self._generation
+            and last.base == base
+            and typed.lower().startswith(last.typed.lower())
+        ):
+            lowered = typed.lower()
+            completions = [
+                c
+                for c in last.completions
+                if c.name.lower().startswith(lowered)
+            ]
+            _sort_like_jedi(completions, typed)
+            return last.script, completions, len(typed)
+
+        script = self._script(document)
+        completions: list[_Candidate] = script.complete()
+        prefix_length = (
+            completions[0].get_completion_prefix_length()
+            if completions
+            else 0
+        )
+        live = self._live.complete(document) if self._live else None
+        if live:
+            completions = self._merge(completions, live, typed)
+            prefix_length = len(typed)
+        if completions and prefix_length == len(typed):
+            self._last = _Completions(
+                base=base,
+                typed=typed,
+                generation=self._generation,
+                script=script,
+                completions=completions,
+            )
+        return script, completions, prefix_length
+
+    @staticmethod
+    def _merge(
+        completions: list[_Candidate],
+        live: list[LiveCompletion],
+        typed: str,
+    ) -> list[_Candidate]:
+        """Add live attributes that jedi didn't find."""
+        names = {c.name for c in completions}
+        lowered = typed.lower()
+        merged = completions + [
+            c
+            for c in live
+            if c.name not in names and c.name.lower().startswith(lowered)
+        ]
+        _sort_like_jedi(merged, typed)
+        return merged
+
+    def _option(
+        self, completion: _Candidate, script: jedi.Script, info: bool
+    ) -> CompletionOption:
+        if isinstance(completion, LiveCompletion):
+            return CompletionOption(
+                name=completion.name,
+                type=completion.type,
+                completion_info=completion.completion_info,
             )
+        if info:
+            return _get_completion_options(
+                completion, script, self._info_cache
+            )
+        return CompletionOption(
+            name=completion.name, type=completion.type, completion_info=None
+        )
 
-            # Only complete an empty symbol (prefix length == 0) when we're
-            # using dot notation; this prevents autocomplete from kicking in at
-            # awkward times, such as when parentheses are first opened
-            if (
-                prefix_length == 0
-                and len(request.document) >= 1
-                and request.document[-1] != "."
-            ):
-                # Don't complete ...
-                completions = []
-
-                # Get docstring in function context. A bit of a hack, since
-                # this isn't actually a completion, just a tooltip.
-                #
-                # If no completions, we might be getting a signature ...
-                # for example, if the document is "mo.ui.slider(start=1,
-                signatures = script.get_signatures()
-                if signatures:
-                    _write_completion_result(
-                        stream=stream,
-                        completion_id=request.id,
-                        prefix_length=0,
-                        options=[
-                            CompletionOption(
-                                name=signatures[0].name,
-                                type="tooltip",
-                                completion_info=_get_completion_info(
-                                    signatures[0]
-                                ),
-                            )
-                        ],
-                    )
-                    continue
-
-            if not completions:
-                # If there are still no completions, then bail.
-                _write_no_completions(stream, request.id)
-                continue
-
-            prefix = request.document[-prefix_length:]
-            options = [
-                _get_completion_options(c, script)
-                for c in completions
-                if _should_include_name(c.name, prefix)
-            ]
-            _write_completion_result(
-                stream=stream,
-                completion_id=request.id,
-                prefix_length=prefix_length,
-                options=options,
+    def _complete(self, request: CompletionRequest) -> None:
+        script, completions, prefix_length = self._candidates(
+            request.document
+        )
+
+        # Only complete an empty symbol (prefix length == 0) when we're
+        # using dot notation; this prevents autocomplete from kicking in at
+        # awkward times, such as when parentheses are first opened
+        if (
+            prefix_length == 0
+            and len(request.document) >= 1
+            and request.document[-1] != "."
+        ):
+            # Don't complete ...
+            completions = []
+
+            # Get docstring in function context. A bit of a hack, since
+            # this isn't actually a completion, just a tooltip.
+            #
+            # If no completions, we might be getting a signature ...
+            # for example, if the document is "mo.ui.slider(start=1,
+            signatures = script.get_signatures()
+            if signatures:
+                _write_completion_result(
+                    stream=self.stream,
+                    completion_id=request.id,
+                    prefix_length=0,
+                    options=[
+                        CompletionOption(
+                            name=signatures[0].name,
+                            type="tooltip",
+                            completion_info=_get_completion_info(
+                                signatures[0]
+                            ),
+                        )
+                    ],
+                )
+                return
+
+        if not completions:
+            # If there are still no completions, then bail.
+            _write_no_completions(self.stream, request.id)
+            return
+
+        prefix = request.document[-prefix_length:] if prefix_length else ""
+        completions = [
+            c for c in completions if _should_include_name(c.name, prefix)
+        ]
+        deadline = time.monotonic() + INFO_TIME_BUDGET
+        options = [
+            self._option(
+                c, script, info=i == 0 or time.monotonic() < deadline
             )
-        except Exception as e:
-            # jedi failed to provide completion
-            LOGGER.debug("Completion with jedi failed: ", str(e))
-            _write_no_completions(stream, request.id)
+            for i, c in enumerate(completions)
+        ]
+        _write_completion_result(
+            stream=self.stream,
+            completion_id=request.id,
+            prefix_length=prefix_length,
+            options=options,
+        )
+
+
+
+def complete(
+    completion_queue: QueueType[CompletionRequest],
+    graph: dataflow.DirectedGraph,
+    stream: Stream,
+    namespace: Optional[dict[str, Any]] = None,
+) -> None:
+    """Code completion worker"""
+    engine = CompletionEngine(graph, stream, namespace)
+    engine.prewarm()
+    while True:
+        engine.handle(_drain_queue(completion_queue))
@@ -100,11 +100,15 @@ _THREAD_LOCAL_CONTEXT = _ThreadLocalContext()
 
 
 def initialize_context(
-    kernel: Kernel, stream: Stream, virtual_files_supported: bool = True
+    kernel: Kernel,
+    stream: Stream,
+    virtual_files_supported: bool = True,
+    virtual_files_in_process: bool = False,
 ) -> None:
     """Initializes thread-local/session-specific context.
 
-    Must be called exactly once for each client thread.
+    Must be called exactly once for each client thread. Pass
+    `virtual_files_in_process` if the server runs in the kernel's process.
     """
     from marimo._plugins.ui._core.registry import UIElementRegistry
     from marimo._runtime.virtual_file import VirtualFileRegistry
@@ -119,7 +123,9 @@ def initialize_context(
             ui_element_registry=UIElementRegistry(),
             function_registry=FunctionRegistry(),
             cell_lifecycle_registry=CellLifecycleRegistry(),
-            virtual_file_registry=VirtualFileRegistry(),
+            virtual_file_registry=VirtualFileRegistry(
+                in_process=virtual_files_in_process
+            ),
             virtual_files_supported=virtual_files_supported,
             stream=stream,
         )
@@ -132,6 +138,23 @@ def teardown_context() -> None:
     _THREAD_LOCAL_CONTEXT.runtime_context = None
 
 
+@contextmanager
+def borrow_context(
+    runtime_context: Optional[RuntimeContext],
+) -> Iterator[None]:
+    """Temporarily install a runtime context on the current thread.
+
+    Lets another thread (such as a host application's main thread) run
+    kernel work on behalf of a session.
+    """
+    previous = _THREAD_LOCAL_CONTEXT.runtime_context
+    _THREAD_LOCAL_CONTEXT.runtime_context = runtime_context
+    try:
+        yield
+    finally:
+        _THREAD_LOCAL_CONTEXT.runtime_context = previous
+
+
 def get_context() -> RuntimeContext:
     """Return the runtime context.
 
@@ -0,0 +1,98 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Reading of the kernel's control queue.
+
+Interacting with a UI element, like dragging a slider, sends a stream of
+`SetUIElementValueRequest`s; handled one at a time, each would re-run the
+cells that depend on the element, although only the last value matters.
+`ControlQueueReader` merges UI value updates that are waiting in the queue
+into a single request, keeping the last value per element.
+"""
+from __future__ import annotations
+
+import queue
+import time
+from typing import Any, Callable, Optional
+
+from marimo._runtime.requests import (
+    ControlRequest,
+    SetUIElementValueRequest,
+    UIElementId,
+)
+from marimo._server.types import QueueType
+
+
+class ControlQueueReader:
+    """Reads control requests, merging consecutive UI value updates.
+
+    An element can have a debounce window (see
+    `UIElement.debounce_updates`): a merged request that updates it is held
+    back until that many seconds after its first update, to absorb the
+    updates that follow. Other requests are never delayed, and are never
+    reordered with respect to UI value updates.
+
+    **Args.**
+
+    - `control_queue`: the queue to read from
+    - `debounce_window`: seconds to hold back an update to an element
+    """
+
+    def __init__(
+        self,
+        control_queue: QueueType[ControlRequest],
+        debounce_window: Callable[[UIElementId], float],
+    ) -> None:
+        self._queue = control_queue
+        self._debounce_window = debounce_window
+        # a request read while merging, to return next
+        self._pending: Optional[ControlRequest] = None
+        # number of updates, per element, superseded by a later value in
+        # the last request returned
+        self.dropped: dict[UIElementId, int] = {}
+
+    def get(self) -> ControlRequest:
+        """Get the next request, blocking until there is one."""
+        self.dropped = {}
+        if self._pending is not None:
+            request, self._pending = self._pending, None
+        else:
+            request = self._queue.get()
+        if not isinstance(request, SetUIElementValueRequest):
+            return request
+
+        start = time.monotonic()
+        values: dict[UIElementId, Any] = {}
+        deadline = self._merge(values, request, start, start)
+        while True:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    next_request = self._queue.get(timeout=remaining)
+                else:
+                    next_request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(next_request, SetUIElementValueRequest):
+                self._pending = next_request
+                break
+            deadline = self._merge(values, next_request, start, deadline)
+
+        return SetUIElementValueRequest(ids_and_values=list(values.items()))
+
+    def _merge(
+        self,
+        values: dict[UIElementId, Any],
+        request: SetUIElementValueRequest,
+        start: float,
+        deadline: float,
+    ) -> float:
+        """Merge `request` into `values`, returning the new deadline."""
+        for object_id, value in request.ids_and_values:
+            if object_id in values:
+                self.dropped[object_id] = self.dropped.get(object_id, 0) + 1
+                # keep the order of the latest updates
+                del values[object_id]
+            else:
+                window = self._debounce_window(object_id)
+                deadline = max(deadline, start + window)
+            values[object_id] = value
+        return deadline
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import threading
+from collections import deque
 from collections.abc import Collection
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
@@ -16,6 +17,111 @@ Edge = Tuple[CellId_t, CellId_t]
 LOGGER = _loggers.marimo_logger()
 
 
+class TopologicalOrder:
+    """A topological order of an acyclic graph, maintained incrementally.
+
+    Implements the dynamic topological sort of Pearce and Kelly: inserting
+    an edge that agrees with the current order is O(1); otherwise only the
+    nodes whose positions lie between the edge's endpoints are visited and
+    reordered. A search that reaches the edge's source detects a cycle.
+
+    The order is only meaningful while the graph is acyclic; once a cycle is
+    introduced, it is invalidated and must be rebuilt after the cycle is
+    broken.
+    """
+
+    def __init__(self) -> None:
+        self.position: dict[CellId_t, int] = {}
+        self.valid = True
+        self._next_position = 0
+        # All nodes, sorted by position; reset whenever the order changes
+        self._sorted: Optional[list[CellId_t]] = None
+
+    def add_node(self, cell_id: CellId_t) -> None:
+        self.position[cell_id] = self._next_position
+        self._next_position += 1
+        self._sorted = None
+
+    def remove_node(self, cell_id: CellId_t) -> None:
+        self.position.pop(cell_id, None)
+        self._sorted = None
+
+    def sorted_nodes(self) -> list[CellId_t]:
+        """All nodes in order; cached until the order next changes.
+
+        Only meaningful while the order is valid.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self.position, key=self.position.__getitem__)
+        return self._sorted
+
+    def add_edge(
+        self,
+        u: CellId_t,
+        v: CellId_t,
+        children: dict[CellId_t, set[CellId_t]],
+        parents: dict[CellId_t, set[CellId_t]],
+    ) -> bool:
+        """Reorder so that `u` precedes `v`, for a new edge (u, v).
+
+        Returns `False` if the edge would close a cycle, in which case the
+        order is left untouched.
+        """
+        position = self.position
+        lower, upper = position[v], position[u]
+        if upper < lower:
+            return True
+
+        # Descendants of v that are currently ordered before u
+        forward: list[CellId_t] = []
+        seen = set((v,))
+        stack = [v]
+        while stack:
+            cid = stack.pop()
+            forward.append(cid)
+            for child in children[cid]:
+                if child == u:
+                    return False
+                if child not in seen and position[child] < upper:
+                    seen.add(child)
+                    stack.append(child)
+
+        # Ancestors of u that are currently ordered after v
+        backward: list[CellId_t] = []
+        seen = set((u,))
+        stack = [u]
+        while stack:
+            cid = stack.pop()
+            backward.append(cid)
+            for parent in parents[cid]:
+                if parent not in seen and position[parent] > lower:
+                    seen.add(parent)
+                    stack.append(parent)
+
+        # Ancestors of u move before descendants of v, reusing the positions
+        # the affected nodes already occupy.
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        affected = backward + forward
+        slots = sorted(position[cid] for cid in affected)
+        for cid, slot in zip(affected, slots):
+            position[cid] = slot
+        self._sorted = None
+        return True
+
+    def rebuild(
+        self,
+        cells: Collection[CellId_t],
+        children: dict[CellId_t, set[CellId_t]],
+    ) -> None:
+        """Recompute the order from scratch; invalid if the graph is cyclic."""
+        self.position = {}
+        self._next_position = 0
+        for cid in _kahn(cells, children):
+            self.add_node(cid)
+        self.valid = len(self.position) == len(cells)
+
+
 # TODO(akshayka): Add method disable_cell, enable_cell which handle
 # state transitions on cells
 @dataclass(frozen=True)
@@ -42,9 +148,22 @@ class DirectedGraph:
     # A mapping from defs to the cells that define them
     definitions: dict[Name, set[CellId_t]] = field(default_factory=dict)
 
+    # A mapping from names to the cells that refer to them (reverse index
+    # of each cell's refs)
+    references: dict[Name, set[CellId_t]] = field(default_factory=dict)
+
     # The set of cycles in the graph
     cycles: set[tuple[Edge, ...]] = field(default_factory=set)
 
+    # Cells that are disabled, either explicitly (via config) or because an
+    # ancestor is disabled. Maintained as cells are registered, deleted,
+    # enabled and disabled. If a cell is in this set, so are its descendants.
+    disabled_cells: set[CellId_t] = field(default_factory=set)
+
+    # A topological order of the cells, maintained as edges are added so
+    # that cycle detection only searches the neighbourhood of a new edge
+    order: TopologicalOrder = field(default_factory=TopologicalOrder)
+
     # This lock must be acquired during methods that mutate the graph; it's
     # only needed because a graph is shared between the kernel and the code
     # completion service. It should almost always be uncontended.
@@ -65,26 +184,67 @@ class DirectedGraph:
 
     def get_referring_cells(self, name: Name) -> set[CellId_t]:
         """Get all cells that have a ref to `name`."""
-        return set([cid for cid in self.cells if name in self.cells[cid].refs])
+        return set(self.references.get(name, ()))
 
     def get_path(self, source: CellId_t, dst: CellId_t) -> list[Edge]:
         """Get a path from `source` to `dst`, if any."""
         if source == dst:
             return []
 
-        queue: list[tuple[CellId_t, list[Edge]]] = [(source, [])]
-        found = set()
+        # breadth-first search, recording how each cell was reached
+        predecessor: dict[CellId_t, CellId_t] = {source: source}
+        queue = deque((source,))
         while queue:
-            node, path = queue.pop(0)
-            found.add(node)
+            node = queue.popleft()
             for cid in self.children[node]:
-                if cid not in found:
-                    next_path = path + [(node, cid)]
-                    if cid == dst:
-                        return next_path
-                    queue.append((cid, next_path))
+                if cid in predecessor:
+                    continue
+                predecessor[cid] = node
+                if cid == dst:
+                    path: list[Edge] = []
+                    while cid != source:
+                        path.append((predecessor[cid], cid))
+                        cid = predecessor[cid]
+                    path.reverse()
+                    return path
+                queue.append(cid)
         return []
 
+    def topological_order(self) -> list[CellId_t]:
+        """All cells in a topological order.
+
+        The order is cached until the graph changes. Cells on cycles are
+        omitted. Callers must not mutate the returned list.
+        """
+        if self.order.valid:
+            return self.order.sorted_nodes()
+        return _kahn(self.cells, self.children)
+
+    def _add_edge(self, u: CellId_t, v: CellId_t) -> None:
+        """Add the edge (u, v), recording the cycle it closes, if any."""
+        if v in self.children[u]:
+            return
+
+        if self.order.valid:
+            closes_cycle = not self.order.add_edge(
+                u, v, self.children, self.parents
+            )
+            if closes_cycle:
+                self.order.valid = False
+        else:
+            # The graph already has a cycle, so the order can't be used to
+            # rule out a path from v to u
+            closes_cycle = True
+
+        if closes_cycle:
+            # if there is a path from v to u, then the new edge forms a cycle
+            path = self.get_path(v, u)
+            if path:
+                self.cycles.add(tuple([(u, v)] + path))
+
+        self.children[u].add(v)
+        self.parents[v].add(u)
+
     def register_cell(self, cell_id: CellId_t, cell: Cell) -> None:
         """Add a cell to the graph.
 
@@ -96,18 +256,19 @@ class DirectedGraph:
             assert cell_id not in self.cells
             self.cells[cell_id] = cell
             # Children are the set of cells that refer to a name defined in
-            # `cell`
-            children: set[CellId_t] = set()
+            # `cell`; parents are the set of cells that define a name
+            # referred to by `cell`
+            self.children[cell_id] = set()
+            self.parents[cell_id] = set()
             # Cells that define the same name as this one
             siblings: set[CellId_t] = set()
-            # Parents are the set of cells that define a name referred to by
-            # `cell`
-            parents: set[CellId_t] = set()
+            self.siblings[cell_id] = siblings
+            self.order.add_node(cell_id)
+
+            for name in cell.refs:
+                self.references.setdefault(name, set()).add(cell_id)
 
             # Populate children, siblings, and parents
-            self.children[cell_id] = children
-            self.siblings[cell_id] = siblings
-            self.parents[cell_id] = parents
             for name in cell.defs:
                 self.definitions.setdefault(name, set()).add(cell_id)
                 for sibling in self.definitions[name]:
@@ -117,39 +278,24 @@ class DirectedGraph:
 
                 # a cell can refer to its own defs, but that doesn't add an
                 # edge to the dependency graph
-                referring_cells = self.get_referring_cells(name) - set(
-                    (cell_id,)
-                )
-                # we will add an edge (cell_id, v) for each v in
-                # referring_cells; if there is a path from v to cell_id, then
-                # the new edge will form a cycle
-                for v in referring_cells:
-                    path = self.get_path(v, cell_id)
-                    if path:
-                        self.cycles.add(tuple([(cell_id, v)] + path))
-
-                children.update(referring_cells)
-                for child in referring_cells:
-                    self.parents[child].add(cell_id)
+                for child in self.references.get(name, ()):
+                    if child != cell_id:
+                        self._add_edge(cell_id, child)
 
             for name in cell.refs:
-                other_ids = (
-                    self.definitions[name]
-                    if name in self.definitions
-                    else set()
-                ) - set((cell_id,))
-                # if other is empty, this means that the user is going to
-                # get a NameError once the cell is run, unless the symbol
+                # if there are no definers, this means that the user is going
+                # to get a NameError once the cell is run, unless the symbol
                 # is say a builtin
-                for other_id in other_ids:
-                    parents.add(other_id)
-                    # we are adding an edge (other_id, cell_id). If there
-                    # is a path from cell_id to other_id, then the new
-                    # edge forms a cycle
-                    path = self.get_path(cell_id, other_id)
-                    if path:
-                        self.cycles.add(tuple([(other_id, cell_id)] + path))
-                    self.children[other_id].add(cell_id)
+                for other_id in self.definitions.get(name, ()):
+                    if other_id != cell_id:
+                        self._add_edge(other_id, cell_id)
+
+            # A new cell can only disable its descendants if it is itself
+            # disabled
+            if cell.config.disabled or any(
+                p in self.disabled_cells for p in self.parents[cell_id]
+            ):
+                self._mark_disabled(cell_id)
 
     def disable_cell(self, cell_id: CellId_t) -> None:
         """
@@ -162,6 +308,7 @@ class DirectedGraph:
         if cell_id not in self.cells:
             raise ValueError(f"Cell {cell_id} not found")
 
+        self._mark_disabled(cell_id)
         for cid in transitive_closure(self, set([cell_id])) - set([cell_id]):
             cell = self.cells[cid]
             if not cell.stale:
@@ -180,7 +327,9 @@ class DirectedGraph:
             raise ValueError(f"Cell {cell_id} not found")
 
         cells_to_run: set[CellId_t] = set()
-        for cid in transitive_closure(self, set([cell_id])):
+        descendants = transitive_closure(self, set([cell_id]))
+        self._refresh_disabled(descendants)
+        for cid in descendants:
             if not self.is_disabled(cid):
                 child = self.cells[cid]
                 if child.stale:
@@ -212,6 +361,13 @@ class DirectedGraph:
                     # graph
                     del self.definitions[name]
 
+            # ... and from its refs' referrer sets
+            for name in self.cells[cell_id].refs:
+                name_refs = self.references[name]
+                name_refs.remove(cell_id)
+                if not name_refs:
+                    del self.references[name]
+
             # Remove cycles that are broken from removing this cell.
             edges = [(cell_id, child) for child in self.children[cell_id]] + [
                 (parent, cell_id) for parent in self.parents[cell_id]
@@ -223,44 +379,63 @@ class DirectedGraph:
 
             # Grab a reference to children before we remove it from our map.
             children = self.children[cell_id]
+            was_disabled = cell_id in self.disabled_cells
+            self.disabled_cells.discard(cell_id)
+
+            # Purge this cell from the graph; edges and sibling relations are
+            # symmetric, so only this cell's neighbours need updating.
+            for parent in self.parents[cell_id]:
+                self.children[parent].discard(cell_id)
+            for child in children:
+                self.parents[child].discard(cell_id)
+            for sibling in self.siblings[cell_id]:
+                self.siblings[sibling].discard(cell_id)
 
-            # Purge this cell from the graph.
             del self.cells[cell_id]
             del self.children[cell_id]
             del self.parents[cell_id]
             del self.siblings[cell_id]
+            # removing a node never invalidates a topological order, but it
+            # may break the cycles that did
+            self.order.remove_node(cell_id)
+            if not self.order.valid and not self.cycles:
+                self.order.rebuild(self.cells, self.children)
 
-            for elems in self.parents.values():
-                if cell_id in elems:
-                    elems.remove(cell_id)
-            for elems in self.children.values():
-                if cell_id in elems:
-                    elems.remove(cell_id)
-            for elems in self.siblings.values():
-                if cell_id in elems:
-                    elems.remove(cell_id)
+            if was_disabled:
+                # children may have been disabled only through this cell
+                self._refresh_disabled(transitive_closure(self, children))
 
             return children
 
     def is_disabled(self, cell_id: CellId_t) -> bool:
         if cell_id not in self.cells:
             raise ValueError(f"Cell {cell_id} not in graph.")
-        cell = self.cells[cell_id]
-        if cell.config.disabled:
-            return True
-        seen: set[CellId_t] = set()
-        queue = [cell_id]
+        return cell_id in self.disabled_cells
+
+    def _mark_disabled(self, cell_id: CellId_t) -> None:
+        """Add `cell_id` and its descendants to the disabled cells."""
+        self.disabled_cells.add(cell_id)
+        queue = deque((cell_id,))
         while queue:
-            cid = queue.pop()
-            seen.add(cid)
-            for parent_id in self.parents[cid]:
-                if parent_id in seen:
-                    continue
-                elif self.cells[parent_id].config.disabled:
-                    return True
-                else:
-                    queue.append(parent_id)
-        return False
+            for child in self.children[queue.popleft()]:
+                # descendants of disabled cells are already disabled
+                if child not in self.disabled_cells:
+                    self.disabled_cells.add(child)
+                    queue.append(child)
+
+    def _refresh_disabled(self, cell_ids: set[CellId_t]) -> None:
+        """Recompute whether the cells in `cell_ids` are disabled.
+
+        `cell_ids` must be closed under taking descendants.
+        """
+        self.disabled_cells.difference_update(cell_ids)
+        for cid in cell_ids:
+            if cid in self.disabled_cells:
+                continue
+            if self.cells[cid].config.disabled or any(
+                p in self.disabled_cells for p in self.parents[cid]
+            ):
+                self._mark_disabled(cid)
 
     # these two helper functions could be written as concise
     # `any` expressions using assignment expressions, but
@@ -284,13 +459,13 @@ def transitive_closure(
     graph: DirectedGraph, cell_ids: set[CellId_t]
 ) -> set[CellId_t]:
     """Return a set of the passed-in cells and their descendants."""
-    cells = set()
-    queue = list(cell_ids)
+    cells = set(cell_ids)
+    queue = deque(cell_ids)
     while queue:
-        cid = queue.pop(0)
-        cells.add(cid)
+        cid = queue.popleft()
         for child_id in graph.children[cid]:
             if child_id not in cells:
+                cells.add(child_id)
                 queue.append(child_id)
     return cells
 
@@ -321,19 +496,38 @@ def get_cycles(
     return [c for c in graph.cycles if all(e in induced_edges for e in c)]
 
 
-def topological_sort(
-    graph: DirectedGraph, cell_ids: Collection[CellId_t]
+def _kahn(
+    cell_ids: Collection[CellId_t],
+    children: dict[CellId_t, set[CellId_t]],
 ) -> list[CellId_t]:
-    """Sort `cell_ids` in a topological order."""
-    parents, children = induced_subgraph(graph, cell_ids)
-    roots = [cid for cid in cell_ids if not parents[cid]]
+    """Kahn's algorithm on the subgraph induced by `cell_ids`.
+
+    Cells on (or downstream of) a cycle are omitted.
+    """
+    in_degree = dict.fromkeys(cell_ids, 0)
+    for cid in in_degree:
+        for child in children[cid]:
+            if child in in_degree:
+                in_degree[child] += 1
+    roots = deque(cid for cid, degree in in_degree.items() if degree == 0)
     sorted_cell_ids = []
     while roots:
-        cid = roots.pop(0)
+        cid = roots.popleft()
         sorted_cell_ids.append(cid)
         for child in children[cid]:
-            parents[child].remove(cid)
-            if not parents[child]:
-                roots.append(child)
-    # TODO make sure parents for each id is empty, otherwise cycle
+            if child in in_degree:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    roots.append(child)
     return sorted_cell_ids
+
+
+def topological_sort(
+    graph: DirectedGraph, cell_ids: Collection[CellId_t]
+) -> list[CellId_t]:
+    """Sort `cell_ids` in a topological order."""
+    if graph.order.valid:
+        # any order of the whole graph is an order of its induced subgraphs
+        return sorted(cell_ids, key=graph.order.position.__getitem__)
+    # TODO make sure parents for each id is empty, otherwise cycle
+    return _kahn(cell_ids, graph.children)
@@ -0,0 +1,284 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Completion of attributes of live objects in the kernel's namespace.
+
+Static analysis can't see attributes that only exist at runtime, such as
+the items of `bpy.data` collections, the nodes of a geometry-node tree, or
+classes generated by add-ons. For a document ending in `receiver.name`,
+the receiver is evaluated in the kernel's globals and its attributes are
+listed.
+
+Only a restricted subset of expressions is evaluated: names, attribute
+access and subscripts with a literal key. Nothing written in Python is run,
+since it could run arbitrary code: no calls, properties or other
+descriptors whose `__get__` is written in Python, `__getattr__`,
+`__getattribute__`, `__getitem__` or `__dir__` methods written in Python,
+or a module's `__getattr__`/`__dir__` (PEP 562). Inside Blender, the
+evaluation runs on the main thread, where `bpy` is safe to use, and is
+abandoned if it doesn't finish within a time budget.
+"""
+from __future__ import annotations
+
+import ast
+import functools
+import inspect
+import os
+import re
+import time
+import types
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from marimo import _loggers
+from marimo._runtime.main_thread import get_dispatcher
+
+LOGGER = _loggers.marimo_logger()
+
+# Seconds to wait for a receiver to be evaluated and its attributes listed
+LIVE_COMPLETION_TIME_BUDGET = float(
+    os.getenv("MARIMO_LIVE_COMPLETION_TIME_BUDGET", 0.05)
+)
+
+_TYPE_CACHE_MAX_ITEMS = 1024
+
+# Longest line searched for a receiver
+_MAX_LINE_CHARS = 500
+
+# The identifier being typed at the end of a document
+_TYPED_NAME = re.compile(r"\w*$")
+
+
+@dataclass
+class LiveCompletion:
+    """An attribute of a live object."""
+
+    name: str
+    # kind of symbol, named like jedi's completion types
+    type: str
+    completion_info: Optional[str] = None
+
+
+class _Unsafe(Exception):
+    pass
+
+
+class LiveCompleter:
+    """Lists the attributes of receivers evaluated in a namespace.
+
+    The listing of a type whose instances can't have attributes of their
+    own (C types such as `bpy` structs and `mathutils` values) is cached
+    per type.
+    """
+
+    def __init__(
+        self,
+        namespace: dict[str, Any],
+        time_budget: float = LIVE_COMPLETION_TIME_BUDGET,
+    ) -> None:
+        self.namespace = namespace
+        self.time_budget = time_budget
+        self._type_cache: OrderedDict[type, list[LiveCompletion]] = (
+            OrderedDict()
+        )
+
+    def complete(self, document: str) -> Optional[list[LiveCompletion]]:
+        """Attributes of the receiver that `document` ends with, if any.
+
+        Returns `None` if the document doesn't end with a receiver that can
+        be evaluated safely, or if the time budget runs out.
+        """
+        receiver = _receiver(document)
+        if receiver is None:
+            return None
+
+        deadline = time.perf_counter() + self.time_budget
+        dispatcher = get_dispatcher()
+        if not dispatcher.running or dispatcher.on_main_thread():
+            return self._list(receiver, deadline)
+
+        future = dispatcher.submit(self._list, receiver, deadline)
+        try:
+            return future.result(timeout=self.time_budget)
+        except FutureTimeoutError:
+            future.cancel()
+            LOGGER.debug("Live completion ran out of time")
+            return None
+
+    def _list(
+        self, receiver: ast.expr, deadline: float
+    ) -> Optional[list[LiveCompletion]]:
+        try:
+            obj = _evaluate(receiver, self.namespace)
+        except Exception:
+            return None
+
+        # `isinstance` and `hasattr` could run Python code on `obj`
+        cacheable = not issubclass(type(obj), (types.ModuleType, type)) and (
+            inspect.getattr_static(obj, "__dict__", None) is None
+        )
+        if cacheable and type(obj) in self._type_cache:
+            self._type_cache.move_to_end(type(obj))
+            return self._type_cache[type(obj)]
+
+        if _lists_in_python(obj):
+            return None
+        try:
+            names = dir(obj)
+        except Exception:
+            return None
+        completions = []
+        for i, name in enumerate(names):
+            if i % 64 == 0 and time.perf_counter() > deadline:
+                return None
+            completions.append(
+                LiveCompletion(name=name, type=_kind(obj, name))
+            )
+
+        if cacheable:
+            self._type_cache[type(obj)] = completions
+            if len(self._type_cache) > _TYPE_CACHE_MAX_ITEMS:
+                self._type_cache.popitem(last=False)
+        return completions
+
+
+def _receiver(document: str) -> Optional[ast.expr]:
+    """The receiver of the attribute being typed at the end of `document`."""
+    line = document.rsplit("\n", 1)[-1][-_MAX_LINE_CHARS:]
+    line = _TYPED_NAME.sub("", line)
+    if not line.endswith("."):
+        return None
+    text = line[:-1]
+    # the longest suffix of the line that is a receiver
+    for start in range(len(text)):
+        # don't start in the middle of a name
+        if start > 0 and (text[start - 1] == "_" or text[start - 1].isalnum()):
+            continue
+        try:
+            expression = ast.parse(text[start:].strip(), mode="eval").body
+        except SyntaxError:
+            continue
+        if _is_receiver(expression):
+            return expression
+    return None
+
+
+def _is_receiver(node: ast.expr) -> bool:
+    if isinstance(node, ast.Name):
+        return True
+    if isinstance(node, ast.Attribute):
+        return _is_receiver(node.value)
+    if isinstance(node, ast.Subscript):
+        try:
+            _literal_key(node)
+        except _Unsafe:
+            return False
+        return _is_receiver(node.value)
+    return False
+
+
+def _literal_key(node: ast.Subscript) -> Any:
+    slice_: Any = node.slice
+    # Python 3.8 wraps subscripts in an Index node
+    if isinstance(slice_, getattr(ast, "Index", ())):
+        slice_ = slice_.value
+    try:
+        key = ast.literal_eval(slice_)
+    except ValueError:
+        raise _Unsafe() from None
+    if not isinstance(key, (str, int)):
+        raise _Unsafe()
+    return key
+
+
+_MISSING = object()
+
+
+def _defined_in_python(cls: type, name: str) -> bool:
+    return inspect.isfunction(inspect.getattr_static(cls, name, None))
+
+
+def _module_hook(value: Any, name: str) -> bool:
+    """Whether `value` is a module defining `name` (PEP 562)."""
+    if not issubclass(type(value), types.ModuleType):
+        return False
+    # the module's own dict; `getattr_static` returns the descriptor
+    module_dict = object.__getattribute__(value, "__dict__")
+    return isinstance(module_dict, dict) and name in module_dict
+
+
+def _runs_python(attribute: Any) -> bool:
+    """Whether getting `attribute` from a class runs Python code."""
+    if isinstance(attribute, (property, functools.cached_property)):
+        return True
+    get = inspect.getattr_static(type(attribute), "__get__", None)
+    return inspect.isfunction(get)
+
+
+def _lists_in_python(obj: Any) -> bool:
+    """Whether `dir(obj)` runs Python code."""
+    return _defined_in_python(type(obj), "__dir__") or _module_hook(
+        obj, "__dir__"
+    )
+
+
+def _evaluate(node: ast.expr, namespace: dict[str, Any]) -> Any:
+    if isinstance(node, ast.Name):
+        return namespace[node.id]
+
+    if isinstance(node, ast.Attribute):
+        value = _evaluate(node.value, namespace)
+        if _defined_in_python(
+            type(value), "__getattr__"
+        ) or _defined_in_python(type(value), "__getattribute__"):
+            raise _Unsafe()
+        static = inspect.getattr_static(value, node.attr, _MISSING)
+        if static is _MISSING:
+            # a missing attribute of a module is looked up by its
+            # `__getattr__`
+            if _module_hook(value, "__getattr__"):
+                raise _Unsafe()
+        elif _runs_python(static):
+            raise _Unsafe()
+        return getattr(value, node.attr)
+
+    if isinstance(node, ast.Subscript):
+        value = _evaluate(node.value, namespace)
+        key = _literal_key(node)
+        getitem = inspect.getattr_static(type(value), "__getitem__", None)
+        if getitem is None or inspect.isfunction(getitem):
+            raise _Unsafe()
+        # don't let a dict subclass create missing keys
+        if issubclass(type(value), dict) and not dict.__contains__(
+            value, key
+        ):
+            raise KeyError(key)
+        return value[key]
+
+    raise _Unsafe()
+
+
+def _kind(obj: Any, name: str) -> str:
+    try:
+        attribute = inspect.getattr_static(obj, name)
+    except AttributeError:
+        return "statement"
+    if isinstance(attribute, types.ModuleType):
+        return "module"
+    if isinstance(attribute, type):
+        return "class"
+    if isinstance(
+        attribute,
+        (
+            property,
+            functools.cached_property,
+            types.GetSetDescriptorType,
+            types.MemberDescriptorType,
+        ),
+    ):
+        return "property"
+    if isinstance(attribute, (staticmethod, classmethod)) or callable(
+        attribute
+    ):
+        return "function"
+    return "statement"
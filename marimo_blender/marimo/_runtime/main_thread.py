@@ -0,0 +1,295 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Dispatch work onto the host application's main thread.
+
+Inside Blender, the kernel runs on a plain thread, but `bpy` data may only be
+touched safely from Blender's main thread. The dispatcher below owns a queue
+of callables that is drained by a timer registered with `bpy.app.timers`;
+each timer tick runs a batch of queued callables so that many small
+operations cost a single trip through Blender's event loop.
+
+The timer API is injectable (any object with `register`/`unregister`/
+`is_registered`, like `bpy.app.timers`), which lets the dispatcher be driven
+by a fake timer loop when running headless.
+"""
+from __future__ import annotations
+
+import contextlib
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterator,
+    Optional,
+    Protocol,
+    TypeVar,
+)
+
+from marimo import _loggers
+from marimo._output.rich_help import mddoc
+from marimo._runtime.context import (
+    ContextNotInitializedError,
+    RuntimeContext,
+    borrow_context,
+    get_context,
+)
+
+if TYPE_CHECKING:
+    from marimo._ast.cell import CellId_t
+    from marimo._runtime.runtime import ExecutionContext
+
+LOGGER = _loggers.marimo_logger()
+
+T = TypeVar("T")
+
+
+class Timers(Protocol):
+    """The subset of `bpy.app.timers` used by the dispatcher."""
+
+    def register(
+        self,
+        function: Callable[[], Optional[float]],
+        first_interval: float = 0,
+        persistent: bool = False,
+    ) -> None:
+        ...
+
+    def unregister(self, function: Callable[[], Optional[float]]) -> None:
+        ...
+
+    def is_registered(self, function: Callable[[], Optional[float]]) -> bool:
+        ...
+
+
+@dataclass
+class _Task:
+    function: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: Future[Any]
+    # runtime context of the submitting thread, installed while the task
+    # runs so that cell code on the main thread can still use marimo
+    runtime_context: Optional[RuntimeContext]
+    # the cell the submitting thread was running, which may differ from the
+    # kernel's when cells run in parallel
+    execution_context: Optional[ExecutionContext] = None
+    cell_id: Optional[CellId_t] = None
+
+
+class MainThreadDispatcher:
+    """Runs callables on the main thread, in batches, via a timer.
+
+    **Args.**
+
+    - `batch_size`: maximum number of tasks run per timer tick
+    - `time_budget`: maximum number of seconds spent per timer tick; at least
+      one task is always run
+    - `interval`: seconds between ticks when the queue is empty
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 256,
+        time_budget: float = 0.01,
+        interval: float = 0.01,
+    ) -> None:
+        self.batch_size = batch_size
+        self.time_budget = time_budget
+        self.interval = interval
+        # When True, whole cells are executed on the main thread; otherwise
+        # only sections marked with `on_main_thread` are dispatched.
+        self.run_cells_on_main_thread = False
+
+        self._tasks: queue.SimpleQueue[_Task] = queue.SimpleQueue()
+        self._timers: Optional[Timers] = None
+        self._main_thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._timers is not None
+
+    def on_main_thread(self) -> bool:
+        """Whether the caller is running on the dispatcher's main thread."""
+        return threading.get_ident() == self._main_thread_id
+
+    def start(self, timers: Optional[Timers] = None) -> None:
+        """Start draining the queue from the calling thread's event loop.
+
+        Must be called from the main thread. Defaults to `bpy.app.timers`.
+        """
+        if self.running:
+            return
+        if timers is None:
+            import bpy  # type: ignore
+
+            timers = bpy.app.timers
+        self._main_thread_id = threading.get_ident()
+        self._timers = timers
+        # still registered if stopped from another thread and not ticked
+        # since
+        if not timers.is_registered(self.tick):
+            timers.register(self.tick, first_interval=0, persistent=True)
+        LOGGER.debug("Main thread dispatcher started")
+
+    def stop(self) -> None:
+        """Stop the timer and cancel tasks that haven't run yet.
+
+        Can be called from any thread; off the main thread, the timer
+        unregisters itself on its next tick instead.
+        """
+        on_main_thread = self.on_main_thread()
+        timers, self._timers = self._timers, None
+        if (
+            timers is not None
+            and on_main_thread
+            and timers.is_registered(self.tick)
+        ):
+            timers.unregister(self.tick)
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            task.future.cancel()
+        self._main_thread_id = None
+
+    def submit(
+        self, function: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> Future[T]:
+        """Queue `function(*args, **kwargs)` to run on the main thread.
+
+        Runs the function immediately if the dispatcher isn't running or if
+        the caller is already on the main thread.
+        """
+        future: Future[T] = Future()
+        if not self.running or self.on_main_thread():
+            _run(function, args, kwargs, future)
+            return future
+
+        try:
+            runtime_context: Optional[RuntimeContext] = get_context()
+        except ContextNotInitializedError:
+            runtime_context = None
+        task = _Task(function, args, kwargs, future, runtime_context)
+        if runtime_context is not None:
+            task.execution_context = runtime_context.kernel.execution_context
+            task.cell_id = runtime_context.stream.cell_id
+        self._tasks.put(task)
+        return future
+
+    def call(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run `function` on the main thread and wait for its result.
+
+        Exceptions raised by `function` are re-raised in the caller.
+        """
+        return self.submit(function, *args, **kwargs).result()
+
+    def tick(self) -> Optional[float]:
+        """Run one batch of queued tasks.
+
+        Returns the number of seconds until the next tick, following the
+        `bpy.app.timers` protocol; returns `None` once stopped.
+        """
+        if not self.running:
+            return None
+
+        deadline = time.perf_counter() + self.time_budget
+        n_run = 0
+        while n_run < self.batch_size:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                return self.interval
+            with _adopt_context(task):
+                _run(task.function, task.args, task.kwargs, task.future)
+            n_run += 1
+            if time.perf_counter() >= deadline:
+                break
+        # More work is (possibly) pending: come back on the next iteration
+        # of the event loop, giving the host a chance to redraw.
+        return 0 if not self._tasks.empty() else self.interval
+
+
+@contextlib.contextmanager
+def _adopt_context(task: _Task) -> Iterator[None]:
+    """Run as the submitting thread's cell."""
+    runtime_context = task.runtime_context
+    if runtime_context is None:
+        yield
+        return
+    with borrow_context(
+        runtime_context
+    ), runtime_context.kernel.thread_execution_context(
+        task.execution_context
+    ), runtime_context.stream.thread_cell_id(
+        task.cell_id
+    ):
+        yield
+
+
+def _run(
+    function: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    future: Future[Any],
+) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(function(*args, **kwargs))
+    except BaseException as e:
+        # BaseExceptions (MarimoInterrupt, MarimoStopError, ...) are
+        # forwarded to the waiting thread instead of unwinding the host's
+        # event loop.
+        future.set_exception(e)
+
+
+_DISPATCHER = MainThreadDispatcher()
+
+
+def get_dispatcher() -> MainThreadDispatcher:
+    return _DISPATCHER
+
+
+@mddoc
+def on_main_thread(function: Callable[..., T]) -> Callable[..., T]:
+    """Run a function on the host application's main thread.
+
+    Inside Blender, notebook cells run on a background thread, but most of
+    `bpy` is only safe to use from Blender's main thread. Decorate a function
+    with `on_main_thread` to run each call of it on the main thread; the
+    calling cell waits for the result, and exceptions propagate as usual.
+
+    Calls are queued and applied in batches on each tick of Blender's event
+    loop. When not running inside Blender, the function is called directly.
+
+    **Example.**
+
+    ```python3
+    @mo.on_main_thread
+    def add_cubes(n):
+        for i in range(n):
+            bpy.ops.mesh.primitive_cube_add(location=(i * 3, 0, 0))
+
+    add_cubes(100)
+    ```
+
+    **Args.**
+
+    - `function`: the function to run on the main thread
+
+    **Returns.**
+
+    - A wrapped function with the same signature as `function`
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        return get_dispatcher().call(function, *args, **kwargs)
+
+    return wrapper
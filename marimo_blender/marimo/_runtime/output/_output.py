@@ -2,8 +2,9 @@
 import sys
 
 from marimo._ast.cell import CellId_t
-from marimo._messaging.cell_output import CellChannel
-from marimo._messaging.ops import CellOp
+from marimo._messaging.cell_output import CellChannel, CellOutput
+from marimo._messaging.ops import CellOp, CellOutputAppend
+from marimo._messaging.streams import OUTPUT_MAX_BYTES
 from marimo._output import formatting
 from marimo._output.rich_help import mddoc
 from marimo._plugins.stateless.flex import vstack
@@ -11,6 +12,11 @@ from marimo._runtime.context import get_context
 
 
 def write_internal(cell_id: CellId_t, value: object) -> None:
+    ctx = get_context()
+    if ctx.kernel.execution_context is not None:
+        # consumers now have the whole output
+        ctx.kernel.execution_context.n_appended = 0
+        ctx.kernel.execution_context.appended_bytes = 0
     output = formatting.try_format(value)
     if output.traceback is not None:
         sys.stderr.write(output.traceback)
@@ -59,14 +65,47 @@ def append(value: object) -> None:
     if ctx.kernel.execution_context is None:
         return
 
-    if ctx.kernel.execution_context.output is None:
-        ctx.kernel.execution_context.output = [formatting.as_html(value)]
+    execution_context = ctx.kernel.execution_context
+    if execution_context.output is None:
+        execution_context.output = [formatting.as_html(value)]
     else:
-        ctx.kernel.execution_context.output.append(formatting.as_html(value))
-    write_internal(
-        cell_id=ctx.kernel.execution_context.cell_id,
-        value=vstack(ctx.kernel.execution_context.output),
+        execution_context.output.append(formatting.as_html(value))
+
+    # Send only the items that consumers don't have yet (just the new one,
+    # unless the output was last set as a whole), instead of re-formatting
+    # and re-sending the whole stack.
+    output = execution_context.output
+    start = execution_context.n_appended
+    execution_context.n_appended = len(output)
+    was_too_large = execution_context.appended_bytes > OUTPUT_MAX_BYTES
+    execution_context.appended_bytes += sum(
+        len(item.text) for item in output[start:]
     )
+    if execution_context.appended_bytes > OUTPUT_MAX_BYTES:
+        # show the warning a whole output this large gets, once; later
+        # items aren't sent until the output is set again
+        if not was_too_large:
+            mimetype, data = CellOp.output_too_large(
+                execution_context.appended_bytes
+            )
+            CellOp.broadcast_output(
+                channel=CellChannel.OUTPUT,
+                mimetype=mimetype,
+                data=data,
+                cell_id=execution_context.cell_id,
+                status=None,
+            )
+        return
+    for index in range(start, len(output)):
+        CellOutputAppend(
+            cell_id=execution_context.cell_id,
+            index=index,
+            output=CellOutput(
+                channel=CellChannel.OUTPUT,
+                mimetype="text/html",
+                data=output[index].text,
+            ),
+        ).broadcast()
 
 
 @mddoc
@@ -0,0 +1,153 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Opt-in profiling of the kernel's runs.
+
+When profiling is on, the kernel records where the time of each run goes,
+per cell: running its code (wall and CPU time), cleaning up its previous
+state, formatting its output, and sending messages. The profile is
+broadcast as a `KernelProfile` op after the run's `CompletedRun`.
+Optionally, the cells' code is also profiled with cProfile, to tell, for
+example, time spent in `bpy` from time spent in Python.
+
+Profiling is turned on with a `SetProfilingRequest` (see the
+`/api/kernel/profile` endpoint), or when the kernel starts, with the
+`MARIMO_KERNEL_PROFILE` environment variable: `1` records timings, and
+`code` also profiles the cells' code.
+"""
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import time
+from typing import Iterator, Literal, Optional
+
+from marimo._ast.cell import CellId_t
+from marimo._messaging.ops import CellProfile, KernelProfile
+from marimo._messaging.types import Stream
+
+# Number of functions listed in a code profile
+CODE_PROFILE_MAX_FUNCTIONS = 40
+
+Phase = Literal["cleanup", "format", "broadcast"]
+
+
+class KernelProfiler:
+    """Records the profile of one run at a time.
+
+    Phases are measured on the kernel's thread only. Time spent in a phase
+    nested in another one isn't counted in the outer phase.
+
+    **Args.**
+
+    - `stream`: the kernel's stream; if it counts the bytes it writes,
+      messages are attributed to cells
+    - `profile_code`: whether to profile the cells' code with cProfile
+    """
+
+    def __init__(self, stream: Stream, profile_code: bool = False) -> None:
+        self.stream = stream
+        self.profile_code = profile_code
+        self._cells: dict[CellId_t, CellProfile] = {}
+        self._code_profiler: Optional[cProfile.Profile] = None
+        # [seconds spent in nested phases] per phase being measured
+        self._nested_times: list[float] = []
+
+    @staticmethod
+    def from_env(stream: Stream) -> Optional[KernelProfiler]:
+        """A profiler configured by `MARIMO_KERNEL_PROFILE`, if set."""
+        setting = os.getenv("MARIMO_KERNEL_PROFILE", "").lower()
+        if setting in ("", "0", "false"):
+            return None
+        return KernelProfiler(stream, profile_code=setting == "code")
+
+    @property
+    def code_profiler(self) -> Optional[cProfile.Profile]:
+        """Profiler to enable while the cells' code runs, if any."""
+        return self._code_profiler
+
+    def start(self) -> None:
+        """Start recording a run."""
+        self._cells = {}
+        self._nested_times = []
+        self._code_profiler = cProfile.Profile() if self.profile_code else None
+
+    def _profile(self, cell_id: CellId_t) -> CellProfile:
+        profile = self._cells.get(cell_id)
+        if profile is None:
+            profile = self._cells[cell_id] = CellProfile(cell_id=cell_id)
+        return profile
+
+    def _stream_totals(self) -> tuple[int, float]:
+        return (
+            getattr(self.stream, "bytes_written", 0),
+            getattr(self.stream, "write_time", 0.0),
+        )
+
+    @contextlib.contextmanager
+    def cell(self, cell_id: CellId_t) -> Iterator[None]:
+        """Attribute messages sent meanwhile to a cell."""
+        bytes_written, write_time = self._stream_totals()
+        try:
+            yield
+        finally:
+            profile = self._profile(cell_id)
+            now_bytes_written, now_write_time = self._stream_totals()
+            profile.bytes_sent += now_bytes_written - bytes_written
+            profile.send_time += now_write_time - write_time
+
+    @contextlib.contextmanager
+    def phase(self, cell_id: CellId_t, phase: Phase) -> Iterator[None]:
+        """Measure a phase of handling a cell."""
+        self._nested_times.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            own_time = elapsed - self._nested_times.pop()
+            if self._nested_times:
+                self._nested_times[-1] += elapsed
+            profile = self._profile(cell_id)
+            if phase == "cleanup":
+                profile.cleanup_time += own_time
+            elif phase == "format":
+                profile.format_time += own_time
+            else:
+                profile.broadcast_time += own_time
+
+    def add_run_times(
+        self,
+        run_times: dict[CellId_t, float],
+        cpu_times: dict[CellId_t, float],
+    ) -> None:
+        """Record the time the cells' code took to run."""
+        for cell_id, run_time in run_times.items():
+            self._profile(cell_id).run_time += run_time
+        for cell_id, cpu_time in cpu_times.items():
+            self._profile(cell_id).cpu_time += cpu_time
+
+    def finish(self, run_time: float) -> KernelProfile:
+        """The profile of the run."""
+        code_profile = None
+        if self._code_profiler is not None:
+            output = io.StringIO()
+            try:
+                stats = pstats.Stats(self._code_profiler, stream=output)
+            except TypeError:
+                # no code ran
+                pass
+            else:
+                stats.sort_stats("cumulative").print_stats(
+                    CODE_PROFILE_MAX_FUNCTIONS
+                )
+                code_profile = output.getvalue()
+            self._code_profiler = None
+        profile = KernelProfile(
+            run_time=run_time,
+            cells=list(self._cells.values()),
+            code_profile=code_profile,
+        )
+        self._cells = {}
+        return profile
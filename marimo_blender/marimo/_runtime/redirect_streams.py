@@ -4,7 +4,7 @@ from __future__ import annotations
 import contextlib
 import os
 import sys
-from typing import Iterator
+from typing import Iterator, Optional
 
 from marimo._ast.cell import CellId_t
 from marimo._messaging.streams import (
@@ -46,7 +46,7 @@ def dup2newfd(fd: int) -> tuple[int, int, int]:
 # Redirect output stream and stdout/stderr/stdin (if they have been installed)
 @contextlib.contextmanager
 def redirect_streams(
-    cell_id: CellId_t,
+    cell_id: Optional[CellId_t],
     stream: Stream,
     stdout: Stdout | None,
     stderr: Stderr | None,
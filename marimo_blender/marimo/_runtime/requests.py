@@ -72,12 +72,21 @@ class CompletionRequest:
     cell_id: CellId_t
 
 
+@dataclass
+class SetProfilingRequest:
+    # whether to profile runs (see `marimo._runtime.profiler`)
+    enabled: bool
+    # whether to also profile the cells' code with cProfile
+    profile_code: bool = False
+
+
 ControlRequest = Union[
     ExecuteMultipleRequest,
     CreationRequest,
     DeleteRequest,
     FunctionCallRequest,
     SetCellConfigRequest,
+    SetProfilingRequest,
     SetUIElementValueRequest,
     StopRequest,
 ]
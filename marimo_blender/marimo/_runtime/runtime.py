@@ -7,6 +7,7 @@ import dataclasses
 import functools
 import io
 import itertools
+import multiprocessing
 import os
 import signal
 import sys
@@ -14,11 +15,17 @@ import threading
 import time
 import traceback
 from collections.abc import Iterable, Sequence
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from multiprocessing import connection
-from typing import Any, Callable, Iterator, Optional
+from typing import Any, Callable, ContextManager, Iterator, Optional
 
 from marimo import _loggers
-from marimo._ast.cell import CellConfig, CellId_t
+from marimo._ast.cell import Cell, CellConfig, CellId_t
 from marimo._ast.compiler import compile_cell
 from marimo._ast.visitor import Name, is_local
 from marimo._messaging.cell_output import CellChannel
@@ -38,10 +45,11 @@ from marimo._messaging.ops import (
     Interrupted,
     RemoveUIElements,
     VariableDeclaration,
-    Variables,
+    VariablesDelta,
     VariableValue,
     VariableValues,
 )
+from marimo._messaging.previews import PreviewCache
 from marimo._messaging.streams import (
     ThreadSafeStderr,
     ThreadSafeStdin,
@@ -64,12 +72,16 @@ from marimo._runtime import cell_runner, dataflow, marimo_pdb
 from marimo._runtime.complete import complete
 from marimo._runtime.context import (
     ContextNotInitializedError,
+    borrow_context,
     get_context,
     get_global_context,
     initialize_context,
 )
 from marimo._runtime.control_flow import MarimoInterrupt, MarimoStopError
+from marimo._runtime.control_queue import ControlQueueReader
 from marimo._runtime.input_override import input_override
+from marimo._runtime.main_thread import get_dispatcher
+from marimo._runtime.profiler import KernelProfiler, Phase
 from marimo._runtime.redirect_streams import redirect_streams
 from marimo._runtime.requests import (
     AppMetadata,
@@ -81,6 +93,7 @@ from marimo._runtime.requests import (
     ExecutionRequest,
     FunctionCallRequest,
     SetCellConfigRequest,
+    SetProfilingRequest,
     SetUIElementValueRequest,
     StopRequest,
 )
@@ -156,6 +169,11 @@ class ExecutionContext:
     setting_element_value: bool
     # output object set imperatively
     output: Optional[list[Html]] = None
+    # number of leading items of `output` that were sent as appended items
+    # (see `CellOutputAppend`)
+    n_appended: int = 0
+    # ... and their total size, which is limited as a whole output's is
+    appended_bytes: int = 0
 
 
 @dataclasses.dataclass
@@ -177,6 +195,9 @@ class Kernel:
 
     - cell_configs: initial configuration for each cell
     - input_override: a function that overrides the builtin input() function
+    - max_parallel_cells: maximum number of cells to run at once; cells that
+      don't depend on each other run on a pool of worker threads when this
+      is greater than 1
     """
 
     def patch_pdb(self, debugger: marimo_pdb.MarimoPdb) -> None:
@@ -197,8 +218,10 @@ class Kernel:
         stderr: Stderr | None,
         stdin: Stdin | None,
         input_override: Callable[[Any], str] = input_override,
+        max_parallel_cells: int = 1,
     ) -> None:
         self.app_metadata = app_metadata
+        self.max_parallel_cells = max_parallel_cells
         self.stream = stream
         self.stdout = stdout
         self.stderr = stderr
@@ -220,7 +243,27 @@ class Kernel:
             for cell_id, config in cell_configs.items()
         }
 
-        self.execution_context: Optional[ExecutionContext] = None
+        self._execution_context: Optional[ExecutionContext] = None
+        # execution contexts of cells running on worker threads
+        self._thread_local = threading.local()
+        # whether cells are currently being run in parallel
+        self._running_in_parallel = False
+        # seconds spent running each cell since the last completed run
+        self.cell_run_times: dict[CellId_t, float] = {}
+        # variable declarations last sent to the frontend, and names whose
+        # declarations may have changed since (an ordered set)
+        self._declarations: dict[Name, VariableDeclaration] = {}
+        self._changed_declarations: dict[Name, None] = {}
+        # previews of the values of variables, for the variables panel;
+        # invalidated whenever code runs, and once previews are sent
+        self.variable_previews = PreviewCache()
+        # UI value updates superseded by later ones in the request being
+        # handled, per element; set by the control loop
+        self.dropped_ui_updates: dict[str, int] = {}
+        # records where the time of runs goes, if profiling is on
+        self.profiler: Optional[KernelProfiler] = KernelProfiler.from_env(
+            stream
+        )
         # initializers to override construction of ui elements
         self.ui_initializers: dict[str, Any] = {}
         # errored cells
@@ -239,14 +282,63 @@ class Kernel:
         """Must be called after context is initialized"""
         threading.Thread(
             target=complete,
-            args=(completion_queue, self.graph, get_context().stream),
+            args=(
+                completion_queue,
+                self.graph,
+                get_context().stream,
+                self.globals,
+            ),
             daemon=True,
         ).start()
 
+    @property
+    def execution_context(self) -> Optional[ExecutionContext]:
+        """Context of the cell running on the calling thread, if any."""
+        execution_context: Optional[ExecutionContext] = getattr(
+            self._thread_local, "execution_context", None
+        )
+        if execution_context is not None:
+            return execution_context
+        return self._execution_context
+
+    @execution_context.setter
+    def execution_context(
+        self, execution_context: Optional[ExecutionContext]
+    ) -> None:
+        self._execution_context = execution_context
+
+    @contextlib.contextmanager
+    def thread_execution_context(
+        self, execution_context: Optional[ExecutionContext]
+    ) -> Iterator[None]:
+        """Install an execution context for the calling thread only."""
+        previous = getattr(self._thread_local, "execution_context", None)
+        self._thread_local.execution_context = execution_context
+        try:
+            yield
+        finally:
+            self._thread_local.execution_context = previous
+
     @contextlib.contextmanager
     def _install_execution_context(
         self, cell_id: CellId_t, setting_element_value: bool = False
     ) -> Iterator[ExecutionContext]:
+        if self._running_in_parallel:
+            # Standard streams are redirected for the whole parallel run;
+            # only attribute this thread's outputs to the cell.
+            execution_context = ExecutionContext(
+                cell_id, setting_element_value
+            )
+            with self.thread_execution_context(
+                execution_context
+            ), self.stream.thread_cell_id(
+                cell_id
+            ), get_context().provide_ui_ids(
+                str(cell_id)
+            ):
+                yield execution_context
+            return
+
         self.execution_context = ExecutionContext(
             cell_id, setting_element_value
         )
@@ -304,6 +396,7 @@ class Kernel:
 
         if cell is not None:
             self.graph.register_cell(cell_id, cell)
+            self._mark_declarations_changed(cell)
             LOGGER.debug("registered cell %s", cell_id)
             LOGGER.debug("parents: %s", self.graph.parents[cell_id])
             LOGGER.debug("children: %s", self.graph.children[cell_id])
@@ -346,12 +439,14 @@ class Kernel:
         self, names: Iterable[Name], exclude_defs: set[Name]
     ) -> None:
         """Delete `names` from kernel, except for `exclude_defs`"""
+        ui_element_registry = get_context().ui_element_registry
         for name in names:
             if name in exclude_defs:
                 continue
 
             if name in self.globals:
                 del self.globals[name]
+            ui_element_registry.unbind(name)
 
             if (
                 "__annotations__" in self.globals
@@ -388,6 +483,7 @@ class Kernel:
         In contrast to deleting a cell, which fully scrubs the cell
         from the kernel and graph.
         """
+        self._mark_declarations_changed(self.graph.cells[cell_id])
         if cell_id not in self.errors:
             self._invalidate_cell_state(cell_id, deletion=True)
             return self.graph.delete_cell(cell_id)
@@ -400,6 +496,38 @@ class Kernel:
             self.graph.delete_cell(cell_id)
             return set()
 
+    def _mark_declarations_changed(self, cell: Cell) -> None:
+        """Mark the declarations of the names a cell uses as changed.
+
+        The cell is being added to or removed from the graph, which changes
+        the cells that define or refer to its defs and refs.
+        """
+        for name in itertools.chain(cell.defs, cell.refs):
+            self._changed_declarations[name] = None
+
+    def _broadcast_variables(self) -> None:
+        """Send the variable declarations that changed since last sent."""
+        changed: list[VariableDeclaration] = []
+        removed: list[Name] = []
+        for name in self._changed_declarations:
+            declared_by = self.graph.definitions.get(name)
+            if declared_by is None:
+                if self._declarations.pop(name, None) is not None:
+                    removed.append(name)
+                continue
+            declaration = VariableDeclaration(
+                name=name,
+                declared_by=sorted(declared_by),
+                used_by=sorted(self.graph.get_referring_cells(name)),
+            )
+            if self._declarations.get(name) != declaration:
+                self._declarations[name] = declaration
+                changed.append(declaration)
+        self._changed_declarations = {}
+
+        if changed or removed:
+            VariablesDelta(variables=changed, removed=removed).broadcast()
+
     def _delete_cell(self, cell_id: CellId_t) -> set[CellId_t]:
         """Delete a cell from the kernel and the graph.
 
@@ -597,16 +725,7 @@ class Kernel:
                 status=None,
             )
 
-        Variables(
-            variables=[
-                VariableDeclaration(
-                    name=variable,
-                    declared_by=list(declared_by),
-                    used_by=list(self.graph.get_referring_cells(variable)),
-                )
-                for variable, declared_by in self.graph.definitions.items()
-            ]
-        ).broadcast()
+        self._broadcast_variables()
         return descendants
 
     def _run_cells(self, cell_ids: set[CellId_t]) -> None:
@@ -619,6 +738,219 @@ class Kernel:
             )
         LOGGER.debug("Finished run.")
 
+    def _run_cell(
+        self, runner: cell_runner.Runner, cell_id: CellId_t
+    ) -> tuple[cell_runner.RunResult, bool]:
+        """Run a cell.
+
+        Also returns whether the cell's output needs to be broadcast.
+        """
+        with self._install_execution_context(cell_id) as exc_ctx:
+            self.variable_previews.invalidate()
+            run_result = runner.run(cell_id)
+            # Don't rebroadcast an output that was already sent
+            #
+            # 1. if run_result.output is not None, need to send it
+            # 2. otherwise if exc_ctx.output is None, then need to send
+            #    the (empty) output (to clear it)
+            new_output = (
+                run_result.output is not None or exc_ctx.output is None
+            )
+
+        # index the UI elements bound to the cell's definitions
+        ui_element_registry = get_context().ui_element_registry
+        for name in self.graph.cells[cell_id].defs:
+            ui_element_registry.bind(name, self.globals.get(name))
+        return run_result, new_output
+
+    def _broadcast_cell_result(
+        self,
+        cell_id: CellId_t,
+        run_result: cell_runner.RunResult,
+        new_output: bool,
+    ) -> None:
+        """Send a cell's variables, status, and output to the frontend."""
+        cell = self.graph.cells[cell_id]
+        values = [
+            VariableValue(
+                name=variable,
+                value=(
+                    self.globals[variable]
+                    if variable in self.globals
+                    else None
+                ),
+                previews=self.variable_previews,
+            )
+            for variable in self.graph.cells[cell_id].defs
+        ]
+
+        if values:
+            VariableValues(variables=values).broadcast()
+        # don't keep the previewed objects alive
+        self.variable_previews.invalidate()
+
+        cell.set_status(status="idle")
+        if (
+            run_result.success()
+            or isinstance(run_result.exception, MarimoStopError)
+        ) and new_output:
+            with self._install_execution_context(
+                cell_id
+            ), self._profile_phase(cell_id, "format"):
+                formatted_output = formatting.try_format(run_result.output)
+            if formatted_output.traceback is not None:
+                with self._install_execution_context(cell_id):
+                    sys.stderr.write(formatted_output.traceback)
+            CellOp.broadcast_output(
+                channel=CellChannel.OUTPUT,
+                mimetype=formatted_output.mimetype,
+                data=formatted_output.data,
+                cell_id=cell_id,
+                status=cell.status,
+            )
+        elif isinstance(run_result.exception, MarimoInterrupt):
+            LOGGER.debug("Cell %s was interrupted", cell_id)
+            # don't clear console because this cell was running and
+            # its console outputs are not stale
+            CellOp.broadcast_error(
+                data=[MarimoInterruptionError()],
+                clear_console=False,
+                cell_id=cell_id,
+                status=cell.status,
+            )
+        elif run_result.exception is not None:
+            LOGGER.debug(
+                "Cell %s raised %s",
+                cell_id,
+                type(run_result.exception).__name__,
+            )
+            # don't clear console because this cell was running and
+            # its console outputs are not stale
+            exception_type = type(run_result.exception).__name__
+            CellOp.broadcast_error(
+                data=[
+                    MarimoExceptionRaisedError(
+                        msg="This cell raised an exception: %s%s"
+                        % (
+                            exception_type,
+                            (
+                                f"('{str(run_result.exception)}')"
+                                if str(run_result.exception)
+                                else ""
+                            ),
+                        ),
+                        exception_type=exception_type,
+                        raising_cell=None,
+                    )
+                ],
+                clear_console=False,
+                cell_id=cell_id,
+                status=cell.status,
+            )
+
+    def _run_cells_in_parallel(self, runner: cell_runner.Runner) -> None:
+        """Run cells on a pool of worker threads, respecting dependencies.
+
+        Cells are handed to workers as soon as all the cells they depend on
+        have finished. Only the cells' code runs on the workers; state
+        clean-up, status updates, and output formatting happen on this
+        thread.
+        """
+        runtime_context = get_context()
+
+        def run_on_worker(
+            cell_id: CellId_t,
+        ) -> tuple[cell_runner.RunResult, bool]:
+            # Each worker gets its own copy of the runtime context, so that
+            # UI element ids are provided per cell.
+            with borrow_context(dataclasses.replace(runtime_context)):
+                return self._run_cell(runner, cell_id)
+
+        running: dict[
+            Future[tuple[cell_runner.RunResult, bool]], CellId_t
+        ] = {}
+        self._running_in_parallel = True
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_parallel_cells,
+                thread_name_prefix="marimo-cell",
+            ) as executor, redirect_streams(
+                None,
+                stream=self.stream,
+                stdout=self.stdout,
+                stderr=self.stderr,
+                stdin=self.stdin,
+            ):
+                while True:
+                    while (
+                        runner.pending()
+                        and len(running) < self.max_parallel_cells
+                    ):
+                        cell_id = runner.pop_ready_cell()
+                        if cell_id is None:
+                            break
+                        if runner.cancelled(cell_id):
+                            runner.finish(cell_id)
+                            continue
+                        if runner.related_to_any(cell_id, running.values()):
+                            # Its state can't be cleaned up while the cells
+                            # that use it run; wait for them
+                            runner.defer(cell_id)
+                            continue
+                        # State clean-up: don't leak names, UI elements, ...
+                        with self._profile_cell(
+                            cell_id
+                        ), self._profile_phase(cell_id, "cleanup"):
+                            self._invalidate_cell_state(cell_id)
+                        cell = self.graph.cells[cell_id]
+                        if cell.stale:
+                            runner.finish(cell_id)
+                            continue
+
+                        LOGGER.debug("running cell %s on a worker", cell_id)
+                        cell.set_status(status="running")
+                        # Output written to file descriptors can't be
+                        # attributed to a thread; it goes to the most
+                        # recently started cell.
+                        self.stream.cell_id = cell_id
+                        running[executor.submit(run_on_worker, cell_id)] = (
+                            cell_id
+                        )
+
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in [f for f in running if f in done]:
+                        cell_id = running.pop(future)
+                        run_result, new_output = future.result()
+                        runner.cancel_if_failed(cell_id, run_result)
+                        with self._profile_cell(
+                            cell_id
+                        ), self._profile_phase(cell_id, "broadcast"):
+                            self._broadcast_cell_result(
+                                cell_id, run_result, new_output
+                            )
+                        runner.finish(cell_id)
+        finally:
+            self._running_in_parallel = False
+
+        if get_global_context().mpl_installed:
+            # pyplot's state is shared by the workers, so figures can only
+            # be closed once all of them are done
+            exec("__marimo__._output.mpl.close_figures()", self.globals)
+
+    def _profile_cell(self, cell_id: CellId_t) -> ContextManager[None]:
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.cell(cell_id)
+
+    def _profile_phase(
+        self, cell_id: CellId_t, phase: Phase
+    ) -> ContextManager[None]:
+        if self.profiler is None:
+            return contextlib.nullcontext()
+        return self.profiler.phase(cell_id, phase)
+
     def _run_cells_internal(self, cell_ids: set[CellId_t]) -> set[CellId_t]:
         """Run cells, send outputs to frontends
 
@@ -651,105 +983,43 @@ class Kernel:
         #                 which is incorrect
         # TODO(akshayka): pdb support
         LOGGER.debug("final set of cells to run %s", runner.cells_to_run)
-        while runner.pending():
-            cell_id = runner.pop_cell()
-            if runner.cancelled(cell_id):
-                continue
-            # State clean-up: don't leak names, UI elements, ...
-            self._invalidate_cell_state(cell_id)
-            cell = self.graph.cells[cell_id]
-            if cell.stale:
-                continue
-
-            LOGGER.debug("running cell %s", cell_id)
-            cell.set_status(status="running")
-
-            with self._install_execution_context(cell_id) as exc_ctx:
-                run_result = runner.run(cell_id)
-                # Don't rebroadcast an output that was already sent
-                #
-                # 1. if run_result.output is not None, need to send it
-                # 2. otherwise if exc_ctx.output is None, then need to send
-                #    the (empty) output (to clear it)
-                new_output = (
-                    run_result.output is not None or exc_ctx.output is None
-                )
-
-            values = [
-                VariableValue(
-                    name=variable,
-                    value=(
-                        self.globals[variable]
-                        if variable in self.globals
-                        else None
-                    ),
-                )
-                for variable in self.graph.cells[cell_id].defs
-            ]
-
-            if values:
-                VariableValues(variables=values).broadcast()
-
-            cell.set_status(status="idle")
-            if (
-                run_result.success()
-                or isinstance(run_result.exception, MarimoStopError)
-            ) and new_output:
-                with self._install_execution_context(cell_id) as exc_ctx:
-                    formatted_output = formatting.try_format(run_result.output)
-                if formatted_output.traceback is not None:
-                    with self._install_execution_context(cell_id):
-                        sys.stderr.write(formatted_output.traceback)
-                CellOp.broadcast_output(
-                    channel=CellChannel.OUTPUT,
-                    mimetype=formatted_output.mimetype,
-                    data=formatted_output.data,
-                    cell_id=cell_id,
-                    status=cell.status,
-                )
-            elif isinstance(run_result.exception, MarimoInterrupt):
-                LOGGER.debug("Cell %s was interrupted", cell_id)
-                # don't clear console because this cell was running and
-                # its console outputs are not stale
-                CellOp.broadcast_error(
-                    data=[MarimoInterruptionError()],
-                    clear_console=False,
-                    cell_id=cell_id,
-                    status=cell.status,
-                )
-            elif run_result.exception is not None:
-                LOGGER.debug(
-                    "Cell %s raised %s",
-                    cell_id,
-                    type(run_result.exception).__name__,
-                )
-                # don't clear console because this cell was running and
-                # its console outputs are not stale
-                exception_type = type(run_result.exception).__name__
-                CellOp.broadcast_error(
-                    data=[
-                        MarimoExceptionRaisedError(
-                            msg="This cell raised an exception: %s%s"
-                            % (
-                                exception_type,
-                                (
-                                    f"('{str(run_result.exception)}')"
-                                    if str(run_result.exception)
-                                    else ""
-                                ),
-                            ),
-                            exception_type=exception_type,
-                            raising_cell=None,
+        if (
+            self.max_parallel_cells > 1
+            and not get_dispatcher().run_cells_on_main_thread
+        ):
+            self._run_cells_in_parallel(runner)
+        else:
+            if self.profiler is not None:
+                runner.code_profiler = self.profiler.code_profiler
+            while runner.pending():
+                cell_id = runner.pop_cell()
+                if runner.cancelled(cell_id):
+                    continue
+                with self._profile_cell(cell_id):
+                    # State clean-up: don't leak names, UI elements, ...
+                    with self._profile_phase(cell_id, "cleanup"):
+                        self._invalidate_cell_state(cell_id)
+                    cell = self.graph.cells[cell_id]
+                    if cell.stale:
+                        continue
+
+                    LOGGER.debug("running cell %s", cell_id)
+                    cell.set_status(status="running")
+                    run_result, new_output = self._run_cell(runner, cell_id)
+                    runner.cancel_if_failed(cell_id, run_result)
+                    with self._profile_phase(cell_id, "broadcast"):
+                        self._broadcast_cell_result(
+                            cell_id, run_result, new_output
                         )
-                    ],
-                    clear_console=False,
-                    cell_id=cell_id,
-                    status=cell.status,
-                )
 
-            if get_global_context().mpl_installed:
-                # ensures that every cell gets a fresh axis.
-                exec("__marimo__._output.mpl.close_figures()", self.globals)
+                if get_global_context().mpl_installed:
+                    # ensures that every cell gets a fresh axis.
+                    exec(
+                        "__marimo__._output.mpl.close_figures()", self.globals
+                    )
+        self.cell_run_times.update(runner.run_times)
+        if self.profiler is not None:
+            self.profiler.add_run_times(runner.run_times, runner.cpu_times)
 
         if runner.cells_to_run:
             assert runner.interrupted
@@ -894,6 +1164,11 @@ class Kernel:
                     "Could not resolve UIElement with id%s", object_id
                 )
                 continue
+            if resolved_id in resolved_requests:
+                # several views of the same element were updated
+                resolved_value = _merge_lens_values(
+                    resolved_requests[resolved_id], resolved_value
+                )
             resolved_requests[resolved_id] = resolved_value
         del request
 
@@ -917,6 +1192,8 @@ class Kernel:
                 ui_element_registry.get_cell(object_id),
                 setting_element_value=True,
             ):
+                # the update runs the element's on_change handler
+                self.variable_previews.invalidate()
                 try:
                     component._update(value)
                 except MarimoConvertValueException:
@@ -958,7 +1235,11 @@ class Kernel:
                 # subtracting self.graph.definitions[name]: never rerun the
                 # cell that created the name
                 variable_values.append(
-                    VariableValue(name=name, value=component)
+                    VariableValue(
+                        name=name,
+                        value=component,
+                        previews=self.variable_previews,
+                    )
                 )
                 try:
                     referring_cells.update(
@@ -983,6 +1264,7 @@ class Kernel:
 
             if variable_values:
                 VariableValues(variables=variable_values).broadcast()
+            self.variable_previews.invalidate()
         self._run_cells(
             dataflow.transitive_closure(self.graph, referring_cells)
         )
@@ -1083,17 +1365,21 @@ class Kernel:
         """Handle a message from the client.
         The message is dispatched to the appropriate method based on its type.
         """
+        start = time.perf_counter()
+        self.cell_run_times = {}
+        if self.profiler is not None:
+            self.profiler.start()
         if isinstance(request, CreationRequest):
             self.instantiate(request)
-            CompletedRun().broadcast()
+            self._broadcast_completed_run(start)
         elif isinstance(request, ExecuteMultipleRequest):
             self.run(request.execution_requests)
-            CompletedRun().broadcast()
+            self._broadcast_completed_run(start)
         elif isinstance(request, SetCellConfigRequest):
             self.set_cell_config(request)
         elif isinstance(request, SetUIElementValueRequest):
             self.set_ui_element_value(request)
-            CompletedRun().broadcast()
+            self._broadcast_completed_run(start)
         elif isinstance(request, FunctionCallRequest):
             status, ret = self.function_call_request(request)
             FunctionCallResult(
@@ -1101,14 +1387,48 @@ class Kernel:
                 return_value=ret,
                 status=status,
             ).broadcast()
-            CompletedRun().broadcast()
+            self._broadcast_completed_run(start)
         elif isinstance(request, DeleteRequest):
             self.delete(request)
+        elif isinstance(request, SetProfilingRequest):
+            self.set_profiling(request)
         elif isinstance(request, StopRequest):
             return None
         else:
             raise ValueError(f"Unknown request {request}")
 
+    def set_profiling(self, request: SetProfilingRequest) -> None:
+        """Turn profiling of runs on or off."""
+        self.profiler = (
+            KernelProfiler(self.stream, profile_code=request.profile_code)
+            if request.enabled
+            else None
+        )
+
+    def _broadcast_completed_run(self, start: float) -> None:
+        run_time = time.perf_counter() - start
+        CompletedRun(
+            run_time=run_time,
+            cell_run_times=self.cell_run_times,
+            dropped_ui_updates=self.dropped_ui_updates,
+        ).broadcast()
+        if self.profiler is not None:
+            self.profiler.finish(run_time).broadcast(self.stream)
+
+
+def _merge_lens_values(previous: Any, value: Any) -> Any:
+    """Merge two updates of an element made through its views."""
+    if not isinstance(previous, dict) or not isinstance(value, dict):
+        return value
+    merged = dict(previous)
+    for key, child_value in value.items():
+        merged[key] = (
+            _merge_lens_values(merged[key], child_value)
+            if key in merged
+            else child_value
+        )
+    return merged
+
 
 def launch_kernel(
     control_queue: QueueType[ControlRequest],
@@ -1118,6 +1438,7 @@ def launch_kernel(
     is_edit_mode: bool,
     configs: dict[CellId_t, CellConfig],
     app_metadata: AppMetadata,
+    max_parallel_cells: int = 1,
 ) -> None:
     LOGGER.debug("Launching kernel")
     if is_edit_mode:
@@ -1158,10 +1479,14 @@ def launch_kernel(
         stderr=stderr,
         stdin=stdin,
         input_override=input_override,
+        max_parallel_cells=max_parallel_cells,
     )
     initialize_context(
         kernel=kernel,
         stream=stream,
+        # The kernel is a thread of the server's process unless it was
+        # spawned as a process of its own
+        virtual_files_in_process=multiprocessing.parent_process() is None,
     )
 
     if is_edit_mode:
@@ -1238,9 +1563,12 @@ def launch_kernel(
         else:
             signal.signal(signal.SIGTERM, sigterm_handler)
 
+    reader = ControlQueueReader(
+        control_queue, get_context().ui_element_registry.debounce_window
+    )
     while True:
         try:
-            request = control_queue.get()
+            request = reader.get()
         except Exception as e:
             # triggered on Windows when quit with Ctrl+C
             LOGGER.debug("kernel queue.get() failed %s", e)
@@ -1248,6 +1576,7 @@ def launch_kernel(
         LOGGER.debug("received request %s", request)
         if isinstance(request, StopRequest):
             break
+        kernel.dropped_ui_updates = reader.dropped
         kernel.handle_message(request)
 
     if stdout is not None:
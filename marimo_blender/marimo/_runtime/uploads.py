@@ -0,0 +1,136 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Files uploaded to the server, for `mo.ui.file`.
+
+Sending a file as base64 inside a UI element's value inflates it by a
+third and copies it several times on its way to the kernel. Instead, the
+frontend can stream the file's bytes to `/api/kernel/upload`, which writes
+them to disk chunk by chunk and responds with an upload id; the element's
+value then refers to the file as `UPLOAD_PREFIX + upload_id` in place of
+its base64 contents. (The prefix can't start a base64 string.)
+
+Uploaded files are kept until the session they were uploaded to closes,
+since the frontend can send the same value again, for example when the
+session is instantiated. The uploads of a session are limited to
+`UPLOAD_SESSION_QUOTA_BYTES` in total, which leaves room for large files
+(such as .blend or .fbx files of several gigabytes) while bounding the
+disk space a client can use.
+"""
+from __future__ import annotations
+
+import atexit
+import mmap
+import os
+import re
+import secrets
+import shutil
+import threading
+from typing import BinaryIO, Optional
+
+from marimo._utils.tmpdir import get_tmpdir
+
+UPLOAD_PREFIX = "@upload:"
+
+# Maximum total size of the files uploaded to a session
+UPLOAD_SESSION_QUOTA_BYTES = int(
+    os.getenv("MARIMO_UPLOAD_SESSION_QUOTA_BYTES", 10_000_000_000)
+)
+
+_UPLOAD_ID = re.compile(r"[0-9a-f]{32}")
+
+_lock = threading.Lock()
+_upload_dir: Optional[str] = None
+
+
+def _get_upload_dir() -> str:
+    global _upload_dir
+    with _lock:
+        if _upload_dir is None:
+            _upload_dir = os.path.join(get_tmpdir(), "uploads")
+            os.makedirs(_upload_dir, exist_ok=True)
+            atexit.register(shutil.rmtree, _upload_dir, ignore_errors=True)
+        return _upload_dir
+
+
+def create_upload() -> tuple[str, BinaryIO]:
+    """Create an empty upload, returning its id and a file to write to."""
+    upload_id = secrets.token_hex(16)
+    path = os.path.join(_get_upload_dir(), upload_id)
+    return upload_id, open(path, "xb")
+
+
+def delete_upload(upload_id: str) -> None:
+    try:
+        os.remove(upload_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+class SessionUploads:
+    """The files uploaded to a session, deleted when it closes.
+
+    Must be used from the event loop's thread.
+    """
+
+    def __init__(
+        self, quota_bytes: int = UPLOAD_SESSION_QUOTA_BYTES
+    ) -> None:
+        self.quota_bytes = quota_bytes
+        # upload id -> bytes written
+        self._sizes: dict[str, int] = {}
+        self.total_bytes = 0
+
+    def available_bytes(self) -> int:
+        """Bytes that a new upload can hold."""
+        return max(self.quota_bytes - self.total_bytes, 0)
+
+    def create(self) -> tuple[str, BinaryIO]:
+        upload_id, f = create_upload()
+        self._sizes[upload_id] = 0
+        return upload_id, f
+
+    def record_write(self, upload_id: str, n_bytes: int) -> bool:
+        """Count `n_bytes` written to an upload.
+
+        Returns `False` if the session is then over its quota.
+        """
+        self._sizes[upload_id] += n_bytes
+        self.total_bytes += n_bytes
+        return self.total_bytes <= self.quota_bytes
+
+    def delete(self, upload_id: str) -> None:
+        self.total_bytes -= self._sizes.pop(upload_id, 0)
+        delete_upload(upload_id)
+
+    def delete_all(self) -> None:
+        for upload_id in list(self._sizes):
+            self.delete(upload_id)
+
+
+def upload_path(upload_id: str) -> str:
+    """Path of an uploaded file.
+
+    Raises a `ValueError` if `upload_id` isn't a valid upload id.
+    """
+    if _UPLOAD_ID.fullmatch(upload_id) is None:
+        raise ValueError(f"Invalid upload id: {upload_id}")
+    return os.path.join(_get_upload_dir(), upload_id)
+
+
+def parse_upload_reference(value: str) -> Optional[str]:
+    """Path of the uploaded file that `value` refers to, if any."""
+    if not value.startswith(UPLOAD_PREFIX):
+        return None
+    path = upload_path(value[len(UPLOAD_PREFIX) :])
+    if not os.path.isfile(path):
+        raise ValueError(f"Upload not found: {value}")
+    return path
+
+
+def map_file(path: str) -> memoryview:
+    """A read-only, memory-mapped view of a file's bytes."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # empty files can't be mapped
+            return memoryview(b"")
+        # the mapping stays valid after the file is closed
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
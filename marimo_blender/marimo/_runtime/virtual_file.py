@@ -3,11 +3,14 @@ from __future__ import annotations
 
 import base64
 import dataclasses
+import hashlib
 import mimetypes
+import os
 import random
 import string
 import sys
 import threading
+from collections import OrderedDict
 from collections.abc import Iterable
 from multiprocessing import shared_memory
 from typing import TYPE_CHECKING, Optional, cast
@@ -22,20 +25,45 @@ if TYPE_CHECKING:
 
 LOGGER = _loggers.marimo_logger()
 
+# Files no longer used by any cell are kept around, up to this many bytes in
+# total, in case a cell produces them again
+RELEASED_FILES_MAX_BYTES = int(
+    os.getenv("MARIMO_RELEASED_FILES_MAX_BYTES", 64_000_000)
+)
 
 _ALPHABET = string.ascii_letters + string.digits
 
 
-def random_filename(ext: str) -> str:
+# Buffers of virtual files registered by kernels that run in the server's
+# own process (as threads), keyed by filename. The server serves these
+# directly, without going through shared memory.
+_IN_PROCESS_BUFFERS: dict[str, memoryview] = {}
+
+
+def get_in_process_buffer(filename: str) -> Optional[memoryview]:
+    """Contents of a virtual file registered in this process, if any."""
+    return _IN_PROCESS_BUFFERS.get(filename)
+
+
+def shared_memory_name(filename: str) -> str:
+    """Name of the shared memory segment holding a virtual file.
+
+    Filenames are too long for segment names on some platforms (macOS caps
+    them at 31 characters), so segments are named after a short digest of
+    the filename instead.
+    """
+    digest = hashlib.blake2b(filename.encode(), digest_size=8).hexdigest()
+    return f"mo{digest}"
+
+
+def _random_namespace() -> str:
     # adapted from: https://stackoverflow.com/questions/13484726/safe-enough-8-character-short-unique-random-string  # noqa: E501
-    # TODO(akshayka): should callers redraw if they get a collision?
     try:
         tid = str(threading.get_native_id())
     except AttributeError:
         # get_native_id() not implemented in pyodide/WASM
         tid = "0"
-    basename = tid + "-" + "".join(random.choices(_ALPHABET, k=8))
-    return f"{basename}.{ext}"
+    return tid + "-" + "".join(random.choices(_ALPHABET, k=8))
 
 
 @dataclasses.dataclass
@@ -102,24 +130,14 @@ class VirtualFileLifecycleItem(CellLifecycleItem):
     def create(self, context: "RuntimeContext") -> None:
         """Create the virtual file
 
-        Every virtual file gets a unique random name. Uniqueness is
-        required for reference counting.
+        Virtual files are named by a hash of their contents, so identical
+        buffers (e.g., an image re-rendered by every run of a cell) share a
+        file and a stable URL, which browsers can keep cached.
         """
-        filename = random_filename(self.ext)
-        registry = context.virtual_file_registry
-        # create a unique filename for the virtual file
-        tries = 0
-        max_tries = 100
-        while registry.has(filename) and tries < max_tries:
-            filename = random_filename(self.ext)
-            tries += 1
-        if tries > max_tries:
-            raise RuntimeError(
-                "Failed to add virtual file to registry. "
-                "This is a bug in marimo. Please file an issue."
-            )
         self._virtual_file = VirtualFile(
-            filename,
+            context.virtual_file_registry.content_filename(
+                self.buffer, self.ext
+            ),
             self.buffer,
             as_data_url=not context.virtual_files_supported,
         )
@@ -141,10 +159,14 @@ class VirtualFileLifecycleItem(CellLifecycleItem):
 
 @dataclasses.dataclass
 class VirtualFileRegistryItem:
-    # contents of the file
-    shm: shared_memory.SharedMemory
+    # contents of the file, when not stored in-process
+    shm: Optional[shared_memory.SharedMemory]
     # number of HTML objects that are referencing this virtual file
     refcount: int
+    # size of the file, in bytes
+    size: int = 0
+    # number of lifecycle items (across cells) that added this file
+    owners: int = 1
 
 
 @dataclasses.dataclass
@@ -157,16 +179,44 @@ class VirtualFileRegistry:
 
     The registry itself doesn't maintain the reference counts, it only
     exposes methods for incrementing, decrementing, and getting the counts.
+
+    When `in_process` is set, the server runs in the same process as the
+    kernel, and file contents are shared with it by reference instead of
+    being copied into shared memory.
+
+    Files are content-addressed, so several cells can add the same file;
+    it is only released once all of them have removed it. Released files
+    are kept in a bounded cache, and revived if added again.
     """
 
     registry: dict[str, VirtualFileRegistryItem] = dataclasses.field(
         default_factory=dict
     )
+    in_process: bool = False
+    # Prefix of this registry's filenames. Shared memory segments are named
+    # after files (see `shared_memory_name`), and must not collide with
+    # other kernels' segments.
+    namespace: str = dataclasses.field(default_factory=_random_namespace)
+    released_max_bytes: int = RELEASED_FILES_MAX_BYTES
+    # released files, least recently released first
+    released: OrderedDict[str, VirtualFileRegistryItem] = dataclasses.field(
+        default_factory=OrderedDict
+    )
+    released_bytes = 0
     shutting_down = False
+    # cells running in parallel may add and remove files concurrently
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, repr=False
+    )
 
     def __del__(self) -> None:
         self.shutdown()
 
+    def content_filename(self, buffer: bytes, ext: str) -> str:
+        """Filename for a virtual file, derived from its contents."""
+        digest = hashlib.blake2b(buffer, digest_size=16).hexdigest()
+        return f"{self.namespace}-{digest}.{ext}"
+
     def has(self, filename: str) -> bool:
         return filename in self.registry
 
@@ -195,14 +245,32 @@ class VirtualFileRegistry:
         if not context.virtual_files_supported:
             return
 
+        with self._lock:
+            self._add(virtual_file)
+
+    def _add(self, virtual_file: VirtualFile) -> None:
         key = virtual_file.filename
         if key in self.registry:
             LOGGER.debug(
                 "Virtual file (key=%s) already registered", virtual_file
             )
+            self.registry[key].owners += 1
+            return
+        if key in self.released:
+            item = self.released.pop(key)
+            self.released_bytes -= item.size
+            item.owners = 1
+            self.registry[key] = item
             return
 
         buffer = virtual_file.buffer
+        if self.in_process:
+            _IN_PROCESS_BUFFERS[key] = memoryview(buffer)
+            self.registry[key] = VirtualFileRegistryItem(
+                shm=None, refcount=0, size=len(buffer)
+            )
+            return
+
         # Immediately writes the contents of the file to an in-memory
         # buffer; not lazy.
         #
@@ -210,13 +278,14 @@ class VirtualFileRegistry:
         #
         # ```
         # try:
-        #   shm = shared_memory.SharedMemory(name=key)
+        #   name = shared_memory_name(key)
+        #   shm = shared_memory.SharedMemory(name=name)
         #   buffer_contents = bytes(shm.buf)
         # except FileNotFoundError:
         #   # virtual file was removed
         # ```
         shm = shared_memory.SharedMemory(
-            name=key,
+            name=shared_memory_name(key),
             create=True,
             size=len(buffer),
         )
@@ -231,16 +300,29 @@ class VirtualFileRegistry:
             shm.close()
         # We have to keep a reference to the shared memory to prevent it from
         # being destroyed on Windows
-        self.registry[key] = VirtualFileRegistryItem(shm=shm, refcount=0)
+        self.registry[key] = VirtualFileRegistryItem(
+            shm=shm, refcount=0, size=len(buffer)
+        )
 
     def remove(self, virtual_file: VirtualFile) -> None:
+        """Remove one owner's claim on a file; release it after the last."""
         key = virtual_file.filename
-        if key in self.registry:
-            if sys.platform == "win32":
-                self.registry[key].shm.close()
-            # destroy the shared memory
-            self.registry[key].shm.unlink()
+        with self._lock:
+            if key not in self.registry:
+                return
+            item = self.registry[key]
+            item.owners -= 1
+            if item.owners > 0:
+                return
             del self.registry[key]
+            self.released[key] = item
+            self.released_bytes += item.size
+            while self.released and (
+                self.released_bytes > self.released_max_bytes
+            ):
+                oldest_key, oldest = self.released.popitem(last=False)
+                self.released_bytes -= oldest.size
+                _release(oldest_key, oldest)
 
     def shutdown(self) -> None:
         # Try to make this method re-entrant since it's called in the
@@ -251,14 +333,26 @@ class VirtualFileRegistry:
             return
         try:
             self.shutting_down = True
-            for _, item in self.registry.items():
-                if sys.platform == "win32":
-                    item.shm.close()
-                item.shm.unlink()
+            for key, item in self.registry.items():
+                _release(key, item)
             self.registry.clear()
+            for key, item in self.released.items():
+                _release(key, item)
+            self.released.clear()
+            self.released_bytes = 0
         finally:
             self.shutting_down = False
 
 
+def _release(key: str, item: VirtualFileRegistryItem) -> None:
+    if item.shm is None:
+        _IN_PROCESS_BUFFERS.pop(key, None)
+        return
+    if sys.platform == "win32":
+        item.shm.close()
+    # destroy the shared memory
+    item.shm.unlink()
+
+
 def _without_leading_dot(ext: str) -> str:
     return ext[1:] if ext.startswith(".") else ext
@@ -1,10 +1,12 @@
 # Copyright 2024 Marimo. All rights reserved.
+import functools
 import json
 import mimetypes
 import os
 import re
 from http import HTTPStatus
 from multiprocessing import shared_memory
+from typing import Any, Optional, Union
 
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
@@ -12,7 +14,11 @@ from starlette.responses import FileResponse, HTMLResponse, Response
 from starlette.staticfiles import StaticFiles
 
 from marimo import __version__, _loggers
-from marimo._runtime.virtual_file import EMPTY_VIRTUAL_FILE
+from marimo._runtime.virtual_file import (
+    EMPTY_VIRTUAL_FILE,
+    get_in_process_buffer,
+    shared_memory_name,
+)
 from marimo._server.api.deps import AppState
 from marimo._server.api.utils import parse_title
 from marimo._server.model import SessionMode
@@ -34,6 +40,36 @@ router.mount(
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _read_index_template(mtime_ns: int) -> str:
+    del mtime_ns
+    with open(os.path.join(root, "index.html"), "r") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=16)
+def _render_index(
+    template: str,
+    base_url: str,
+    title: str,
+    user_config: str,
+    app_config: str,
+    server_token: str,
+    filename: str,
+    mode: str,
+) -> str:
+    html = template
+    html = html.replace("{{ base_url }}", base_url)
+    html = html.replace("{{ title }}", title)
+    html = html.replace("{{ user_config }}", user_config)
+    html = html.replace("{{ app_config }}", app_config)
+    html = html.replace("{{ server_token }}", server_token)
+    html = html.replace("{{ version }}", __version__)
+    html = html.replace("{{ filename }}", filename)
+    html = html.replace("{{ mode }}", mode)
+    return html
+
+
 @router.get("/")
 async def index(request: Request) -> HTMLResponse:
     app_state = AppState(request)
@@ -41,21 +77,21 @@ async def index(request: Request) -> HTMLResponse:
     user_config = app_state.config_manager.get_config()
     app_config = app_state.session_manager.app_config().asdict()
 
-    index_html = os.path.join(root, "index.html")
-    with open(index_html, "r") as f:
-        html = f.read()
-        html = html.replace("{{ base_url }}", app_state.base_url)
-        html = html.replace("{{ title }}", title)
-        html = html.replace("{{ user_config }}", json.dumps(user_config))
-        html = html.replace("{{ app_config }}", json.dumps(app_config))
-        html = html.replace("{{ server_token }}", app_state.server_token)
-        html = html.replace("{{ version }}", __version__)
-        html = html.replace("{{ filename }}", app_state.filename or "")
-        html = html.replace(
-            "{{ mode }}",
-            "read" if app_state.mode == SessionMode.RUN else "edit",
-        )
-
+    # The template is re-read only if it changed, and the page is only
+    # rendered again if one of its parameters changed.
+    template = _read_index_template(
+        os.stat(os.path.join(root, "index.html")).st_mtime_ns
+    )
+    html = _render_index(
+        template,
+        base_url=app_state.base_url,
+        title=title,
+        user_config=json.dumps(user_config),
+        app_config=json.dumps(app_config),
+        server_token=app_state.server_token,
+        filename=app_state.filename or "",
+        mode="read" if app_state.mode == SessionMode.RUN else "edit",
+    )
     return HTMLResponse(html)
 
 
@@ -67,26 +103,50 @@ STATIC_FILES = [
 ]
 
 
-@router.get("/@file/{filename_and_length:path}")
-def virtual_file(
-    request: Request,
-) -> Response:
-    """Handler for virtual files."""
-    filename_and_length = request.path_params["filename_and_length"]
+class BufferResponse(Response):
+    """A response whose body is sent as given, without copying it."""
 
-    LOGGER.debug("Getting virtual file: %s", filename_and_length)
-    if filename_and_length == EMPTY_VIRTUAL_FILE.filename:
-        return Response(content=b"", media_type="application/octet-stream")
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, memoryview):
+            return content  # type: ignore[return-value]
+        return super().render(content)
 
-    byte_length, filename = filename_and_length.split("-", 1)
-    key = filename
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[range]:
+    """Bytes requested by a `Range` header, or `None` for the whole file.
+
+    Only single ranges are supported; other headers are ignored, which the
+    HTTP spec allows. Raises a 416 error if the range can't be satisfied.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        stop = min(int(last) + 1, size) if last else size
+    else:
+        # suffix range: the last `last` bytes
+        start = max(size - int(last), 0)
+        stop = size
+    if start >= stop:
+        raise HTTPException(
+            HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return range(start, stop)
+
+
+def _read_shared_memory(key: str, byte_length: int) -> bytes:
     shm = None
     try:
-        # NB: this can't be collapsed into a one-liner!
-        # doing it in one line yields a 'released memoryview ...'
-        # because shared_memory has built in ref-tracking + GC
-        shm = shared_memory.SharedMemory(name=key)
-        buffer_contents = bytes(shm.buf)[: int(byte_length)]
+        # NB: the buffer must be copied before the segment is closed,
+        # since shared_memory has built in ref-tracking + GC
+        shm = shared_memory.SharedMemory(name=shared_memory_name(key))
+        return bytes(shm.buf[:byte_length])
     except FileNotFoundError as err:
         LOGGER.debug(
             "Error retrieving shared memory for virtual file: %s", err
@@ -98,11 +158,53 @@ def virtual_file(
     finally:
         if shm is not None:
             shm.close()
+
+
+@router.get("/@file/{filename_and_length:path}")
+def virtual_file(
+    request: Request,
+) -> Response:
+    """Handler for virtual files.
+
+    Files registered by a kernel in this process are served straight from
+    the kernel's buffer; others are read from shared memory. Supports
+    single-range requests, for seeking in large media.
+    """
+    filename_and_length = request.path_params["filename_and_length"]
+
+    LOGGER.debug("Getting virtual file: %s", filename_and_length)
+    if filename_and_length == EMPTY_VIRTUAL_FILE.filename:
+        return Response(content=b"", media_type="application/octet-stream")
+
+    byte_length, filename = filename_and_length.split("-", 1)
+    buffer: Union[bytes, memoryview, None] = get_in_process_buffer(filename)
+    if buffer is None:
+        buffer = _read_shared_memory(filename, int(byte_length))
+    else:
+        buffer = buffer[: int(byte_length)]
+
+    size = len(buffer)
+    headers = {
+        # Filenames are hashes of the contents, so the file at a URL never
+        # changes
+        "Cache-Control": "max-age=31536000, immutable",
+        "Accept-Ranges": "bytes",
+    }
+    status_code = HTTPStatus.OK
+    requested = parse_range(request.headers.get("range"), size)
+    if requested is not None:
+        buffer = memoryview(buffer)[requested.start : requested.stop]
+        headers["Content-Range"] = (
+            f"bytes {requested.start}-{requested.stop - 1}/{size}"
+        )
+        status_code = HTTPStatus.PARTIAL_CONTENT
+
     mimetype, _ = mimetypes.guess_type(filename)
-    return Response(
-        content=buffer_contents,
+    return BufferResponse(
+        content=buffer,
+        status_code=status_code,
         media_type=mimetype,
-        headers={"Cache-Control": "max-age=86400"},
+        headers=headers,
     )
 
 
@@ -2,14 +2,19 @@
 from __future__ import annotations
 
 from starlette.authentication import requires
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from marimo import _loggers
+from marimo._messaging.ops import serialize
 from marimo._runtime.requests import (
     FunctionCallRequest,
+    SetProfilingRequest,
     SetUIElementValueRequest,
 )
 from marimo._server.api.deps import AppState
+from marimo._server.api.status import HTTPException, HTTPStatus
 from marimo._server.api.utils import parse_request
 from marimo._server.models.models import (
     BaseResponse,
@@ -17,6 +22,7 @@ from marimo._server.models.models import (
     RunRequest,
     SuccessResponse,
     UpdateComponentValuesRequest,
+    UploadResponse,
 )
 from marimo._server.router import APIRouter
 from marimo._server.uvicorn_utils import close_uvicorn
@@ -43,6 +49,48 @@ async def set_ui_element_values(
     return SuccessResponse()
 
 
+@router.post("/upload")
+async def upload(
+    *,
+    request: Request,
+) -> UploadResponse:
+    """Upload a file for `mo.ui.file`.
+
+    The request body is the file's raw contents, which is streamed to disk.
+    The file can then be referred to in the value of a `mo.ui.file`
+    element, in place of its base64-encoded contents; see
+    `marimo._runtime.uploads`. Files that would exceed the session's upload
+    quota are rejected with a 413.
+    """
+    uploads = AppState(request).require_current_session().uploads
+    content_length = request.headers.get("content-length", "")
+    if (
+        content_length.isdigit()
+        and int(content_length) > uploads.available_bytes()
+    ):
+        raise _upload_too_large()
+    upload_id, f = uploads.create()
+    size = 0
+    try:
+        with f:
+            async for chunk in request.stream():
+                if not uploads.record_write(upload_id, len(chunk)):
+                    raise _upload_too_large()
+                await run_in_threadpool(f.write, chunk)
+                size += len(chunk)
+    except BaseException:
+        uploads.delete(upload_id)
+        raise
+    return UploadResponse(upload_id=upload_id, size=size)
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail="File exceeds the session's upload quota",
+    )
+
+
 @router.post("/instantiate")
 async def instantiate(
     *,
@@ -71,6 +119,43 @@ async def function_call(
     return SuccessResponse()
 
 
+@router.get("/profile")
+@requires("edit")
+async def get_profiles(request: Request) -> JSONResponse:
+    """Profiles of the latest runs of each session's kernel, oldest first.
+
+    Runs are only profiled while profiling is on; see `set_profiling` and
+    `marimo._runtime.profiler`.
+    """
+    app_state = AppState(request)
+    return JSONResponse(
+        {
+            session_id: [
+                serialize(profile)
+                for profile in session.session_view.kernel_profiles
+            ]
+            for session_id, session in (
+                app_state.session_manager.sessions.items()
+            )
+        }
+    )
+
+
+@router.post("/profile")
+@requires("edit")
+async def set_profiling(
+    *,
+    request: Request,
+) -> BaseResponse:
+    """Turn profiling of runs on or off, in every session's kernel."""
+    app_state = AppState(request)
+    body = await parse_request(request, cls=SetProfilingRequest)
+    for session in app_state.session_manager.sessions.values():
+        session.put_control_request(body)
+
+    return SuccessResponse()
+
+
 @router.post("/interrupt")
 @requires("edit")
 async def interrupt(
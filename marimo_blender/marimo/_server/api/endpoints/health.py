@@ -33,6 +33,29 @@ async def status(request: Request) -> JSONResponse:
             "filename": app_state.filename,
             "mode": app_state.mode,
             "sessions": len(app_state.session_manager.sessions),
+            "session_views": {
+                session_id: session.session_view.memory_usage()
+                for session_id, session in (
+                    app_state.session_manager.sessions.items()
+                )
+            },
+            # per session, UI value updates skipped by the kernel because
+            # a later value for the same element was already waiting
+            "dropped_ui_updates": {
+                session_id: session.session_view.dropped_ui_updates
+                for session_id, session in (
+                    app_state.session_manager.sessions.items()
+                )
+            },
+            # per session, metrics of the connection to the frontend, such
+            # as the number of messages waiting to be sent
+            "connections": {
+                session_id: session.session_consumer.stats()
+                for session_id, session in (
+                    app_state.session_manager.sessions.items()
+                )
+                if session.session_consumer is not None
+            },
             "version": __version__,
             "lsp_running": app_state.session_manager.lsp_server.is_running(),
         }
@@ -5,12 +5,13 @@ import asyncio
 import json
 import os
 from enum import IntEnum
-from typing import Callable, Optional
+from typing import Any, Callable, Optional
 
 from starlette.websockets import WebSocket, WebSocketDisconnect, WebSocketState
 
 from marimo import _loggers
 from marimo._ast.cell import CellConfig, CellId_t
+from marimo._config.manager import UserConfigManager
 from marimo._messaging.ops import (
     Alert,
     Banner,
@@ -30,6 +31,7 @@ from marimo._server.model import (
     SessionMode,
 )
 from marimo._server.router import APIRouter
+from marimo._server.session.outbound_queue import OutboundMessageQueue
 from marimo._server.sessions import Session, SessionManager
 
 LOGGER = _loggers.marimo_logger()
@@ -59,6 +61,7 @@ async def websocket_endpoint(
         manager=app_state.session_manager,
         session_id=session_id,
         mode=app_state.mode,
+        config_manager=app_state.config_manager,
     ).start()
 
 
@@ -75,17 +78,19 @@ class WebsocketHandler(SessionConsumer):
         manager: SessionManager,
         session_id: str,
         mode: SessionMode,
+        config_manager: UserConfigManager,
     ):
         self.websocket = websocket
         self.manager = manager
         self.session_id = session_id
         self.mode = mode
+        self.config_manager = config_manager
         self.status: ConnectionState
         self.cancel_close_handle: Optional[asyncio.TimerHandle] = None
         self.heartbeat_task: Optional[asyncio.Task[None]] = None
         # Messages from the kernel are put in this queue
         # to be sent to the frontend
-        self.message_queue: asyncio.Queue[KernelMessage]
+        self.message_queue: OutboundMessageQueue
 
     async def _write_kernel_ready(
         self,
@@ -141,7 +146,7 @@ class WebsocketHandler(SessionConsumer):
             app_dir = os.path.dirname(mgr.filename)
             layout = read_layout_config(app_dir, app.config.layout_file)
 
-        await self.message_queue.put(
+        self.message_queue.put(
             (
                 KernelReady.name,
                 serialize(
@@ -214,7 +219,7 @@ class WebsocketHandler(SessionConsumer):
         # Accept the websocket connection
         await self.websocket.accept()
         # Create a new queue for this session
-        self.message_queue = asyncio.Queue()
+        self.message_queue = OutboundMessageQueue()
 
         session_id = self.session_id
         mgr = self.manager
@@ -265,9 +270,11 @@ class WebsocketHandler(SessionConsumer):
             if mgr.mode == SessionMode.EDIT:
                 mgr.close_all_sessions()
 
+            runtime_config = self.config_manager.get_config()["runtime"]
             new_session = mgr.create_session(
                 session_id=session_id,
                 session_consumer=self,
+                max_parallel_cells=runtime_config["max_parallel_cells"],
             )
             self.status = ConnectionState.OPEN
             # Let the frontend know it can instantiate the app.
@@ -276,20 +283,29 @@ class WebsocketHandler(SessionConsumer):
             )
             return new_session
 
-        await get_session()
+        session = await get_session()
+        # When the frontend can't keep up, stop reading from the kernel
+        self.message_queue.attach(
+            on_full=session.message_distributor.pause,
+            on_drained=session.message_distributor.resume,
+        )
 
         async def listen_for_messages() -> None:
             while True:
-                (op, data) = await self.message_queue.get()
-                await self.websocket.send_text(
-                    json.dumps(
+                # The frontend handles one message per frame, so messages
+                # are sent one by one; taking them all at once lets the
+                # queue merge the ones that arrive in a burst
+                for message in await self.message_queue.get_all():
+                    op, data = session.expand_operation(message)
+                    text = json.dumps(
                         {
                             "op": op,
                             "data": data,
                         },
                         cls=WebComponentEncoder,
                     )
-                )
+                    await self.websocket.send_text(text)
+                    self.message_queue.record_sent(len(text))
 
         async def listen_for_disconnect() -> None:
             try:
@@ -361,18 +377,21 @@ class WebsocketHandler(SessionConsumer):
         self.heartbeat_task = asyncio.create_task(_heartbeat())
 
         def listener(response: KernelMessage) -> None:
-            self.message_queue.put_nowait(response)
+            self.message_queue.put(response)
 
         return listener
 
     async def write_operation(self, op: MessageOperation) -> None:
-        await self.message_queue.put((op.name, serialize(op)))
+        self.message_queue.put((op.name, serialize(op)))
 
     def on_stop(self) -> None:
         # Cancel the heartbeat task, reader
         if self.heartbeat_task and not self.heartbeat_task.cancelled():
             self.heartbeat_task.cancel()
 
+        # Don't keep the kernel waiting on messages no one will send
+        self.message_queue.detach()
+
         # If the websocket is open, send a close message
         if (
             self.status == ConnectionState.OPEN
@@ -388,3 +407,6 @@ class WebsocketHandler(SessionConsumer):
 
     def connection_state(self) -> ConnectionState:
         return self.status
+
+    def stats(self) -> dict[str, Any]:
+        return self.message_queue.stats()
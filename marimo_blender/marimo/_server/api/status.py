@@ -11,6 +11,7 @@ class HTTPStatus(IntEnum):
     FORBIDDEN = 403
     NOT_FOUND = 404
     METHOD_NOT_ALLOWED = 405
+    REQUEST_ENTITY_TOO_LARGE = 413
     UNSUPPORTED_MEDIA_TYPE = 415
     SERVER_ERROR = 500
 
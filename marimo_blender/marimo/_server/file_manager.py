@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Optional, Tuple
 
 from marimo import _loggers
 from marimo._ast import codegen
@@ -17,6 +18,43 @@ from marimo._server.utils import canonicalize_filename
 
 LOGGER = _loggers.marimo_logger()
 
+# Apps read by `read_app`, by path, with the (mtime, size) of their file
+_app_cache: Dict[str, Tuple[Tuple[int, int], InternalApp]] = {}
+_app_cache_lock = threading.Lock()
+
+
+def read_app(path: Optional[str]) -> InternalApp:
+    """Read the app from a file, reusing the last read if it's unchanged.
+
+    The returned app is shared between callers, and must not be modified;
+    use an `AppFileManager` to edit an app.
+    """
+    if path is None:
+        return AppFileManager._load_app(path)
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return AppFileManager._load_app(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _app_cache_lock:
+        cached = _app_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    app = AppFileManager._load_app(path)
+    with _app_cache_lock:
+        _app_cache[path] = (key, app)
+    return app
+
+
+def invalidate_app(path: Optional[str]) -> None:
+    """Forget the app read from `path`, after writing to the file."""
+    if path is None:
+        return
+    with _app_cache_lock:
+        _app_cache.pop(os.path.abspath(path), None)
+
 
 class AppFileManager:
     def __init__(self, filename: Optional[str]) -> None:
@@ -69,6 +107,10 @@ class AppFileManager:
                 status_code=HTTPStatus.SERVER_ERROR,
                 detail="Failed to save file {0}".format(filename),
             ) from err
+        finally:
+            # the file's mtime may not change if it's written twice in a
+            # short time
+            invalidate_app(filename)
 
     def _rename_file(self, new_filename: str) -> None:
         assert self.filename is not None
@@ -81,6 +123,9 @@ class AppFileManager:
                     self.filename, new_filename
                 ),
             ) from err
+        finally:
+            invalidate_app(self.filename)
+            invalidate_app(new_filename)
 
     @staticmethod
     def _load_app(path: Optional[str]) -> InternalApp:
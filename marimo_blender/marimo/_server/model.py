@@ -1,7 +1,7 @@
 # Copyright 2024 Marimo. All rights reserved.
 import abc
 from enum import Enum
-from typing import Callable
+from typing import Any, Callable, Dict
 
 from marimo._messaging.ops import MessageOperation
 from marimo._messaging.types import KernelMessage
@@ -54,3 +54,7 @@ class SessionConsumer(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def connection_state(self) -> ConnectionState:
         raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Metrics of the connection, such as its number of queued messages"""
+        return {}
@@ -37,6 +37,12 @@ class SuccessResponse(BaseResponse):
     success: bool = True
 
 
+@dataclass
+class UploadResponse:
+    upload_id: str
+    size: int
+
+
 @dataclass
 class FormatRequest:
     codes: Dict[CellId_t, str]
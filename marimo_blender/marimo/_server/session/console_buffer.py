@@ -0,0 +1,226 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Bounded console history for a cell.
+
+The server keeps each cell's console output so that it can be replayed to
+a frontend that reconnects. Cells that print in a loop (a Blender bake
+reporting progress, for example) would otherwise make that history, and
+the replay, grow without bound.
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import Iterable, Iterator, Optional
+
+from marimo._messaging.cell_output import CellChannel, CellOutput
+
+# Console history kept per cell; older output is dropped first. Sizes are
+# measured in characters of text.
+CONSOLE_HISTORY_MAX_BYTES = int(
+    os.getenv("MARIMO_CONSOLE_HISTORY_MAX_BYTES", 1_000_000)
+)
+CONSOLE_HISTORY_MAX_LINES = int(
+    os.getenv("MARIMO_CONSOLE_HISTORY_MAX_LINES", 10_000)
+)
+
+# Channels whose adjacent outputs can be merged into one
+_COALESCED_CHANNELS = (CellChannel.STDOUT, CellChannel.STDERR)
+# Outputs are merged as they arrive only while smaller than this, which
+# bounds the copying done per write; the rest is merged on `to_list`.
+_COALESCE_MAX_CHARS = 4096
+
+
+def _size(output: CellOutput) -> tuple[int, int]:
+    """Size of an output, in characters and newlines."""
+    if isinstance(output.data, str):
+        return len(output.data), output.data.count("\n")
+    # errors and other structured data count as a single line
+    return 0, 1
+
+
+class ConsoleBuffer:
+    """Ring buffer of a cell's console outputs.
+
+    Adjacent text outputs on the same stdout/stderr channel are coalesced
+    into one, so a cell printing many small chunks is stored (and replayed)
+    as a few outputs. When the buffer exceeds `max_bytes` or `max_lines`,
+    the oldest output is dropped, and a marker saying how much was dropped
+    is shown in its place.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CONSOLE_HISTORY_MAX_BYTES,
+        max_lines: int = CONSOLE_HISTORY_MAX_LINES,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_lines = max_lines
+        self._outputs: deque[CellOutput] = deque()
+        self.n_bytes = 0
+        self.n_lines = 0
+        # output dropped since the buffer was last cleared
+        self.n_truncated_bytes = 0
+        self.n_truncated_lines = 0
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def __iter__(self) -> Iterator[CellOutput]:
+        return iter(self._outputs)
+
+    @property
+    def truncated(self) -> bool:
+        return self.n_truncated_bytes > 0 or self.n_truncated_lines > 0
+
+    def clear(self) -> None:
+        self._outputs.clear()
+        self.n_bytes = 0
+        self.n_lines = 0
+        self.n_truncated_bytes = 0
+        self.n_truncated_lines = 0
+
+    def extend(self, outputs: Iterable[CellOutput]) -> None:
+        for output in outputs:
+            self.append(output)
+
+    def append(self, output: CellOutput) -> None:
+        last = self._outputs[-1] if self._outputs else None
+        if (
+            last is not None
+            and _can_coalesce(last, output)
+            and len(last.data) < _COALESCE_MAX_CHARS
+        ):
+            assert isinstance(last.data, str)
+            assert isinstance(output.data, str)
+            # replace rather than mutate: the last output may be shared with
+            # an operation that was already sent
+            self._outputs[-1] = CellOutput(
+                channel=last.channel,
+                mimetype=last.mimetype,
+                data=last.data + output.data,
+                timestamp=output.timestamp,
+            )
+        else:
+            self._outputs.append(output)
+        n_bytes, n_lines = _size(output)
+        self.n_bytes += n_bytes
+        self.n_lines += n_lines
+        self._evict()
+
+    def answer_stdin(self, stdin: str) -> bool:
+        """Show `stdin` as the answer to the first prompt waiting for it.
+
+        Returns whether a prompt was waiting.
+        """
+        for index, output in enumerate(self._outputs):
+            if output.channel != CellChannel.STDIN:
+                continue
+            # replace rather than mutate, as in `append`
+            answered = CellOutput(
+                channel=CellChannel.STDOUT,
+                mimetype=output.mimetype,
+                data=f"{output.data} {stdin}\n",
+                timestamp=output.timestamp,
+            )
+            self._outputs[index] = answered
+            old_bytes, old_lines = _size(output)
+            n_bytes, n_lines = _size(answered)
+            self.n_bytes += n_bytes - old_bytes
+            self.n_lines += n_lines - old_lines
+            self._evict()
+            return True
+        return False
+
+    def to_list(self) -> list[CellOutput]:
+        """The buffered outputs, preceded by a marker if any were dropped.
+
+        Adjacent outputs that can be coalesced are merged.
+        """
+        outputs: list[CellOutput] = []
+        marker = self._truncation_marker()
+        if marker is not None:
+            outputs.append(marker)
+        run: list[CellOutput] = []
+        for output in self._outputs:
+            if run and not _can_coalesce(run[-1], output):
+                outputs.append(_merge(run))
+                run = []
+            run.append(output)
+        if run:
+            outputs.append(_merge(run))
+        return outputs
+
+    def _evict(self) -> None:
+        while self._outputs and (
+            self.n_bytes > self.max_bytes or self.n_lines > self.max_lines
+        ):
+            oldest = self._outputs[0]
+            n_bytes, n_lines = _size(oldest)
+            if not isinstance(oldest.data, str):
+                self._outputs.popleft()
+                self._drop(n_bytes, n_lines)
+                continue
+
+            # Drop as little as possible: whole lines from the front of the
+            # oldest output, then characters
+            data = oldest.data
+            excess_lines = self.n_lines - self.max_lines
+            if 0 < excess_lines < n_lines:
+                start = -1
+                for _ in range(excess_lines):
+                    start = data.index("\n", start + 1)
+                data = data[start + 1 :]
+            elif excess_lines > 0:
+                data = ""
+            excess_bytes = (
+                self.n_bytes - (n_bytes - len(data)) - self.max_bytes
+            )
+            if excess_bytes > 0:
+                data = data[excess_bytes:]
+
+            if data:
+                self._outputs[0] = CellOutput(
+                    channel=oldest.channel,
+                    mimetype=oldest.mimetype,
+                    data=data,
+                    timestamp=oldest.timestamp,
+                )
+            else:
+                self._outputs.popleft()
+            self._drop(n_bytes - len(data), n_lines - data.count("\n"))
+
+    def _drop(self, n_bytes: int, n_lines: int) -> None:
+        self.n_bytes -= n_bytes
+        self.n_lines -= n_lines
+        self.n_truncated_bytes += n_bytes
+        self.n_truncated_lines += n_lines
+
+    def _truncation_marker(self) -> Optional[CellOutput]:
+        if not self.truncated:
+            return None
+        return CellOutput.stderr(
+            f"[marimo] {self.n_truncated_lines} earlier lines "
+            f"({self.n_truncated_bytes} characters) of console output "
+            "were truncated.\n"
+        )
+
+
+def _can_coalesce(first: CellOutput, second: CellOutput) -> bool:
+    return (
+        second.channel in _COALESCED_CHANNELS
+        and first.channel == second.channel
+        and first.mimetype == second.mimetype
+        and isinstance(first.data, str)
+        and isinstance(second.data, str)
+    )
+
+
+def _merge(outputs: list[CellOutput]) -> CellOutput:
+    if len(outputs) == 1:
+        return outputs[0]
+    return CellOutput(
+        channel=outputs[0].channel,
+        mimetype=outputs[0].mimetype,
+        data="".join(output.data for output in outputs),  # type: ignore
+        timestamp=outputs[-1].timestamp,
+    )
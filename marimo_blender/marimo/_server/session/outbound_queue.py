@@ -0,0 +1,227 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Queue of kernel messages waiting to be sent to a frontend.
+
+A kernel that prints in a tight loop, or streams status changes, can
+produce messages faster than a slow browser consumes them. The queue:
+
+- merges a `CellOp` into the cell's previous `CellOp` when it is still
+  waiting and the merge doesn't change what the frontend ends up showing;
+- keeps one of each incremental operation (an item appended to a cell's
+  output, a change to the variables) waiting: these are expanded to the
+  state they result in when sent (see `Session.expand_operation`), so the
+  waiting one already stands for the later ones;
+- lets the sender take all waiting messages at once, shortly after the
+  first arrives, so that messages produced in a burst can be merged;
+- is bounded: once more than `max_size` messages wait, the producer is
+  told to pause (the session stops reading from the kernel, which blocks
+  the kernel when its pipe fills up), and to resume once at most half of
+  them are left;
+- keeps metrics: queue depth, merged messages, and bytes sent per second.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from marimo._ast.cell import CellId_t
+from marimo._messaging.types import KernelMessage
+
+# Maximum number of messages waiting to be sent before the session stops
+# reading from the kernel
+OUTBOUND_QUEUE_MAX_SIZE = int(
+    os.getenv("MARIMO_OUTBOUND_QUEUE_MAX_SIZE", 1000)
+)
+
+# Seconds to wait after a message arrives for more messages to merge with
+OUTBOUND_FLUSH_INTERVAL = float(
+    os.getenv("MARIMO_OUTBOUND_FLUSH_INTERVAL", 0.005)
+)
+
+# Seconds over which the rate of bytes sent is measured
+_RATE_WINDOW = 5.0
+
+# Operations sent as the state they result in; a `cell-op` with an output
+# or a `variables` op replaces that state.
+_INCREMENTAL_OPS = {"cell-output-append", "variables-delta"}
+
+
+class OutboundMessageQueue:
+    """Messages waiting to be sent to a frontend; see the module docs.
+
+    Must be used from the event loop's thread.
+    """
+
+    def __init__(
+        self,
+        max_size: int = OUTBOUND_QUEUE_MAX_SIZE,
+        flush_interval: float = OUTBOUND_FLUSH_INTERVAL,
+    ) -> None:
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        # called when the queue becomes full, and once it has drained
+        self._on_full: Optional[Callable[[], None]] = None
+        self._on_drained: Optional[Callable[[], None]] = None
+        self._messages: deque[KernelMessage] = deque()
+        # number of messages popped from the front of `_messages`, so that
+        # messages can be addressed by a stable position
+        self._n_popped = 0
+        # position of each cell's last waiting CellOp, if nothing that
+        # could depend on its order was queued after it
+        self._cell_ops: dict[CellId_t, int] = {}
+        # incremental operations waiting to be sent, by name and cell id
+        self._incremental: set[tuple[str, Optional[CellId_t]]] = set()
+        self._not_empty = asyncio.Event()
+        self._full = False
+        # metrics
+        self._max_depth = 0
+        self._n_merged = 0
+        self._n_sent = 0
+        self._bytes_sent = 0
+        self._n_full = 0
+        self._recent_sends: deque[tuple[float, int]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def put(self, message: KernelMessage) -> None:
+        op, data = message
+        if op == "cell-op":
+            if data["output"] is not None:
+                # appends that come next build on this output
+                self._incremental.discard(
+                    ("cell-output-append", data["cell_id"])
+                )
+            position = self._cell_ops.get(data["cell_id"])
+            if position is not None:
+                index = position - self._n_popped
+                previous_op, previous = self._messages[index]
+                merged = _merge_cell_ops(previous, data)
+                if merged is not None:
+                    self._messages[index] = (previous_op, merged)
+                    self._n_merged += 1
+                    return
+            self._cell_ops[data["cell_id"]] = self._n_popped + len(
+                self._messages
+            )
+        else:
+            if op in _INCREMENTAL_OPS:
+                key = (op, data.get("cell_id"))
+                if key in self._incremental:
+                    self._n_merged += 1
+                    return
+                self._incremental.add(key)
+            elif op == "variables":
+                self._incremental.discard(("variables-delta", None))
+            # other messages may depend on the order of cell ops (e.g.
+            # removing a cell's UI elements before it shows new ones)
+            self._cell_ops.clear()
+
+        self._messages.append(message)
+        self._not_empty.set()
+        self._max_depth = max(self._max_depth, len(self._messages))
+        if not self._full and len(self._messages) > self.max_size:
+            self._full = True
+            self._n_full += 1
+            if self._on_full is not None:
+                self._on_full()
+
+    async def get_all(self) -> list[KernelMessage]:
+        """Wait for messages, and take all that are waiting."""
+        await self._not_empty.wait()
+        if self.flush_interval > 0:
+            await asyncio.sleep(self.flush_interval)
+        messages = list(self._messages)
+        self._messages.clear()
+        self._n_popped += len(messages)
+        self._cell_ops.clear()
+        self._incremental.clear()
+        self._not_empty.clear()
+        self.release()
+        return messages
+
+    def attach(
+        self, on_full: Callable[[], None], on_drained: Callable[[], None]
+    ) -> None:
+        """Apply backpressure to a producer with these callbacks."""
+        self._on_full = on_full
+        self._on_drained = on_drained
+        if self._full:
+            on_full()
+
+    def detach(self) -> None:
+        """Stop applying backpressure, letting the producer resume."""
+        on_drained = self._on_drained
+        self._on_full = self._on_drained = None
+        if self._full:
+            self._full = False
+            if on_drained is not None:
+                on_drained()
+
+    def release(self) -> None:
+        """Let the producer resume, if the queue has drained."""
+        if self._full and len(self._messages) <= self.max_size // 2:
+            self._full = False
+            if self._on_drained is not None:
+                self._on_drained()
+
+    def record_sent(self, n_bytes: int) -> None:
+        """Record that a message of `n_bytes` was sent."""
+        now = time.monotonic()
+        self._n_sent += 1
+        self._bytes_sent += n_bytes
+        self._recent_sends.append((now, n_bytes))
+        self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        while self._recent_sends and (
+            self._recent_sends[0][0] < now - _RATE_WINDOW
+        ):
+            self._recent_sends.popleft()
+
+    def stats(self) -> dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            "queue_depth": len(self._messages),
+            "max_queue_depth": self._max_depth,
+            "times_full": self._n_full,
+            "messages_merged": self._n_merged,
+            "messages_sent": self._n_sent,
+            "bytes_sent": self._bytes_sent,
+            "bytes_per_second": (
+                sum(n_bytes for _, n_bytes in self._recent_sends)
+                / _RATE_WINDOW
+            ),
+        }
+
+
+def _as_list(console: Any) -> list[Any]:
+    if console is None:
+        return []
+    return console if isinstance(console, list) else [console]
+
+
+def _merge_cell_ops(
+    previous: dict[str, Any], next_: dict[str, Any]
+) -> Optional[dict[str, Any]]:
+    """A serialized CellOp equivalent to `previous` followed by `next_`.
+
+    Returns `None` if the ops can't be merged: `next_` changes the cell's
+    status (the frontend acts on transitions, such as clearing the console
+    when a queued cell starts running), or either op clears the console.
+    """
+    if next_["status"] is not None and next_["status"] != previous["status"]:
+        return None
+    if previous["console"] == [] or next_["console"] == []:
+        return None
+
+    merged = dict(previous)
+    if next_["output"] is not None:
+        merged["output"] = next_["output"]
+    if next_["console"] is not None:
+        merged["console"] = _as_list(previous["console"]) + _as_list(
+            next_["console"]
+        )
+    return merged
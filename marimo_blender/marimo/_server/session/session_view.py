@@ -1,19 +1,30 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import replace
 from typing import Any, Optional, Union
 
+from marimo import _loggers
 from marimo._ast.cell import CellId_t
 from marimo._messaging.cell_output import CellChannel, CellOutput
 from marimo._messaging.ops import (
     CellOp,
+    CellOutputAppend,
+    CompletedRun,
     Interrupted,
+    KernelProfile,
     MessageOperation,
+    Op,
+    VariableDeclaration,
     Variables,
+    VariablesDelta,
     VariableValue,
     VariableValues,
 )
+from marimo._messaging.types import KernelMessage
+from marimo._output.builder import h
+from marimo._plugins.stateless.flex import vstack
 from marimo._runtime.requests import (
     ControlRequest,
     CreationRequest,
@@ -21,27 +32,86 @@ from marimo._runtime.requests import (
     ExecutionRequest,
     SetUIElementValueRequest,
 )
+from marimo._server.session.console_buffer import (
+    CONSOLE_HISTORY_MAX_BYTES,
+    CONSOLE_HISTORY_MAX_LINES,
+    ConsoleBuffer,
+)
 from marimo._utils.parse_dataclass import parse_raw
 
+LOGGER = _loggers.marimo_logger()
+
+# Number of profiles of kernel runs kept (see `marimo._runtime.profiler`)
+KERNEL_PROFILES_MAX = 20
+
+# Operations that `add_operation` keeps track of, by name; other operations
+# received from the kernel aren't parsed
+_TRACKED_OPERATIONS: dict[str, type[Op]] = {
+    op.name: op
+    for op in (
+        CellOp,
+        CellOutputAppend,
+        Variables,
+        VariablesDelta,
+        VariableValues,
+        Interrupted,
+        KernelProfile,
+        CompletedRun,
+    )
+}
+
+# The items of a `vstack` go before the closing tag of its container
+_STACK_START, _STACK_END = vstack([]).text.rsplit("</div>", 1)[0], "</div>"
+
 
 class SessionView:
     """
     This stores the current view of the session.
 
     Which are the cell's outputs, status, and console.
+
+    Each cell's console history is capped at `max_console_bytes`
+    characters and `max_console_lines` lines; older output is dropped.
     """
 
-    def __init__(self) -> None:
-        # List of operations we care about keeping track of.
+    def __init__(
+        self,
+        max_console_bytes: int = CONSOLE_HISTORY_MAX_BYTES,
+        max_console_lines: int = CONSOLE_HISTORY_MAX_LINES,
+    ) -> None:
+        self.max_console_bytes = max_console_bytes
+        self.max_console_lines = max_console_lines
+        # List of operations we care about keeping track of; their consoles
+        # are kept in `consoles`, and appended outputs are only stacked by
+        # `get_cell_operation`.
         self.cell_operations: dict[CellId_t, CellOp] = {}
-        # The most recent Variables operation.
+        # Map of cell id to its console history.
+        self.consoles: dict[CellId_t, ConsoleBuffer] = {}
+        # The most recent Variables operation, with any later
+        # VariablesDelta applied.
         self.variable_operations: Variables = Variables(variables=[])
+        # Map of variable name to its declaration, in the same order.
+        self.variable_declarations: dict[str, VariableDeclaration] = {}
         # Map of variable name to value.
         self.variable_values: dict[str, VariableValue] = {}
         # Map of object id to value.
         self.ui_values: dict[str, Any] = {}
         # Map of cell id to the last code that was executed in that cell.
         self.last_executed_code: dict[CellId_t, str] = {}
+        # Map of object id to the number of its value updates the kernel
+        # skipped, because a later value was already waiting.
+        self.dropped_ui_updates: dict[str, int] = {}
+        # Map of cell id to the items appended to its output (see
+        # `CellOutputAppend`), if its output is a stack of such items; items
+        # are kept as they appear in the stack.
+        self.appended_outputs: dict[CellId_t, list[str]] = {}
+        # Cells whose output must be rebuilt from their appended items; the
+        # stack is built when read, so that appending takes constant time.
+        self._stale_outputs: set[CellId_t] = set()
+        # Profiles of the latest runs, if profiling is on; oldest first.
+        self.kernel_profiles: deque[KernelProfile] = deque(
+            maxlen=KERNEL_PROFILES_MAX
+        )
 
     def _add_ui_value(self, name: str, value: Any) -> None:
         self.ui_values[name] = value
@@ -49,15 +119,13 @@ class SessionView:
     def _add_last_run_code(self, req: ExecutionRequest) -> None:
         self.last_executed_code[req.cell_id] = req.code
 
-    def add_raw_operation(self, raw_operation: Any) -> None:
-        # parse_raw only accepts a dataclass, so we wrap MessageOperation in a
-        # dataclass.
-        @dataclass
-        class _Container:
-            operation: MessageOperation
-
-        operation = parse_raw({"operation": raw_operation}, _Container)
-        self.add_operation(operation.operation)
+    def add_raw_operation(self, raw_operation: KernelMessage) -> None:
+        """Add an operation received from the kernel, as (name, data)."""
+        name, data = raw_operation
+        cls = _TRACKED_OPERATIONS.get(name)
+        if cls is None:
+            return
+        self.add_operation(parse_raw(data, cls))  # type: ignore[arg-type]
 
     def add_control_request(self, request: ControlRequest) -> None:
         if isinstance(request, SetUIElementValueRequest):
@@ -78,24 +146,33 @@ class SessionView:
     def add_stdin(self, stdin: str) -> None:
         """Add a stdin request to the session view."""
         # Find the first cell that is waiting for stdin.
-        for cell_op in self.cell_operations.values():
-            console_ops: list[CellOutput] = as_list(cell_op.console)
-            for cell_output in console_ops:
-                if cell_output.channel == CellChannel.STDIN:
-                    cell_output.channel = CellChannel.STDOUT
-                    cell_output.data = f"{cell_output.data} {stdin}\n"
-                    return
+        for console in self.consoles.values():
+            if console.answer_stdin(stdin):
+                return
 
     def add_operation(self, operation: MessageOperation) -> None:
         """Add an operation to the session view."""
 
         if isinstance(operation, CellOp):
+            if operation.output is not None:
+                self.appended_outputs.pop(operation.cell_id, None)
+                self._stale_outputs.discard(operation.cell_id)
             previous = self.cell_operations.get(operation.cell_id)
+            if operation.cell_id not in self.consoles:
+                self.consoles[operation.cell_id] = ConsoleBuffer(
+                    self.max_console_bytes, self.max_console_lines
+                )
             self.cell_operations[operation.cell_id] = merge_cell_operation(
-                previous, operation
+                previous, operation, self.consoles[operation.cell_id]
             )
+        elif isinstance(operation, CellOutputAppend):
+            self._append_output(operation)
+
         elif isinstance(operation, Variables):
             self.variable_operations = operation
+            self.variable_declarations = {
+                v.name: v for v in self.variable_operations.variables
+            }
 
             # Remove any variable values that are no longer in scope.
             names: set[str] = set(
@@ -107,6 +184,16 @@ class SessionView:
                     next_values[name] = value
             self.variable_values = next_values
 
+        elif isinstance(operation, VariablesDelta):
+            for name in operation.removed:
+                self.variable_declarations.pop(name, None)
+                self.variable_values.pop(name, None)
+            for declaration in operation.variables:
+                self.variable_declarations[declaration.name] = declaration
+            self.variable_operations = Variables(
+                variables=list(self.variable_declarations.values())
+            )
+
         elif isinstance(operation, VariableValues):
             for value in operation.variables:
                 self.variable_values[value.name] = value
@@ -115,22 +202,96 @@ class SessionView:
             # Resolve stdin
             self.add_stdin("")
 
+        elif isinstance(operation, KernelProfile):
+            self.kernel_profiles.append(operation)
+
+        elif isinstance(operation, CompletedRun):
+            for object_id, n_dropped in operation.dropped_ui_updates.items():
+                self.dropped_ui_updates[object_id] = (
+                    self.dropped_ui_updates.get(object_id, 0) + n_dropped
+                )
+
+    def _append_output(self, operation: CellOutputAppend) -> None:
+        items = (
+            []
+            if operation.index == 0
+            else self.appended_outputs.get(operation.cell_id, [])
+        )
+        if operation.index != len(items):
+            LOGGER.warning(
+                "Dropping item %s appended to the output of cell %s: "
+                "expected item %s",
+                operation.index,
+                operation.cell_id,
+                len(items),
+            )
+            return
+        items.append(h.div(operation.output.data))
+        self.appended_outputs[operation.cell_id] = items
+        if operation.cell_id not in self.cell_operations:
+            self.add_operation(CellOp(cell_id=operation.cell_id))
+        self._stale_outputs.add(operation.cell_id)
+
+    def get_cell_operation(self, cell_id: CellId_t) -> Optional[CellOp]:
+        """The cell's merged operation, with its appended items stacked."""
+        cell_op = self.cell_operations.get(cell_id)
+        if cell_op is not None and cell_id in self._stale_outputs:
+            self._stale_outputs.discard(cell_id)
+            # same as `vstack` of the items, without formatting them again
+            cell_op.output = CellOutput(
+                channel=CellChannel.OUTPUT,
+                mimetype="text/html",
+                data=_STACK_START
+                + "".join(self.appended_outputs[cell_id])
+                + _STACK_END,
+            )
+        return cell_op
+
     @property
     def operations(self) -> list[MessageOperation]:
+        for cell_id in list(self._stale_outputs):
+            self.get_cell_operation(cell_id)
         all_ops: list[MessageOperation] = [
             self.variable_operations,
             VariableValues(variables=list(self.variable_values.values())),
         ]
-        all_ops.extend(self.cell_operations.values())
+        all_ops.extend(
+            replace(cell_op, console=self.consoles[cell_id].to_list())
+            for cell_id, cell_op in self.cell_operations.items()
+        )
         return all_ops
 
+    def memory_usage(self) -> dict[str, int]:
+        """Approximate size of the state kept for replay."""
+        consoles = self.consoles.values()
+        return {
+            "cells": len(self.cell_operations),
+            "console_outputs": sum(len(console) for console in consoles),
+            "console_bytes": sum(console.n_bytes for console in consoles),
+            "console_lines": sum(console.n_lines for console in consoles),
+            "truncated_console_bytes": sum(
+                console.n_truncated_bytes for console in consoles
+            ),
+            "variable_values": len(self.variable_values),
+            "ui_values": len(self.ui_values),
+            "kernel_profiles": len(self.kernel_profiles),
+        }
+
 
 def merge_cell_operation(
     previous: Optional[CellOp],
     next_: CellOp,
+    console: Optional[ConsoleBuffer] = None,
 ) -> CellOp:
-    """Merge two cell operations."""
+    """Merge two cell operations.
+
+    If a `console` buffer is given, the console history is accumulated in
+    it instead of in the returned operation.
+    """
     if previous is None:
+        if console is not None:
+            console.extend(as_list(next_.console))
+            next_.console = None
         return next_
 
     assert previous.cell_id == next_.cell_id
@@ -139,7 +300,14 @@ def merge_cell_operation(
         next_.status = previous.status
 
     # If we went from queued to running, clear the console.
-    if next_.status == "running" and previous.status == "queued":
+    clear_console = next_.status == "running" and previous.status == "queued"
+    if console is not None:
+        if clear_console:
+            console.clear()
+        else:
+            console.extend(as_list(next_.console))
+        next_.console = None
+    elif clear_console:
         next_.console = []
     else:
         combined_console: list[CellOutput] = as_list(previous.console)
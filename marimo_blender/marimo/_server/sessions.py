@@ -30,7 +30,17 @@ from uuid import uuid4
 from marimo import _loggers
 from marimo._ast.app import InternalApp, _AppConfig
 from marimo._ast.cell import CellConfig, CellId_t
-from marimo._messaging.ops import Alert, MessageOperation, Reload
+from marimo._messaging.framing import FrameAssembler
+from marimo._messaging.ops import (
+    Alert,
+    CellOp,
+    CellOutputAppend,
+    MessageOperation,
+    Reload,
+    Variables,
+    VariablesDelta,
+    serialize,
+)
 from marimo._messaging.types import KernelMessage
 from marimo._output.formatters.formatters import register_formatters
 from marimo._runtime import requests, runtime
@@ -40,7 +50,8 @@ from marimo._runtime.requests import (
     ExecutionRequest,
     SetUIElementValueRequest,
 )
-from marimo._server.file_manager import AppFileManager
+from marimo._runtime.uploads import SessionUploads
+from marimo._server.file_manager import AppFileManager, read_app
 from marimo._server.model import (
     ConnectionState,
     SessionConsumer,
@@ -116,12 +127,14 @@ class KernelManager:
         mode: SessionMode,
         configs: dict[CellId_t, CellConfig],
         app_metadata: AppMetadata,
+        max_parallel_cells: int = 1,
     ) -> None:
         self.kernel_task: Optional[threading.Thread] | Optional[mp.Process]
         self.queue_manager = queue_manager
         self.mode = mode
         self.configs = configs
         self.app_metadata = app_metadata
+        self.max_parallel_cells = max_parallel_cells
         self._read_conn: Optional[TypedConnection[KernelMessage]] = None
 
     def start_kernel(self) -> None:
@@ -144,6 +157,7 @@ class KernelManager:
                     is_edit_mode,
                     self.configs,
                     self.app_metadata,
+                    self.max_parallel_cells,
                 ),
                 # The process can't be a daemon, because daemonic processes
                 # can't create children
@@ -179,6 +193,7 @@ class KernelManager:
                     is_edit_mode,
                     self.configs,
                     self.app_metadata,
+                    self.max_parallel_cells,
                 ),
                 # daemon threads can create child processes, unlike
                 # daemon processes
@@ -236,12 +251,13 @@ class Session:
         mode: SessionMode,
         app_metadata: AppMetadata,
         app_file_manager: AppFileManager,
+        max_parallel_cells: int = 1,
     ) -> Session:
         configs = app_file_manager.app.cell_manager.config_map()
         use_multiprocessing = mode == SessionMode.EDIT
         queue_manager = QueueManager(use_multiprocessing)
         kernel_manager = KernelManager(
-            queue_manager, mode, configs, app_metadata
+            queue_manager, mode, configs, app_metadata, max_parallel_cells
         )
         return cls(
             session_consumer,
@@ -266,15 +282,17 @@ class Session:
         self._queue_manager = queue_manager
         self.kernel_manager = kernel_manager
         self.session_view = SessionView()
+        self.uploads = SessionUploads()
 
         self.kernel_manager.start_kernel()
         # Reads from the kernel connection and distributes the
         # messages to each subscriber.
         self.message_distributor = Distributor[KernelMessage](
-            self.kernel_manager.kernel_connection
+            self.kernel_manager.kernel_connection,
+            decoder=FrameAssembler().feed,
         )
         self.message_distributor.add_consumer(
-            lambda msg: self.session_view.add_raw_operation(msg[1])
+            self.session_view.add_raw_operation
         )
         self.connect_consumer(session_consumer)
         self.message_distributor.start()
@@ -327,6 +345,31 @@ class Session:
             subscribe
         )
 
+    def expand_operation(self, message: KernelMessage) -> KernelMessage:
+        """Replace an incremental operation by the state it results in.
+
+        Frontends don't handle `CellOutputAppend` or `VariablesDelta`, so
+        they are sent the whole output or the whole list of variables, as
+        merged by the session view (which receives every message first),
+        instead. Consumers call this when sending a message, so that the
+        incremental operations waiting to be sent are expanded once.
+        """
+        op, data = message
+        if op == VariablesDelta.name:
+            return (
+                Variables.name,
+                serialize(self.session_view.variable_operations),
+            )
+        if op != CellOutputAppend.name:
+            return message
+        cell_op = self.session_view.get_cell_operation(data["cell_id"])
+        if cell_op is None or cell_op.output is None:
+            return message
+        return (
+            CellOp.name,
+            serialize(CellOp(cell_id=cell_op.cell_id, output=cell_op.output)),
+        )
+
     def get_current_state(self) -> SessionView:
         return self.session_view
 
@@ -348,6 +391,7 @@ class Session:
         self.message_distributor.stop()
         self.kernel_manager.close_kernel()
         self.unsubscribe_consumer()
+        self.uploads.delete_all()
 
     def instantiate(self, request: InstantiateRequest) -> None:
         """Instantiate the app."""
@@ -426,8 +470,10 @@ class SessionManager:
         """
         Load the app from the current file.
         Otherwise, return an empty app.
+
+        The app is cached until the file changes, and must not be modified.
         """
-        return AppFileManager(self.path).app
+        return read_app(self.path)
 
     def app_config(self) -> _AppConfig:
         """Read the app's configuration from the file."""
@@ -443,7 +489,10 @@ class SessionManager:
         self.app_metadata.filename = self._get_file_path(filename)
 
     def create_session(
-        self, session_id: SessionId, session_consumer: SessionConsumer
+        self,
+        session_id: SessionId,
+        session_consumer: SessionConsumer,
+        max_parallel_cells: int = 1,
     ) -> Session:
         """Create a new session"""
         LOGGER.debug("Creating new session for id %s", session_id)
@@ -453,6 +502,7 @@ class SessionManager:
                 mode=self.mode,
                 app_metadata=self.app_metadata,
                 app_file_manager=AppFileManager(self.path),
+                max_parallel_cells=max_parallel_cells,
             )
         return self.sessions[session_id]
 
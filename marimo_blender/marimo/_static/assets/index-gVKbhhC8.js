@@ -738,7 +738,7 @@ Error generating stack: `+o.message+`
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function dCt(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function hCt(e){if(Array.isArray(e))return DY(e)}function Kme(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter(function(i){return Object.getOwnPropertyDescriptor(e,i).enumerable})),n.push.apply(n,r)}return n}function Jme(e){for(var t=1;t<arguments.length;t++){var n=arguments[t]!=null?arguments[t]:{};t%2?Kme(Object(n),!0).forEach(function(r){CMe(e,r,n[r])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):Kme(Object(n)).forEach(function(r){Object.defineProperty(e,r,Object.getOwnPropertyDescriptor(n,r))})}return e}function CMe(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}function GT(e,t){return mCt(e)||gCt(e,t)||$Me(e,t)||pCt()}function pCt(){throw new TypeError(`Invalid attempt to destructure non-iterable instance.
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function $Me(e,t){if(e){if(typeof e=="string")return DY(e,t);var n=Object.prototype.toString.call(e).slice(8,-1);if(n==="Object"&&e.constructor&&(n=e.constructor.name),n==="Map"||n==="Set")return Array.from(e);if(n==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(n))return DY(e,t)}}function DY(e,t){(t==null||t>e.length)&&(t=e.length);for(var n=0,r=new Array(t);n<t;n++)r[n]=e[n];return r}function gCt(e,t){var n=e==null?null:typeof Symbol<"u"&&e[Symbol.iterator]||e["@@iterator"];if(n!=null){var r=[],i=!0,o=!1,s,a;try{for(n=n.call(e);!(i=(s=n.next()).done)&&(r.push(s.value),!(t&&r.length===t));i=!0);}catch(l){o=!0,a=l}finally{try{!i&&n.return!=null&&n.return()}finally{if(o)throw a}}return r}}function mCt(e){if(Array.isArray(e))return e}var yCt="file-invalid-type",vCt="file-too-large",bCt="file-too-small",OCt="too-many-files",xCt=function(t){t=Array.isArray(t)&&t.length===1?t[0]:t;var n=Array.isArray(t)?"one of ".concat(t.join(", ")):t;return{code:yCt,message:"File type must be ".concat(n)}},eye=function(t){return{code:vCt,message:"File is larger than ".concat(t," ").concat(t===1?"byte":"bytes")}},tye=function(t){return{code:bCt,message:"File is smaller than ".concat(t," ").concat(t===1?"byte":"bytes")}},wCt={code:OCt,message:"Too many files"};function EMe(e,t){var n=e.type==="application/x-moz-file"||uCt(e,t);return[n,n?null:xCt(t)]}function kMe(e,t,n){if(Av(e.size))if(Av(t)&&Av(n)){if(e.size>n)return[!1,eye(n)];if(e.size<t)return[!1,tye(t)]}else{if(Av(t)&&e.size<t)return[!1,tye(t)];if(Av(n)&&e.size>n)return[!1,eye(n)]}return[!0,null]}function Av(e){return e!=null}function SCt(e){var t=e.files,n=e.accept,r=e.minSize,i=e.maxSize,o=e.multiple,s=e.maxFiles,a=e.validator;return!o&&t.length>1||o&&s>=1&&t.length>s?!1:t.every(function(l){var c=EMe(l,n),u=GT(c,1),f=u[0],d=kMe(l,r,i),h=GT(d,1),p=h[0],g=a?a(l):null;return f&&p&&!g})}function X5(e){return typeof e.isPropagationStopped=="function"?e.isPropagationStopped():typeof e.cancelBubble<"u"?e.cancelBubble:!1}function hD(e){return e.dataTransfer?Array.prototype.some.call(e.dataTransfer.types,function(t){return t==="Files"||t==="application/x-moz-file"}):!!e.target&&!!e.target.files}function nye(e){e.preventDefault()}function _Ct(e){return e.indexOf("MSIE")!==-1||e.indexOf("Trident/")!==-1}function CCt(e){return e.indexOf("Edge/")!==-1}function $Ct(){var e=arguments.length>0&&arguments[0]!==void 0?arguments[0]:window.navigator.userAgent;return _Ct(e)||CCt(e)}function _d(){for(var e=arguments.length,t=new Array(e),n=0;n<e;n++)t[n]=arguments[n];return function(r){for(var i=arguments.length,o=new Array(i>1?i-1:0),s=1;s<i;s++)o[s-1]=arguments[s];return t.some(function(a){return!X5(r)&&a&&a.apply(void 0,[r].concat(o)),X5(r)})}}function ECt(){return"showOpenFilePicker"in window}function kCt(e){if(Av(e)){var t=Object.entries(e).filter(function(n){var r=GT(n,2),i=r[0],o=r[1],s=!0;return TMe(i)||(console.warn('Skipped "'.concat(i,'" because it is not a valid MIME type. Check https://developer.mozilla.org/en-US/docs/Web/HTTP/Basics_of_HTTP/MIME_types/Common_types for a list of valid MIME types.')),s=!1),(!Array.isArray(o)||!o.every(PMe))&&(console.warn('Skipped "'.concat(i,'" because an invalid file extension was provided.')),s=!1),s}).reduce(function(n,r){var i=GT(r,2),o=i[0],s=i[1];return Jme(Jme({},n),{},CMe({},o,s))},{});return[{description:"Files",accept:t}]}return e}function TCt(e){if(Av(e))return Object.entries(e).reduce(function(t,n){var r=GT(n,2),i=r[0],o=r[1];return[].concat(Gme(t),[i],Gme(o))},[]).filter(function(t){return TMe(t)||PMe(t)}).join(",")}function PCt(e){return e instanceof DOMException&&(e.name==="AbortError"||e.code===e.ABORT_ERR)}function RCt(e){return e instanceof DOMException&&(e.name==="SecurityError"||e.code===e.SECURITY_ERR)}function TMe(e){return e==="audio/*"||e==="video/*"||e==="image/*"||e==="text/*"||/\w+\/[-+.\w]+/g.test(e)}function PMe(e){return/^.*\.[\w]+$/.test(e)}var ACt=["children"],DCt=["open"],NCt=["refKey","role","onKeyDown","onFocus","onBlur","onClick","onDragEnter","onDragOver","onDragLeave","onDrop"],MCt=["refKey","onChange","onClick"];function ICt(e){return FCt(e)||jCt(e)||RMe(e)||LCt()}function LCt(){throw new TypeError(`Invalid attempt to spread non-iterable instance.
 In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function jCt(e){if(typeof Symbol<"u"&&e[Symbol.iterator]!=null||e["@@iterator"]!=null)return Array.from(e)}function FCt(e){if(Array.isArray(e))return NY(e)}function zQ(e,t){return BCt(e)||QCt(e,t)||RMe(e,t)||zCt()}function zCt(){throw new TypeError(`Invalid attempt to destructure non-iterable instance.
-In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function RMe(e,t){if(e){if(typeof e=="string")return NY(e,t);var n=Object.prototype.toString.call(e).slice(8,-1);if(n==="Object"&&e.constructor&&(n=e.constructor.name),n==="Map"||n==="Set")return Array.from(e);if(n==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(n))return NY(e,t)}}function NY(e,t){(t==null||t>e.length)&&(t=e.length);for(var n=0,r=new Array(t);n<t;n++)r[n]=e[n];return r}function QCt(e,t){var n=e==null?null:typeof Symbol<"u"&&e[Symbol.iterator]||e["@@iterator"];if(n!=null){var r=[],i=!0,o=!1,s,a;try{for(n=n.call(e);!(i=(s=n.next()).done)&&(r.push(s.value),!(t&&r.length===t));i=!0);}catch(l){o=!0,a=l}finally{try{!i&&n.return!=null&&n.return()}finally{if(o)throw a}}return r}}function BCt(e){if(Array.isArray(e))return e}function rye(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter(function(i){return Object.getOwnPropertyDescriptor(e,i).enumerable})),n.push.apply(n,r)}return n}function xi(e){for(var t=1;t<arguments.length;t++){var n=arguments[t]!=null?arguments[t]:{};t%2?rye(Object(n),!0).forEach(function(r){MY(e,r,n[r])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):rye(Object(n)).forEach(function(r){Object.defineProperty(e,r,Object.getOwnPropertyDescriptor(n,r))})}return e}function MY(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}function H5(e,t){if(e==null)return{};var n=WCt(e,t),r,i;if(Object.getOwnPropertySymbols){var o=Object.getOwnPropertySymbols(e);for(i=0;i<o.length;i++)r=o[i],!(t.indexOf(r)>=0)&&Object.prototype.propertyIsEnumerable.call(e,r)&&(n[r]=e[r])}return n}function WCt(e,t){if(e==null)return{};var n={},r=Object.keys(e),i,o;for(o=0;o<r.length;o++)i=r[o],!(t.indexOf(i)>=0)&&(n[i]=e[i]);return n}var Sne=O.forwardRef(function(e,t){var n=e.children,r=H5(e,ACt),i=DMe(r),o=i.open,s=H5(i,DCt);return O.useImperativeHandle(t,function(){return{open:o}},[o]),ie.createElement(O.Fragment,null,n(xi(xi({},s),{},{open:o})))});Sne.displayName="Dropzone";var AMe={disabled:!1,getFilesFromEvent:tCt,maxSize:1/0,minSize:0,multiple:!0,maxFiles:0,preventDropOnDocument:!0,noClick:!1,noKeyboard:!1,noDrag:!1,noDragEventsBubbling:!1,validator:null,useFsAccessApi:!0,autoFocus:!1};Sne.defaultProps=AMe;Sne.propTypes={children:gr.func,accept:gr.objectOf(gr.arrayOf(gr.string)),multiple:gr.bool,preventDropOnDocument:gr.bool,noClick:gr.bool,noKeyboard:gr.bool,noDrag:gr.bool,noDragEventsBubbling:gr.bool,minSize:gr.number,maxSize:gr.number,maxFiles:gr.number,disabled:gr.bool,getFilesFromEvent:gr.func,onFileDialogCancel:gr.func,onFileDialogOpen:gr.func,useFsAccessApi:gr.bool,autoFocus:gr.bool,onDragEnter:gr.func,onDragLeave:gr.func,onDragOver:gr.func,onDrop:gr.func,onDropAccepted:gr.func,onDropRejected:gr.func,onError:gr.func,validator:gr.func};var IY={isFocused:!1,isFileDialogActive:!1,isDragActive:!1,isDragAccept:!1,isDragReject:!1,acceptedFiles:[],fileRejections:[]};function DMe(){var e=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},t=xi(xi({},AMe),e),n=t.accept,r=t.disabled,i=t.getFilesFromEvent,o=t.maxSize,s=t.minSize,a=t.multiple,l=t.maxFiles,c=t.onDragEnter,u=t.onDragLeave,f=t.onDragOver,d=t.onDrop,h=t.onDropAccepted,p=t.onDropRejected,g=t.onFileDialogCancel,y=t.onFileDialogOpen,v=t.useFsAccessApi,x=t.autoFocus,m=t.preventDropOnDocument,w=t.noClick,S=t.noKeyboard,C=t.noDrag,$=t.noDragEventsBubbling,E=t.onError,R=t.validator,N=O.useMemo(function(){return TCt(n)},[n]),I=O.useMemo(function(){return kCt(n)},[n]),j=O.useMemo(function(){return typeof y=="function"?y:iye},[y]),A=O.useMemo(function(){return typeof g=="function"?g:iye},[g]),T=O.useRef(null),D=O.useRef(null),L=O.useReducer(VCt,IY),W=zQ(L,2),V=W[0],Q=W[1],B=V.isFocused,Y=V.isFileDialogActive,U=O.useRef(typeof window<"u"&&window.isSecureContext&&v&&ECt()),q=function(){!U.current&&Y&&setTimeout(function(){if(D.current){var Ne=D.current.files;Ne.length||(Q({type:"closeDialog"}),A())}},300)};O.useEffect(function(){return window.addEventListener("focus",q,!1),function(){window.removeEventListener("focus",q,!1)}},[D,Y,A,U]);var Z=O.useRef([]),oe=function(Ne){T.current&&T.current.contains(Ne.target)||(Ne.preventDefault(),Z.current=[])};O.useEffect(function(){return m&&(document.addEventListener("dragover",nye,!1),document.addEventListener("drop",oe,!1)),function(){m&&(document.removeEventListener("dragover",nye),document.removeEventListener("drop",oe))}},[T,m]),O.useEffect(function(){return!r&&x&&T.current&&T.current.focus(),function(){}},[T,x,r]);var ce=O.useCallback(function(ye){E?E(ye):console.error(ye)},[E]),re=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye),Z.current=[].concat(ICt(Z.current),[ye.target]),hD(ye)&&Promise.resolve(i(ye)).then(function(Ne){if(!(X5(ye)&&!$)){var ft=Ne.length,ht=ft>0&&SCt({files:Ne,accept:N,minSize:s,maxSize:o,multiple:a,maxFiles:l,validator:R}),pt=ft>0&&!ht;Q({isDragAccept:ht,isDragReject:pt,isDragActive:!0,type:"setDraggedFiles"}),c&&c(ye)}}).catch(function(Ne){return ce(Ne)})},[i,c,ce,$,N,s,o,a,l,R]),fe=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye);var Ne=hD(ye);if(Ne&&ye.dataTransfer)try{ye.dataTransfer.dropEffect="copy"}catch{}return Ne&&f&&f(ye),!1},[f,$]),ae=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye);var Ne=Z.current.filter(function(ht){return T.current&&T.current.contains(ht)}),ft=Ne.indexOf(ye.target);ft!==-1&&Ne.splice(ft,1),Z.current=Ne,!(Ne.length>0)&&(Q({type:"setDraggedFiles",isDragActive:!1,isDragAccept:!1,isDragReject:!1}),hD(ye)&&u&&u(ye))},[T,u,$]),ue=O.useCallback(function(ye,Ne){var ft=[],ht=[];ye.forEach(function(pt){var Mt=EMe(pt,N),on=zQ(Mt,2),At=on[0],Hr=on[1],bi=kMe(pt,s,o),Zr=zQ(bi,2),Ir=Zr[0],Qt=Zr[1],ar=R?R(pt):null;if(At&&Ir&&!ar)ft.push(pt);else{var _n=[Hr,Qt];ar&&(_n=_n.concat(ar)),ht.push({file:pt,errors:_n.filter(function(wr){return wr})})}}),(!a&&ft.length>1||a&&l>=1&&ft.length>l)&&(ft.forEach(function(pt){ht.push({file:pt,errors:[wCt]})}),ft.splice(0)),Q({acceptedFiles:ft,fileRejections:ht,type:"setFiles"}),d&&d(ft,ht,Ne),ht.length>0&&p&&p(ht,Ne),ft.length>0&&h&&h(ft,Ne)},[Q,a,N,s,o,l,d,h,p,R]),me=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye),Z.current=[],hD(ye)&&Promise.resolve(i(ye)).then(function(Ne){X5(ye)&&!$||ue(Ne,ye)}).catch(function(Ne){return ce(Ne)}),Q({type:"reset"})},[i,ue,ce,$]),ne=O.useCallback(function(){if(U.current){Q({type:"openDialog"}),j();var ye={multiple:a,types:I};window.showOpenFilePicker(ye).then(function(Ne){return i(Ne)}).then(function(Ne){ue(Ne,null),Q({type:"closeDialog"})}).catch(function(Ne){PCt(Ne)?(A(Ne),Q({type:"closeDialog"})):RCt(Ne)?(U.current=!1,D.current?(D.current.value=null,D.current.click()):ce(new Error("Cannot open the file picker because the https://developer.mozilla.org/en-US/docs/Web/API/File_System_Access_API is not supported and no <input> was provided."))):ce(Ne)});return}D.current&&(Q({type:"openDialog"}),j(),D.current.value=null,D.current.click())},[Q,j,A,v,ue,ce,I,a]),Le=O.useCallback(function(ye){!T.current||!T.current.isEqualNode(ye.target)||(ye.key===" "||ye.key==="Enter"||ye.keyCode===32||ye.keyCode===13)&&(ye.preventDefault(),ne())},[T,ne]),_e=O.useCallback(function(){Q({type:"focus"})},[]),ke=O.useCallback(function(){Q({type:"blur"})},[]),ze=O.useCallback(function(){w||($Ct()?setTimeout(ne,0):ne())},[w,ne]),Je=function(Ne){return r?null:Ne},Be=function(Ne){return S?null:Je(Ne)},K=function(Ne){return C?null:Je(Ne)},ge=function(Ne){$&&Ne.stopPropagation()},Oe=O.useMemo(function(){return function(){var ye=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},Ne=ye.refKey,ft=Ne===void 0?"ref":Ne,ht=ye.role,pt=ye.onKeyDown,Mt=ye.onFocus,on=ye.onBlur,At=ye.onClick,Hr=ye.onDragEnter,bi=ye.onDragOver,Zr=ye.onDragLeave,Ir=ye.onDrop,Qt=H5(ye,NCt);return xi(xi(MY({onKeyDown:Be(_d(pt,Le)),onFocus:Be(_d(Mt,_e)),onBlur:Be(_d(on,ke)),onClick:Je(_d(At,ze)),onDragEnter:K(_d(Hr,re)),onDragOver:K(_d(bi,fe)),onDragLeave:K(_d(Zr,ae)),onDrop:K(_d(Ir,me)),role:typeof ht=="string"&&ht!==""?ht:"presentation"},ft,T),!r&&!S?{tabIndex:0}:{}),Qt)}},[T,Le,_e,ke,ze,re,fe,ae,me,S,C,r]),Ve=O.useCallback(function(ye){ye.stopPropagation()},[]),Fe=O.useMemo(function(){return function(){var ye=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},Ne=ye.refKey,ft=Ne===void 0?"ref":Ne,ht=ye.onChange,pt=ye.onClick,Mt=H5(ye,MCt),on=MY({accept:N,multiple:a,type:"file",style:{display:"none"},onChange:Je(_d(ht,me)),onClick:Je(_d(pt,Ve)),tabIndex:-1},ft,D);return xi(xi({},on),Mt)}},[D,n,a,me,r]);return xi(xi({},V),{},{isFocused:B&&!r,getRootProps:Oe,getInputProps:Fe,rootRef:T,inputRef:D,open:Je(ne)})}function VCt(e,t){switch(t.type){case"focus":return xi(xi({},e),{},{isFocused:!0});case"blur":return xi(xi({},e),{},{isFocused:!1});case"openDialog":return xi(xi({},IY),{},{isFileDialogActive:!0});case"closeDialog":return xi(xi({},e),{},{isFileDialogActive:!1});case"setDraggedFiles":return xi(xi({},e),{},{isDragActive:t.isDragActive,isDragAccept:t.isDragAccept,isDragReject:t.isDragReject});case"setFiles":return xi(xi({},e),{},{acceptedFiles:t.acceptedFiles,fileRejections:t.fileRejections});case"reset":return xi({},IY);default:return e}}function iye(){}function NMe(e){return new Promise(t=>{const n=new FileReader;n.readAsDataURL(e),n.onload=r=>{var i;if((i=r.target)!=null&&i.result){const o=r.target.result,s=o.slice(o.indexOf(",")+1);t(s)}}})}function UCt(e){return Promise.all(e.map(t=>NMe(t).then(n=>[t.name,n])))}class qCt{constructor(){be(this,"tagName","marimo-file");be(this,"validator",H.object({filetypes:H.array(H.string()),multiple:H.boolean(),kind:H.enum(["button","area"]),label:H.string().nullable()}))}render(t){return b.jsx(HCt,{label:t.data.label,filetypes:t.data.filetypes,multiple:t.data.multiple,kind:t.data.kind,value:t.value,setValue:t.setValue})}}function YCt(e){const t={},n=(r,i)=>{Object.hasOwnProperty.call(t,r)?t[r].push(i):t[r]=[i]};return e.forEach(r=>{switch(r){case".png":case".jpg":case".jpeg":case".gif":case".avif":case".bmp":case".ico":case".svg":case".tiff":case".webp":n("image/*",r);break;case".avi":case".mp4":case".mpeg":case".ogg":case".webm":n("video/*",r);break;case".pdf":n("application/pdf",r);break;case".csv":n("text/csv",r);break;default:n("text/plain",r)}}),t}const XCt=1e8,HCt=e=>{const t=YCt(e.filetypes),{setValue:n,kind:r,multiple:i,value:o}=e,{getRootProps:s,getInputProps:a,isFocused:l,isDragAccept:c,isDragReject:u}=DMe({accept:t,multiple:i,maxSize:XCt,onError:p=>{console.error(p),Yr({title:"File upload failed",description:p.message,variant:"danger"})},onDropRejected:p=>{Yr({title:"File upload failed",description:b.jsx("div",{className:"flex flex-col gap-1",children:p.map(g=>b.jsxs("div",{children:[g.file.name," (",g.errors.map(y=>y.message).join(", "),")"]},g.file.name))}),variant:"danger"})},onDrop:p=>{UCt(p).then(g=>{n(g)}).catch(g=>{console.error(g),Yr({title:"File upload failed",description:"Failed to convert file to base64.",variant:"danger"})})}});if(r==="button"){const p=e.label??"Upload";return b.jsxs(b.Fragment,{children:[b.jsxs("button",{...s({}),className:Fb({variant:"secondary",size:"xs"}),children:[Ha({html:p}),b.jsx(U1t,{size:14,className:"ml-2"})]}),b.jsx("input",{...a({}),type:"file"})]})}const f=o.map(([p,g])=>b.jsx("li",{children:p},p)),d=f.length>0,h=e.label??"Drag and drop files here, or click to open file browser";return b.jsxs("section",{children:[b.jsxs("div",{className:ve("mt-3 mb-2 w-full flex flex-col items-center justify-center ","px-6 py-6 sm:px-8 sm:py-8 md:py-10 md:px-16","border rounded-sm","text-sm text-muted-foreground","shadow-smSolid","hover:bg-muted/60","hover:cursor-pointer","active:shadow-xsSolid","focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring focus-visible:border-accent",!l&&"bg-muted border-input/60",l&&"bg-muted/60 border-accent/40",c&&"bg-muted/60 border-accent/40 shadow-xsSolid",u&&"bg-muted/60 border-destructive/60 shadow-xsSolid"),...s(),children:[b.jsx("input",{...a()}),d?b.jsxs("span",{children:["To re-upload: ",Ha({html:h})]}):b.jsx("span",{className:"mt-0",children:Ha({html:h})})]}),b.jsx("aside",{children:d?b.jsxs("span",{className:"markdown",children:[b.jsx("strong",{children:"Uploaded files"}),b.jsx("ul",{style:{margin:0},children:f})]}):null})]})};function c6(e){return{withData(t){return{withFunctions(n){return{renderer(r){return{tagName:e,validator:t,functions:n,render:r}}}},renderer(n){return{tagName:e,validator:t,render:n}}}}}}const Z5={input(e){return{output(t){return{input:e,output:t}}}}};function MMe(e){if(typeof e=="string")return e;if(e instanceof Error)return e.message;try{return JSON.stringify(e)}catch{return String(e)}}const QQ="focusScope.autoFocusOnMount",BQ="focusScope.autoFocusOnUnmount",oye={bubbles:!1,cancelable:!0},u6=O.forwardRef((e,t)=>{const{loop:n=!1,trapped:r=!1,onMountAutoFocus:i,onUnmountAutoFocus:o,...s}=e,[a,l]=O.useState(null),c=_a(i),u=_a(o),f=O.useRef(null),d=Xt(t,g=>l(g)),h=O.useRef({paused:!1,pause(){this.paused=!0},resume(){this.paused=!1}}).current;O.useEffect(()=>{if(r){let g=function(m){if(h.paused||!a)return;const w=m.target;a.contains(w)?f.current=w:fm(f.current,{select:!0})},y=function(m){if(h.paused||!a)return;const w=m.relatedTarget;w!==null&&(a.contains(w)||fm(f.current,{select:!0}))},v=function(m){if(document.activeElement===document.body)for(const S of m)S.removedNodes.length>0&&fm(a)};document.addEventListener("focusin",g),document.addEventListener("focusout",y);const x=new MutationObserver(v);return a&&x.observe(a,{childList:!0,subtree:!0}),()=>{document.removeEventListener("focusin",g),document.removeEventListener("focusout",y),x.disconnect()}}},[r,a,h.paused]),O.useEffect(()=>{if(a){aye.add(h);const g=document.activeElement;if(!a.contains(g)){const v=new CustomEvent(QQ,oye);a.addEventListener(QQ,c),a.dispatchEvent(v),v.defaultPrevented||(ZCt(t$t(IMe(a)),{select:!0}),document.activeElement===g&&fm(a))}return()=>{a.removeEventListener(QQ,c),setTimeout(()=>{const v=new CustomEvent(BQ,oye);a.addEventListener(BQ,u),a.dispatchEvent(v),v.defaultPrevented||fm(g??document.body,{select:!0}),a.removeEventListener(BQ,u),aye.remove(h)},0)}}},[a,c,u,h]);const p=O.useCallback(g=>{if(!n&&!r||h.paused)return;const y=g.key==="Tab"&&!g.altKey&&!g.ctrlKey&&!g.metaKey,v=document.activeElement;if(y&&v){const x=g.currentTarget,[m,w]=GCt(x);m&&w?!g.shiftKey&&v===w?(g.preventDefault(),n&&fm(m,{select:!0})):g.shiftKey&&v===m&&(g.preventDefault(),n&&fm(w,{select:!0})):v===x&&g.preventDefault()}},[n,r,h.paused]);return O.createElement(Ot.div,le({tabIndex:-1},s,{ref:d,onKeyDown:p}))});function ZCt(e,{select:t=!1}={}){const n=document.activeElement;for(const r of e)if(fm(r,{select:t}),document.activeElement!==n)return}function GCt(e){const t=IMe(e),n=sye(t,e),r=sye(t.reverse(),e);return[n,r]}function IMe(e){const t=[],n=document.createTreeWalker(e,NodeFilter.SHOW_ELEMENT,{acceptNode:r=>{const i=r.tagName==="INPUT"&&r.type==="hidden";return r.disabled||r.hidden||i?NodeFilter.FILTER_SKIP:r.tabIndex>=0?NodeFilter.FILTER_ACCEPT:NodeFilter.FILTER_SKIP}});for(;n.nextNode();)t.push(n.currentNode);return t}function sye(e,t){for(const n of e)if(!KCt(n,{upTo:t}))return n}function KCt(e,{upTo:t}){if(getComputedStyle(e).visibility==="hidden")return!0;for(;e;){if(t!==void 0&&e===t)return!1;if(getComputedStyle(e).display==="none")return!0;e=e.parentElement}return!1}function JCt(e){return e instanceof HTMLInputElement&&"select"in e}function fm(e,{select:t=!1}={}){if(e&&e.focus){const n=document.activeElement;e.focus({preventScroll:!0}),e!==n&&JCt(e)&&t&&e.select()}}const aye=e$t();function e$t(){let e=[];return{add(t){const n=e[0];t!==n&&(n==null||n.pause()),e=lye(e,t),e.unshift(t)},remove(t){var n;e=lye(e,t),(n=e[0])===null||n===void 0||n.resume()}}}function lye(e,t){const n=[...e],r=n.indexOf(t);return r!==-1&&n.splice(r,1),n}function t$t(e){return e.filter(t=>t.tagName!=="A")}let WQ=0;function f6(){O.useEffect(()=>{var e,t;const n=document.querySelectorAll("[data-radix-focus-guard]");return document.body.insertAdjacentElement("afterbegin",(e=n[0])!==null&&e!==void 0?e:cye()),document.body.insertAdjacentElement("beforeend",(t=n[1])!==null&&t!==void 0?t:cye()),WQ++,()=>{WQ===1&&document.querySelectorAll("[data-radix-focus-guard]").forEach(r=>r.remove()),WQ--}},[])}function cye(){const e=document.createElement("span");return e.setAttribute("data-radix-focus-guard",""),e.tabIndex=0,e.style.cssText="outline: none; opacity: 0; position: fixed; pointer-events: none",e}var gk="right-scroll-bar-position",mk="width-before-scroll-bar",n$t="with-scroll-bars-hidden",r$t="--removed-body-scroll-bar-size";function i$t(e,t){return typeof e=="function"?e(t):e&&(e.current=t),e}function o$t(e,t){var n=O.useState(function(){return{value:e,callback:t,facade:{get current(){return n.value},set current(r){var i=n.value;i!==r&&(n.value=r,n.callback(r,i))}}}})[0];return n.callback=t,n.facade}function LMe(e,t){return o$t(t||null,function(n){return e.forEach(function(r){return i$t(r,n)})})}function s$t(e){return e}function a$t(e,t){t===void 0&&(t=s$t);var n=[],r=!1,i={read:function(){if(r)throw new Error("Sidecar: could not `read` from an `assigned` medium. `read` could be used only with `useMedium`.");return n.length?n[n.length-1]:e},useMedium:function(o){var s=t(o,r);return n.push(s),function(){n=n.filter(function(a){return a!==s})}},assignSyncMedium:function(o){for(r=!0;n.length;){var s=n;n=[],s.forEach(o)}n={push:function(a){return o(a)},filter:function(){return n}}},assignMedium:function(o){r=!0;var s=[];if(n.length){var a=n;n=[],a.forEach(o),s=n}var l=function(){var u=s;s=[],u.forEach(o)},c=function(){return Promise.resolve().then(l)};c(),n={push:function(u){s.push(u),c()},filter:function(u){return s=s.filter(u),n}}}};return i}function jMe(e){e===void 0&&(e={});var t=a$t(null);return t.options=ua({async:!0,ssr:!1},e),t}var FMe=function(e){var t=e.sideCar,n=wne(e,["sideCar"]);if(!t)throw new Error("Sidecar: please provide `sideCar` property to import the right car");var r=t.read();if(!r)throw new Error("Sidecar medium not found");return O.createElement(r,ua({},n))};FMe.isSideCarExport=!0;function zMe(e,t){return e.useMedium(t),FMe}var QMe=jMe(),VQ=function(){},d6=O.forwardRef(function(e,t){var n=O.useRef(null),r=O.useState({onScrollCapture:VQ,onWheelCapture:VQ,onTouchMoveCapture:VQ}),i=r[0],o=r[1],s=e.forwardProps,a=e.children,l=e.className,c=e.removeScrollBar,u=e.enabled,f=e.shards,d=e.sideCar,h=e.noIsolation,p=e.inert,g=e.allowPinchZoom,y=e.as,v=y===void 0?"div":y,x=wne(e,["forwardProps","children","className","removeScrollBar","enabled","shards","sideCar","noIsolation","inert","allowPinchZoom","as"]),m=d,w=LMe([n,t]),S=ua(ua({},x),i);return O.createElement(O.Fragment,null,u&&O.createElement(m,{sideCar:QMe,removeScrollBar:c,shards:f,noIsolation:h,inert:p,setCallbacks:o,allowPinchZoom:!!g,lockRef:n}),s?O.cloneElement(O.Children.only(a),ua(ua({},S),{ref:w})):O.createElement(v,ua({},S,{className:l,ref:w}),a))});d6.defaultProps={enabled:!0,removeScrollBar:!0,inert:!1};d6.classNames={fullWidth:mk,zeroRight:gk};var uye,l$t=function(){if(uye)return uye;if(typeof __webpack_nonce__<"u")return __webpack_nonce__};function c$t(){if(!document)return null;var e=document.createElement("style");e.type="text/css";var t=l$t();return t&&e.setAttribute("nonce",t),e}function u$t(e,t){e.styleSheet?e.styleSheet.cssText=t:e.appendChild(document.createTextNode(t))}function f$t(e){var t=document.head||document.getElementsByTagName("head")[0];t.appendChild(e)}var d$t=function(){var e=0,t=null;return{add:function(n){e==0&&(t=c$t())&&(u$t(t,n),f$t(t)),e++},remove:function(){e--,!e&&t&&(t.parentNode&&t.parentNode.removeChild(t),t=null)}}},h$t=function(){var e=d$t();return function(t,n){O.useEffect(function(){return e.add(t),function(){e.remove()}},[t&&n])}},_ne=function(){var e=h$t(),t=function(n){var r=n.styles,i=n.dynamic;return e(r,i),null};return t},p$t={left:0,top:0,right:0,gap:0},UQ=function(e){return parseInt(e||"",10)||0},g$t=function(e){var t=window.getComputedStyle(document.body),n=t[e==="padding"?"paddingLeft":"marginLeft"],r=t[e==="padding"?"paddingTop":"marginTop"],i=t[e==="padding"?"paddingRight":"marginRight"];return[UQ(n),UQ(r),UQ(i)]},m$t=function(e){if(e===void 0&&(e="margin"),typeof window>"u")return p$t;var t=g$t(e),n=document.documentElement.clientWidth,r=window.innerWidth;return{left:t[0],top:t[1],right:t[2],gap:Math.max(0,r-n+t[2]-t[0])}},y$t=_ne(),v$t=function(e,t,n,r){var i=e.left,o=e.top,s=e.right,a=e.gap;return n===void 0&&(n="margin"),`
+In order to be iterable, non-array objects must have a [Symbol.iterator]() method.`)}function RMe(e,t){if(e){if(typeof e=="string")return NY(e,t);var n=Object.prototype.toString.call(e).slice(8,-1);if(n==="Object"&&e.constructor&&(n=e.constructor.name),n==="Map"||n==="Set")return Array.from(e);if(n==="Arguments"||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(n))return NY(e,t)}}function NY(e,t){(t==null||t>e.length)&&(t=e.length);for(var n=0,r=new Array(t);n<t;n++)r[n]=e[n];return r}function QCt(e,t){var n=e==null?null:typeof Symbol<"u"&&e[Symbol.iterator]||e["@@iterator"];if(n!=null){var r=[],i=!0,o=!1,s,a;try{for(n=n.call(e);!(i=(s=n.next()).done)&&(r.push(s.value),!(t&&r.length===t));i=!0);}catch(l){o=!0,a=l}finally{try{!i&&n.return!=null&&n.return()}finally{if(o)throw a}}return r}}function BCt(e){if(Array.isArray(e))return e}function rye(e,t){var n=Object.keys(e);if(Object.getOwnPropertySymbols){var r=Object.getOwnPropertySymbols(e);t&&(r=r.filter(function(i){return Object.getOwnPropertyDescriptor(e,i).enumerable})),n.push.apply(n,r)}return n}function xi(e){for(var t=1;t<arguments.length;t++){var n=arguments[t]!=null?arguments[t]:{};t%2?rye(Object(n),!0).forEach(function(r){MY(e,r,n[r])}):Object.getOwnPropertyDescriptors?Object.defineProperties(e,Object.getOwnPropertyDescriptors(n)):rye(Object(n)).forEach(function(r){Object.defineProperty(e,r,Object.getOwnPropertyDescriptor(n,r))})}return e}function MY(e,t,n){return t in e?Object.defineProperty(e,t,{value:n,enumerable:!0,configurable:!0,writable:!0}):e[t]=n,e}function H5(e,t){if(e==null)return{};var n=WCt(e,t),r,i;if(Object.getOwnPropertySymbols){var o=Object.getOwnPropertySymbols(e);for(i=0;i<o.length;i++)r=o[i],!(t.indexOf(r)>=0)&&Object.prototype.propertyIsEnumerable.call(e,r)&&(n[r]=e[r])}return n}function WCt(e,t){if(e==null)return{};var n={},r=Object.keys(e),i,o;for(o=0;o<r.length;o++)i=r[o],!(t.indexOf(i)>=0)&&(n[i]=e[i]);return n}var Sne=O.forwardRef(function(e,t){var n=e.children,r=H5(e,ACt),i=DMe(r),o=i.open,s=H5(i,DCt);return O.useImperativeHandle(t,function(){return{open:o}},[o]),ie.createElement(O.Fragment,null,n(xi(xi({},s),{},{open:o})))});Sne.displayName="Dropzone";var AMe={disabled:!1,getFilesFromEvent:tCt,maxSize:1/0,minSize:0,multiple:!0,maxFiles:0,preventDropOnDocument:!0,noClick:!1,noKeyboard:!1,noDrag:!1,noDragEventsBubbling:!1,validator:null,useFsAccessApi:!0,autoFocus:!1};Sne.defaultProps=AMe;Sne.propTypes={children:gr.func,accept:gr.objectOf(gr.arrayOf(gr.string)),multiple:gr.bool,preventDropOnDocument:gr.bool,noClick:gr.bool,noKeyboard:gr.bool,noDrag:gr.bool,noDragEventsBubbling:gr.bool,minSize:gr.number,maxSize:gr.number,maxFiles:gr.number,disabled:gr.bool,getFilesFromEvent:gr.func,onFileDialogCancel:gr.func,onFileDialogOpen:gr.func,useFsAccessApi:gr.bool,autoFocus:gr.bool,onDragEnter:gr.func,onDragLeave:gr.func,onDragOver:gr.func,onDrop:gr.func,onDropAccepted:gr.func,onDropRejected:gr.func,onError:gr.func,validator:gr.func};var IY={isFocused:!1,isFileDialogActive:!1,isDragActive:!1,isDragAccept:!1,isDragReject:!1,acceptedFiles:[],fileRejections:[]};function DMe(){var e=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},t=xi(xi({},AMe),e),n=t.accept,r=t.disabled,i=t.getFilesFromEvent,o=t.maxSize,s=t.minSize,a=t.multiple,l=t.maxFiles,c=t.onDragEnter,u=t.onDragLeave,f=t.onDragOver,d=t.onDrop,h=t.onDropAccepted,p=t.onDropRejected,g=t.onFileDialogCancel,y=t.onFileDialogOpen,v=t.useFsAccessApi,x=t.autoFocus,m=t.preventDropOnDocument,w=t.noClick,S=t.noKeyboard,C=t.noDrag,$=t.noDragEventsBubbling,E=t.onError,R=t.validator,N=O.useMemo(function(){return TCt(n)},[n]),I=O.useMemo(function(){return kCt(n)},[n]),j=O.useMemo(function(){return typeof y=="function"?y:iye},[y]),A=O.useMemo(function(){return typeof g=="function"?g:iye},[g]),T=O.useRef(null),D=O.useRef(null),L=O.useReducer(VCt,IY),W=zQ(L,2),V=W[0],Q=W[1],B=V.isFocused,Y=V.isFileDialogActive,U=O.useRef(typeof window<"u"&&window.isSecureContext&&v&&ECt()),q=function(){!U.current&&Y&&setTimeout(function(){if(D.current){var Ne=D.current.files;Ne.length||(Q({type:"closeDialog"}),A())}},300)};O.useEffect(function(){return window.addEventListener("focus",q,!1),function(){window.removeEventListener("focus",q,!1)}},[D,Y,A,U]);var Z=O.useRef([]),oe=function(Ne){T.current&&T.current.contains(Ne.target)||(Ne.preventDefault(),Z.current=[])};O.useEffect(function(){return m&&(document.addEventListener("dragover",nye,!1),document.addEventListener("drop",oe,!1)),function(){m&&(document.removeEventListener("dragover",nye),document.removeEventListener("drop",oe))}},[T,m]),O.useEffect(function(){return!r&&x&&T.current&&T.current.focus(),function(){}},[T,x,r]);var ce=O.useCallback(function(ye){E?E(ye):console.error(ye)},[E]),re=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye),Z.current=[].concat(ICt(Z.current),[ye.target]),hD(ye)&&Promise.resolve(i(ye)).then(function(Ne){if(!(X5(ye)&&!$)){var ft=Ne.length,ht=ft>0&&SCt({files:Ne,accept:N,minSize:s,maxSize:o,multiple:a,maxFiles:l,validator:R}),pt=ft>0&&!ht;Q({isDragAccept:ht,isDragReject:pt,isDragActive:!0,type:"setDraggedFiles"}),c&&c(ye)}}).catch(function(Ne){return ce(Ne)})},[i,c,ce,$,N,s,o,a,l,R]),fe=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye);var Ne=hD(ye);if(Ne&&ye.dataTransfer)try{ye.dataTransfer.dropEffect="copy"}catch{}return Ne&&f&&f(ye),!1},[f,$]),ae=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye);var Ne=Z.current.filter(function(ht){return T.current&&T.current.contains(ht)}),ft=Ne.indexOf(ye.target);ft!==-1&&Ne.splice(ft,1),Z.current=Ne,!(Ne.length>0)&&(Q({type:"setDraggedFiles",isDragActive:!1,isDragAccept:!1,isDragReject:!1}),hD(ye)&&u&&u(ye))},[T,u,$]),ue=O.useCallback(function(ye,Ne){var ft=[],ht=[];ye.forEach(function(pt){var Mt=EMe(pt,N),on=zQ(Mt,2),At=on[0],Hr=on[1],bi=kMe(pt,s,o),Zr=zQ(bi,2),Ir=Zr[0],Qt=Zr[1],ar=R?R(pt):null;if(At&&Ir&&!ar)ft.push(pt);else{var _n=[Hr,Qt];ar&&(_n=_n.concat(ar)),ht.push({file:pt,errors:_n.filter(function(wr){return wr})})}}),(!a&&ft.length>1||a&&l>=1&&ft.length>l)&&(ft.forEach(function(pt){ht.push({file:pt,errors:[wCt]})}),ft.splice(0)),Q({acceptedFiles:ft,fileRejections:ht,type:"setFiles"}),d&&d(ft,ht,Ne),ht.length>0&&p&&p(ht,Ne),ft.length>0&&h&&h(ft,Ne)},[Q,a,N,s,o,l,d,h,p,R]),me=O.useCallback(function(ye){ye.preventDefault(),ye.persist(),ge(ye),Z.current=[],hD(ye)&&Promise.resolve(i(ye)).then(function(Ne){X5(ye)&&!$||ue(Ne,ye)}).catch(function(Ne){return ce(Ne)}),Q({type:"reset"})},[i,ue,ce,$]),ne=O.useCallback(function(){if(U.current){Q({type:"openDialog"}),j();var ye={multiple:a,types:I};window.showOpenFilePicker(ye).then(function(Ne){return i(Ne)}).then(function(Ne){ue(Ne,null),Q({type:"closeDialog"})}).catch(function(Ne){PCt(Ne)?(A(Ne),Q({type:"closeDialog"})):RCt(Ne)?(U.current=!1,D.current?(D.current.value=null,D.current.click()):ce(new Error("Cannot open the file picker because the https://developer.mozilla.org/en-US/docs/Web/API/File_System_Access_API is not supported and no <input> was provided."))):ce(Ne)});return}D.current&&(Q({type:"openDialog"}),j(),D.current.value=null,D.current.click())},[Q,j,A,v,ue,ce,I,a]),Le=O.useCallback(function(ye){!T.current||!T.current.isEqualNode(ye.target)||(ye.key===" "||ye.key==="Enter"||ye.keyCode===32||ye.keyCode===13)&&(ye.preventDefault(),ne())},[T,ne]),_e=O.useCallback(function(){Q({type:"focus"})},[]),ke=O.useCallback(function(){Q({type:"blur"})},[]),ze=O.useCallback(function(){w||($Ct()?setTimeout(ne,0):ne())},[w,ne]),Je=function(Ne){return r?null:Ne},Be=function(Ne){return S?null:Je(Ne)},K=function(Ne){return C?null:Je(Ne)},ge=function(Ne){$&&Ne.stopPropagation()},Oe=O.useMemo(function(){return function(){var ye=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},Ne=ye.refKey,ft=Ne===void 0?"ref":Ne,ht=ye.role,pt=ye.onKeyDown,Mt=ye.onFocus,on=ye.onBlur,At=ye.onClick,Hr=ye.onDragEnter,bi=ye.onDragOver,Zr=ye.onDragLeave,Ir=ye.onDrop,Qt=H5(ye,NCt);return xi(xi(MY({onKeyDown:Be(_d(pt,Le)),onFocus:Be(_d(Mt,_e)),onBlur:Be(_d(on,ke)),onClick:Je(_d(At,ze)),onDragEnter:K(_d(Hr,re)),onDragOver:K(_d(bi,fe)),onDragLeave:K(_d(Zr,ae)),onDrop:K(_d(Ir,me)),role:typeof ht=="string"&&ht!==""?ht:"presentation"},ft,T),!r&&!S?{tabIndex:0}:{}),Qt)}},[T,Le,_e,ke,ze,re,fe,ae,me,S,C,r]),Ve=O.useCallback(function(ye){ye.stopPropagation()},[]),Fe=O.useMemo(function(){return function(){var ye=arguments.length>0&&arguments[0]!==void 0?arguments[0]:{},Ne=ye.refKey,ft=Ne===void 0?"ref":Ne,ht=ye.onChange,pt=ye.onClick,Mt=H5(ye,MCt),on=MY({accept:N,multiple:a,type:"file",style:{display:"none"},onChange:Je(_d(ht,me)),onClick:Je(_d(pt,Ve)),tabIndex:-1},ft,D);return xi(xi({},on),Mt)}},[D,n,a,me,r]);return xi(xi({},V),{},{isFocused:B&&!r,getRootProps:Oe,getInputProps:Fe,rootRef:T,inputRef:D,open:Je(ne)})}function VCt(e,t){switch(t.type){case"focus":return xi(xi({},e),{},{isFocused:!0});case"blur":return xi(xi({},e),{},{isFocused:!1});case"openDialog":return xi(xi({},IY),{},{isFileDialogActive:!0});case"closeDialog":return xi(xi({},e),{},{isFileDialogActive:!1});case"setDraggedFiles":return xi(xi({},e),{},{isDragActive:t.isDragActive,isDragAccept:t.isDragAccept,isDragReject:t.isDragReject});case"setFiles":return xi(xi({},e),{},{acceptedFiles:t.acceptedFiles,fileRejections:t.fileRejections});case"reset":return xi({},IY);default:return e}}function iye(){}function NMe(e){return new Promise(t=>{const n=new FileReader;n.readAsDataURL(e),n.onload=r=>{var i;if((i=r.target)!=null&&i.result){const o=r.target.result,s=o.slice(o.indexOf(",")+1);t(s)}}})}function UCt(e){return Promise.all(e.map(t=>fetch(`${document.baseURI}api/kernel/upload`,{method:"POST",headers:{"Content-Type":"application/octet-stream","X-Xsrftoken":Uyt(),"Marimo-Session-Id":WDe(),"Marimo-Server-Token":qyt()},body:t}).then(n=>{if(!n.ok)throw new Error(n.statusText);return n.json()}).then(n=>[t.name,`@upload:${n.upload_id}`])))}class qCt{constructor(){be(this,"tagName","marimo-file");be(this,"validator",H.object({filetypes:H.array(H.string()),multiple:H.boolean(),kind:H.enum(["button","area"]),label:H.string().nullable()}))}render(t){return b.jsx(HCt,{label:t.data.label,filetypes:t.data.filetypes,multiple:t.data.multiple,kind:t.data.kind,value:t.value,setValue:t.setValue})}}function YCt(e){const t={},n=(r,i)=>{Object.hasOwnProperty.call(t,r)?t[r].push(i):t[r]=[i]};return e.forEach(r=>{switch(r){case".png":case".jpg":case".jpeg":case".gif":case".avif":case".bmp":case".ico":case".svg":case".tiff":case".webp":n("image/*",r);break;case".avi":case".mp4":case".mpeg":case".ogg":case".webm":n("video/*",r);break;case".pdf":n("application/pdf",r);break;case".csv":n("text/csv",r);break;default:n("text/plain",r)}}),t}const XCt=1/0,HCt=e=>{const t=YCt(e.filetypes),{setValue:n,kind:r,multiple:i,value:o}=e,{getRootProps:s,getInputProps:a,isFocused:l,isDragAccept:c,isDragReject:u}=DMe({accept:t,multiple:i,maxSize:XCt,onError:p=>{console.error(p),Yr({title:"File upload failed",description:p.message,variant:"danger"})},onDropRejected:p=>{Yr({title:"File upload failed",description:b.jsx("div",{className:"flex flex-col gap-1",children:p.map(g=>b.jsxs("div",{children:[g.file.name," (",g.errors.map(y=>y.message).join(", "),")"]},g.file.name))}),variant:"danger"})},onDrop:p=>{UCt(p).then(g=>{n(g)}).catch(g=>{console.error(g),Yr({title:"File upload failed",description:`Failed to upload file: ${g.message}`,variant:"danger"})})}});if(r==="button"){const p=e.label??"Upload";return b.jsxs(b.Fragment,{children:[b.jsxs("button",{...s({}),className:Fb({variant:"secondary",size:"xs"}),children:[Ha({html:p}),b.jsx(U1t,{size:14,className:"ml-2"})]}),b.jsx("input",{...a({}),type:"file"})]})}const f=o.map(([p,g])=>b.jsx("li",{children:p},p)),d=f.length>0,h=e.label??"Drag and drop files here, or click to open file browser";return b.jsxs("section",{children:[b.jsxs("div",{className:ve("mt-3 mb-2 w-full flex flex-col items-center justify-center ","px-6 py-6 sm:px-8 sm:py-8 md:py-10 md:px-16","border rounded-sm","text-sm text-muted-foreground","shadow-smSolid","hover:bg-muted/60","hover:cursor-pointer","active:shadow-xsSolid","focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring focus-visible:border-accent",!l&&"bg-muted border-input/60",l&&"bg-muted/60 border-accent/40",c&&"bg-muted/60 border-accent/40 shadow-xsSolid",u&&"bg-muted/60 border-destructive/60 shadow-xsSolid"),...s(),children:[b.jsx("input",{...a()}),d?b.jsxs("span",{children:["To re-upload: ",Ha({html:h})]}):b.jsx("span",{className:"mt-0",children:Ha({html:h})})]}),b.jsx("aside",{children:d?b.jsxs("span",{className:"markdown",children:[b.jsx("strong",{children:"Uploaded files"}),b.jsx("ul",{style:{margin:0},children:f})]}):null})]})};function c6(e){return{withData(t){return{withFunctions(n){return{renderer(r){return{tagName:e,validator:t,functions:n,render:r}}}},renderer(n){return{tagName:e,validator:t,render:n}}}}}}const Z5={input(e){return{output(t){return{input:e,output:t}}}}};function MMe(e){if(typeof e=="string")return e;if(e instanceof Error)return e.message;try{return JSON.stringify(e)}catch{return String(e)}}const QQ="focusScope.autoFocusOnMount",BQ="focusScope.autoFocusOnUnmount",oye={bubbles:!1,cancelable:!0},u6=O.forwardRef((e,t)=>{const{loop:n=!1,trapped:r=!1,onMountAutoFocus:i,onUnmountAutoFocus:o,...s}=e,[a,l]=O.useState(null),c=_a(i),u=_a(o),f=O.useRef(null),d=Xt(t,g=>l(g)),h=O.useRef({paused:!1,pause(){this.paused=!0},resume(){this.paused=!1}}).current;O.useEffect(()=>{if(r){let g=function(m){if(h.paused||!a)return;const w=m.target;a.contains(w)?f.current=w:fm(f.current,{select:!0})},y=function(m){if(h.paused||!a)return;const w=m.relatedTarget;w!==null&&(a.contains(w)||fm(f.current,{select:!0}))},v=function(m){if(document.activeElement===document.body)for(const S of m)S.removedNodes.length>0&&fm(a)};document.addEventListener("focusin",g),document.addEventListener("focusout",y);const x=new MutationObserver(v);return a&&x.observe(a,{childList:!0,subtree:!0}),()=>{document.removeEventListener("focusin",g),document.removeEventListener("focusout",y),x.disconnect()}}},[r,a,h.paused]),O.useEffect(()=>{if(a){aye.add(h);const g=document.activeElement;if(!a.contains(g)){const v=new CustomEvent(QQ,oye);a.addEventListener(QQ,c),a.dispatchEvent(v),v.defaultPrevented||(ZCt(t$t(IMe(a)),{select:!0}),document.activeElement===g&&fm(a))}return()=>{a.removeEventListener(QQ,c),setTimeout(()=>{const v=new CustomEvent(BQ,oye);a.addEventListener(BQ,u),a.dispatchEvent(v),v.defaultPrevented||fm(g??document.body,{select:!0}),a.removeEventListener(BQ,u),aye.remove(h)},0)}}},[a,c,u,h]);const p=O.useCallback(g=>{if(!n&&!r||h.paused)return;const y=g.key==="Tab"&&!g.altKey&&!g.ctrlKey&&!g.metaKey,v=document.activeElement;if(y&&v){const x=g.currentTarget,[m,w]=GCt(x);m&&w?!g.shiftKey&&v===w?(g.preventDefault(),n&&fm(m,{select:!0})):g.shiftKey&&v===m&&(g.preventDefault(),n&&fm(w,{select:!0})):v===x&&g.preventDefault()}},[n,r,h.paused]);return O.createElement(Ot.div,le({tabIndex:-1},s,{ref:d,onKeyDown:p}))});function ZCt(e,{select:t=!1}={}){const n=document.activeElement;for(const r of e)if(fm(r,{select:t}),document.activeElement!==n)return}function GCt(e){const t=IMe(e),n=sye(t,e),r=sye(t.reverse(),e);return[n,r]}function IMe(e){const t=[],n=document.createTreeWalker(e,NodeFilter.SHOW_ELEMENT,{acceptNode:r=>{const i=r.tagName==="INPUT"&&r.type==="hidden";return r.disabled||r.hidden||i?NodeFilter.FILTER_SKIP:r.tabIndex>=0?NodeFilter.FILTER_ACCEPT:NodeFilter.FILTER_SKIP}});for(;n.nextNode();)t.push(n.currentNode);return t}function sye(e,t){for(const n of e)if(!KCt(n,{upTo:t}))return n}function KCt(e,{upTo:t}){if(getComputedStyle(e).visibility==="hidden")return!0;for(;e;){if(t!==void 0&&e===t)return!1;if(getComputedStyle(e).display==="none")return!0;e=e.parentElement}return!1}function JCt(e){return e instanceof HTMLInputElement&&"select"in e}function fm(e,{select:t=!1}={}){if(e&&e.focus){const n=document.activeElement;e.focus({preventScroll:!0}),e!==n&&JCt(e)&&t&&e.select()}}const aye=e$t();function e$t(){let e=[];return{add(t){const n=e[0];t!==n&&(n==null||n.pause()),e=lye(e,t),e.unshift(t)},remove(t){var n;e=lye(e,t),(n=e[0])===null||n===void 0||n.resume()}}}function lye(e,t){const n=[...e],r=n.indexOf(t);return r!==-1&&n.splice(r,1),n}function t$t(e){return e.filter(t=>t.tagName!=="A")}let WQ=0;function f6(){O.useEffect(()=>{var e,t;const n=document.querySelectorAll("[data-radix-focus-guard]");return document.body.insertAdjacentElement("afterbegin",(e=n[0])!==null&&e!==void 0?e:cye()),document.body.insertAdjacentElement("beforeend",(t=n[1])!==null&&t!==void 0?t:cye()),WQ++,()=>{WQ===1&&document.querySelectorAll("[data-radix-focus-guard]").forEach(r=>r.remove()),WQ--}},[])}function cye(){const e=document.createElement("span");return e.setAttribute("data-radix-focus-guard",""),e.tabIndex=0,e.style.cssText="outline: none; opacity: 0; position: fixed; pointer-events: none",e}var gk="right-scroll-bar-position",mk="width-before-scroll-bar",n$t="with-scroll-bars-hidden",r$t="--removed-body-scroll-bar-size";function i$t(e,t){return typeof e=="function"?e(t):e&&(e.current=t),e}function o$t(e,t){var n=O.useState(function(){return{value:e,callback:t,facade:{get current(){return n.value},set current(r){var i=n.value;i!==r&&(n.value=r,n.callback(r,i))}}}})[0];return n.callback=t,n.facade}function LMe(e,t){return o$t(t||null,function(n){return e.forEach(function(r){return i$t(r,n)})})}function s$t(e){return e}function a$t(e,t){t===void 0&&(t=s$t);var n=[],r=!1,i={read:function(){if(r)throw new Error("Sidecar: could not `read` from an `assigned` medium. `read` could be used only with `useMedium`.");return n.length?n[n.length-1]:e},useMedium:function(o){var s=t(o,r);return n.push(s),function(){n=n.filter(function(a){return a!==s})}},assignSyncMedium:function(o){for(r=!0;n.length;){var s=n;n=[],s.forEach(o)}n={push:function(a){return o(a)},filter:function(){return n}}},assignMedium:function(o){r=!0;var s=[];if(n.length){var a=n;n=[],a.forEach(o),s=n}var l=function(){var u=s;s=[],u.forEach(o)},c=function(){return Promise.resolve().then(l)};c(),n={push:function(u){s.push(u),c()},filter:function(u){return s=s.filter(u),n}}}};return i}function jMe(e){e===void 0&&(e={});var t=a$t(null);return t.options=ua({async:!0,ssr:!1},e),t}var FMe=function(e){var t=e.sideCar,n=wne(e,["sideCar"]);if(!t)throw new Error("Sidecar: please provide `sideCar` property to import the right car");var r=t.read();if(!r)throw new Error("Sidecar medium not found");return O.createElement(r,ua({},n))};FMe.isSideCarExport=!0;function zMe(e,t){return e.useMedium(t),FMe}var QMe=jMe(),VQ=function(){},d6=O.forwardRef(function(e,t){var n=O.useRef(null),r=O.useState({onScrollCapture:VQ,onWheelCapture:VQ,onTouchMoveCapture:VQ}),i=r[0],o=r[1],s=e.forwardProps,a=e.children,l=e.className,c=e.removeScrollBar,u=e.enabled,f=e.shards,d=e.sideCar,h=e.noIsolation,p=e.inert,g=e.allowPinchZoom,y=e.as,v=y===void 0?"div":y,x=wne(e,["forwardProps","children","className","removeScrollBar","enabled","shards","sideCar","noIsolation","inert","allowPinchZoom","as"]),m=d,w=LMe([n,t]),S=ua(ua({},x),i);return O.createElement(O.Fragment,null,u&&O.createElement(m,{sideCar:QMe,removeScrollBar:c,shards:f,noIsolation:h,inert:p,setCallbacks:o,allowPinchZoom:!!g,lockRef:n}),s?O.cloneElement(O.Children.only(a),ua(ua({},S),{ref:w})):O.createElement(v,ua({},S,{className:l,ref:w}),a))});d6.defaultProps={enabled:!0,removeScrollBar:!0,inert:!1};d6.classNames={fullWidth:mk,zeroRight:gk};var uye,l$t=function(){if(uye)return uye;if(typeof __webpack_nonce__<"u")return __webpack_nonce__};function c$t(){if(!document)return null;var e=document.createElement("style");e.type="text/css";var t=l$t();return t&&e.setAttribute("nonce",t),e}function u$t(e,t){e.styleSheet?e.styleSheet.cssText=t:e.appendChild(document.createTextNode(t))}function f$t(e){var t=document.head||document.getElementsByTagName("head")[0];t.appendChild(e)}var d$t=function(){var e=0,t=null;return{add:function(n){e==0&&(t=c$t())&&(u$t(t,n),f$t(t)),e++},remove:function(){e--,!e&&t&&(t.parentNode&&t.parentNode.removeChild(t),t=null)}}},h$t=function(){var e=d$t();return function(t,n){O.useEffect(function(){return e.add(t),function(){e.remove()}},[t&&n])}},_ne=function(){var e=h$t(),t=function(n){var r=n.styles,i=n.dynamic;return e(r,i),null};return t},p$t={left:0,top:0,right:0,gap:0},UQ=function(e){return parseInt(e||"",10)||0},g$t=function(e){var t=window.getComputedStyle(document.body),n=t[e==="padding"?"paddingLeft":"marginLeft"],r=t[e==="padding"?"paddingTop":"marginTop"],i=t[e==="padding"?"paddingRight":"marginRight"];return[UQ(n),UQ(r),UQ(i)]},m$t=function(e){if(e===void 0&&(e="margin"),typeof window>"u")return p$t;var t=g$t(e),n=document.documentElement.clientWidth,r=window.innerWidth;return{left:t[0],top:t[1],right:t[2],gap:Math.max(0,r-n+t[2]-t[0])}},y$t=_ne(),v$t=function(e,t,n,r){var i=e.left,o=e.top,s=e.right,a=e.gap;return n===void 0&&(n="margin"),`
   .`.concat(n$t,` {
    overflow: hidden `).concat(r,`;
    padding-right: `).concat(a,"px ").concat(r,`;
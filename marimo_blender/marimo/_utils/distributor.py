@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import asyncio
 from threading import Thread
-from typing import Callable, Generic, TypeVar
+from typing import Callable, Generic, Optional, TypeVar
 
 from marimo import _loggers
 from marimo._utils.disposable import Disposable
@@ -20,12 +20,26 @@ class Distributor(Generic[T]):
     consumers.
 
     This also handles adding and removing new consumers.
+
+    An optional `decoder` is applied to each received response before it is
+    distributed; responses it maps to `None` are held back (e.g., frames of
+    a message that hasn't been received in full).
+
+    Reading can be paused, for backpressure: while paused, responses stay
+    in the connection, and its writer blocks once the connection is full.
     """
 
-    def __init__(self, input_connection: TypedConnection[T]) -> None:
+    def __init__(
+        self,
+        input_connection: TypedConnection[T],
+        decoder: Optional[Callable[[T], Optional[T]]] = None,
+    ) -> None:
         self.consumers: list[Callable[[T], None]] = []
         self.input_connection = input_connection
+        self.decoder = decoder
         self.thread: Thread | None = None
+        self._started = False
+        self._paused = False
 
     def add_consumer(self, consumer: Callable[[T], None]) -> Disposable:
         """Add a consumer to the distributor."""
@@ -39,23 +53,53 @@ class Distributor(Generic[T]):
 
     def _on_change(self) -> None:
         """Distribute the response to all consumers."""
-        while self.input_connection.poll():
+        # a consumer can pause the distributor while it is distributing
+        while not self._paused and self.input_connection.poll():
             try:
                 response = self.input_connection.recv()
             except (EOFError, StopIteration):
                 break
+            if self.decoder is not None:
+                decoded = self.decoder(response)
+                if decoded is None:
+                    continue
+                response = decoded
             for consumer in self.consumers:
                 consumer(response)
 
     def start(self) -> Disposable:
         """Start distributing the response."""
+        self._started = True
+        if not self._paused:
+            self._add_reader()
+        return Disposable(self.stop)
+
+    def _add_reader(self) -> None:
         asyncio.get_event_loop().add_reader(
             self.input_connection.fileno(), self._on_change
         )
-        return Disposable(self.stop)
+
+    def pause(self) -> None:
+        """Stop reading from the connection until `resume` is called."""
+        if self._paused:
+            return
+        self._paused = True
+        if self._started and not self.input_connection.closed:
+            asyncio.get_event_loop().remove_reader(
+                self.input_connection.fileno()
+            )
+
+    def resume(self) -> None:
+        """Resume reading from the connection."""
+        if not self._paused:
+            return
+        self._paused = False
+        if self._started and not self.input_connection.closed:
+            self._add_reader()
 
     def stop(self) -> None:
         """Stop distributing the response."""
+        self._started = False
         asyncio.get_event_loop().remove_reader(self.input_connection.fileno())
         if not self.input_connection.closed:
             self.input_connection.close()
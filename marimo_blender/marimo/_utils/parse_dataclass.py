@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import json
 from enum import Enum
 from typing import (
     Any,
+    Callable,
     Literal,
     Optional,
     Type,
@@ -27,73 +29,217 @@ def to_snake(string: str) -> str:
     ).lstrip("_")
 
 
-def _build_value(value: Any, cls: Type[T]) -> T:
+Decoder = Callable[[Any], Any]
+
+
+_MISSING = object()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@functools.lru_cache(maxsize=512)
+def _decoder(cls: Any) -> Decoder:
+    """A function that builds a value of type `cls` from parsed JSON.
+
+    Inspecting a type (its origin, arguments, and type hints) is slower than
+    building a value of it, so the inspection is done once per type: the
+    returned decoder only does what is specific to the type.
+    """
     # origin_cls is not None if cls is a container (such as list, tuple, set,
     # ...)
     origin_cls = get_origin(cls)
-    if origin_cls is Optional:
+    if origin_cls in (list, set):
         (arg_type,) = get_args(cls)
-        if value is None:
-            return None  # type: ignore[return-value]
-        else:
-            return _build_value(value, arg_type)  # type: ignore # noqa: E501
-    elif origin_cls in (list, set):
-        (arg_type,) = get_args(cls)
-        return origin_cls(_build_value(v, arg_type) for v in value)  # type: ignore # noqa: E501
+        return _sequence_decoder(origin_cls, arg_type)
     elif origin_cls == tuple:
         arg_types = get_args(cls)
         if len(arg_types) == 2 and isinstance(arg_types[1], type(Ellipsis)):
-            return origin_cls(_build_value(v, arg_types[0]) for v in value)  # type: ignore # noqa: E501
+            return _sequence_decoder(tuple, arg_types[0])
         else:
-            return origin_cls(_build_value(v, t) for v, t in zip(value, arg_types))  # type: ignore # noqa: E501
+            return _tuple_decoder(arg_types)
     elif origin_cls == dict:
-        key_type, value_type = get_args(cls)
-        return origin_cls(  # type: ignore[no-any-return]
-            **{
-                _build_value(k, key_type): _build_value(v, value_type)
-                for k, v in value.items()
-            }
-        )
+        return _dict_decoder(*get_args(cls))
     elif origin_cls == Union:
-        arg_types = get_args(cls)
-        for arg_type in arg_types:
-            try:
-                return _build_value(value, arg_type)  # type: ignore # noqa: E501
-            except Exception:
-                continue
-        raise ValueError(f"Value '{value}' does not fit any type of the union")
+        return _union_decoder(get_args(cls))
     elif origin_cls is Literal:
-        # if its a single Literal of an enum, we can just return the enum
-        arg_types = get_args(cls)
-        first_arg_type = arg_types[0]
-        if (
-            len(arg_types) == 1
-            and isinstance(first_arg_type, Enum)
-            and first_arg_type.value == value
-        ):
-            return first_arg_type  # type: ignore[return-value]
+        return _literal_decoder(get_args(cls))
+    elif type(cls) == type(Enum) and issubclass(cls, Enum):
+        return cls  # type: ignore[no-any-return]
+    elif dataclasses.is_dataclass(cls):
+        return _dataclass_decoder(cls)
+    else:
+        return _identity
+
+
+def _sequence_decoder(container: Any, arg_type: Any) -> Decoder:
+    decode = _decoder(arg_type)
+    if decode is _identity:
+        return container  # type: ignore[no-any-return]
+
+    def decode_sequence(value: Any) -> Any:
+        return container(decode(v) for v in value)
+
+    return decode_sequence
+
+
+def _tuple_decoder(arg_types: tuple[Any, ...]) -> Decoder:
+    decoders = [_decoder(t) for t in arg_types]
+
+    def decode_tuple(value: Any) -> Any:
+        return tuple(decode(v) for v, decode in zip(value, decoders))
+
+    return decode_tuple
+
+
+def _dict_decoder(key_type: Any, value_type: Any) -> Decoder:
+    decode_key = _decoder(key_type)
+    decode_value = _decoder(value_type)
+
+    def decode_dict(value: Any) -> Any:
+        return {decode_key(k): decode_value(v) for k, v in value.items()}
+
+    return decode_dict
+
+
+def _literal_decoder(arg_types: tuple[Any, ...]) -> Decoder:
+    # if its a single Literal of an enum, we can just return the enum
+    first_arg_type = arg_types[0]
+    is_enum = len(arg_types) == 1 and isinstance(first_arg_type, Enum)
+
+    def decode_literal(value: Any) -> Any:
+        if is_enum and first_arg_type.value == value:
+            return first_arg_type
         if value not in arg_types:
             raise ValueError(
                 f"Value '{value}' does not fit any type of the literal"
             )
-        return value  # type: ignore[no-any-return]
-    elif type(cls) == type(Enum) and issubclass(cls, Enum):
-        return cls(value)  # type: ignore[return-value]
-    elif dataclasses.is_dataclass(cls):
-        return build_dataclass(value, cls)  # type: ignore[return-value]
-    else:
-        return value  # type: ignore[no-any-return]
+        return value
 
+    return decode_literal
 
-def build_dataclass(value: dict[Any, Any], cls: Type[T]) -> T:
-    types = get_type_hints(cls)
 
-    transformed = {
-        to_snake(k): _build_value(v, types[to_snake(k)])
-        for k, v in value.items()
-    }
+def _discriminator(
+    arg_types: tuple[Any, ...]
+) -> Optional[tuple[tuple[str, ...], dict[Any, Any]]]:
+    """A field that tells apart the dataclasses of a union, if any.
+
+    Returns the field's keys and a map from its values to the dataclasses,
+    if every type of the union is a dataclass with this field, typed as a
+    `Literal` of a single value that differs between the dataclasses.
+    """
+    if not all(dataclasses.is_dataclass(t) for t in arg_types):
+        return None
+    candidates: Optional[set[str]] = None
+    tags: list[dict[str, Any]] = []
+    for arg_type in arg_types:
+        try:
+            type_hints = get_type_hints(arg_type)
+        except Exception:
+            return None
+        arg_tags = {}
+        for name, type_ in type_hints.items():
+            if get_origin(type_) is Literal and len(get_args(type_)) == 1:
+                (tag,) = get_args(type_)
+                arg_tags[name] = tag.value if isinstance(tag, Enum) else tag
+        tags.append(arg_tags)
+        names = set(arg_tags)
+        candidates = names if candidates is None else candidates & names
+    for name in sorted(candidates or ()):
+        try:
+            arms = {
+                arg_tags[name]: arg_type
+                for arg_tags, arg_type in zip(tags, arg_types)
+            }
+        except TypeError:
+            # unhashable value
+            continue
+        if len(arms) == len(arg_types):
+            return (name, _to_camel(name)), arms
+    return None
+
+
+def _union_decoder(arg_types: tuple[Any, ...]) -> Decoder:
+    decoders = [_decoder(t) for t in arg_types]
+    discriminator = _discriminator(arg_types)
+    keys: tuple[str, ...] = ()
+    arms: dict[Any, Decoder] = {}
+    if discriminator is not None:
+        keys = discriminator[0]
+        arms = {tag: _decoder(t) for tag, t in discriminator[1].items()}
+
+    def decode_union(value: Any) -> Any:
+        if keys and isinstance(value, dict):
+            tag = next((value[key] for key in keys if key in value), _MISSING)
+            try:
+                decode = arms.get(tag)
+            except TypeError:
+                # unhashable value
+                decode = None
+            if decode is not None:
+                try:
+                    return decode(value)
+                except Exception as e:
+                    raise ValueError(
+                        f"Value '{value}' does not fit any type of the union"
+                    ) from e
+        for decode in decoders:
+            try:
+                return decode(value)
+            except Exception:
+                continue
+        raise ValueError(f"Value '{value}' does not fit any type of the union")
 
-    return cls(**transformed)
+    return decode_union
+
+
+def _dataclass_decoder(cls: Type[T]) -> Callable[[dict[Any, Any]], T]:
+    # The fields' decoders are looked up on first use, since a dataclass can
+    # refer to itself
+    field_decoders: dict[str, tuple[str, Decoder]] = {}
+
+    def decode_dataclass(value: dict[Any, Any]) -> T:
+        if not field_decoders:
+            for key, (name, type_) in _fields(cls).items():
+                field_decoders[key] = (name, _decoder(type_))
+
+        transformed = {}
+        for k, v in value.items():
+            if k in field_decoders:
+                name, decode = field_decoders[k]
+            else:
+                name = to_snake(k)
+                decode = _decoder(get_type_hints(cls)[name])
+            transformed[name] = decode(v)
+
+        return cls(**transformed)
+
+    return decode_dataclass
+
+
+def _to_camel(string: str) -> str:
+    head, *rest = string.split("_")
+    return head + "".join(part.capitalize() for part in rest)
+
+
+@functools.lru_cache(maxsize=256)
+def _fields(cls: Type[Any]) -> dict[str, tuple[str, Any]]:
+    """Maps the keys of a dataclass's fields to their names and types.
+
+    Keys are the fields' names, in snake case and in camel case.
+    """
+    fields: dict[str, tuple[str, Any]] = {}
+    for name, type_ in get_type_hints(cls).items():
+        fields[name] = (name, type_)
+        camel = _to_camel(name)
+        if to_snake(camel) == name:
+            fields[camel] = (name, type_)
+    return fields
+
+
+def build_dataclass(value: dict[Any, Any], cls: Type[T]) -> T:
+    return _decoder(cls)(value)  # type: ignore[no-any-return]
 
 
 def parse_raw(message: Union[bytes, dict[Any, Any]], cls: Type[T]) -> T:
@@ -108,6 +254,11 @@ def parse_raw(message: Union[bytes, dict[Any, Any]], cls: Type[T]) -> T:
 
     Transforms all fields in the parsed JSON from camel case to snake case.
 
+    A decoder is compiled once per type and cached. A union of dataclasses
+    that have a field typed as a distinct single-value `Literal` (like
+    `type` in dataframe transforms) is decoded by the value of that field;
+    other unions are decoded by trying each of their types in order.
+
     Args:
     ----
     message: the message to parse
@@ -26,6 +26,10 @@ class TypedConnection(Generic[T]):
     def send(self, obj: T) -> None:
         self._delegate.send(obj)
 
+    def send_bytes(self, buf: bytes | memoryview) -> None:
+        """Send an already-pickled object."""
+        self._delegate.send_bytes(buf)
+
     def recv(self) -> T:
         return self._delegate.recv()  # type: ignore[no-any-return]
 
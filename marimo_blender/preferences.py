@@ -119,6 +119,7 @@ class StartMarimoServer(bpy.types.Operator):
             addon_setup.server.start(
                 port,
                 filename,
+                execution_mode=prefs.execution_mode,
                 line_callback=lambda line: _lines_append(line) or region.tag_redraw(),
                 finally_callback=lambda e: region.tag_redraw()
             )
@@ -151,6 +152,15 @@ class MarimoAddonPreferences(bpy.types.AddonPreferences):
         default=2718,
     )
     filename: bpy.props.StringProperty(name="Notebook File Path", description="Leave empty to edit a new file", default="", subtype='FILE_PATH')
+    execution_mode: bpy.props.EnumProperty(
+        name="Execution Mode",
+        description="Where notebook cells are executed",
+        items=[
+            ('THREAD', "Thread", "Run cells on a background thread; use mo.on_main_thread for bpy sections"),
+            ('MAIN_THREAD', "Main Thread", "Run every cell on Blender's main thread, dispatched through a timer"),
+        ],
+        default='THREAD',
+    )
     show_logs: bpy.props.BoolProperty(default=False)
     module_name: bpy.props.StringProperty(name="Module Name", default="")
 
@@ -162,6 +172,9 @@ class MarimoAddonPreferences(bpy.types.AddonPreferences):
         split.prop(self, 'port')
         split.prop(self, 'filename', text="", icon='FILE_SCRIPT')
 
+        row = layout.row()
+        row.prop(self, 'execution_mode', expand=True)
+
         row = layout.row()
         row.operator(StartMarimoServer.bl_idname, icon='URL')
         row.operator(InstallPythonModules.bl_idname, icon="PREFERENCES")
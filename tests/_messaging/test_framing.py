@@ -0,0 +1,115 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+from typing import Any, Optional
+
+from marimo._messaging import framing
+from marimo._messaging.framing import FRAME_OP, FrameAssembler
+from marimo._messaging.types import KernelMessage
+
+
+def frames(
+    message_id: int, message: KernelMessage, frame_max_bytes: int
+) -> list[KernelMessage]:
+    return list(
+        framing.split(
+            message_id, framing.dumps(message), frame_max_bytes
+        )
+    )
+
+
+def feed_all(
+    assembler: FrameAssembler, messages: list[KernelMessage]
+) -> list[KernelMessage]:
+    rebuilt = []
+    for message in messages:
+        result: Optional[KernelMessage] = assembler.feed(message)
+        if result is not None:
+            rebuilt.append(result)
+    return rebuilt
+
+
+def test_unframed_message_passes_through() -> None:
+    message: KernelMessage = ("cell-op", {"cell_id": "a"})
+    assert FrameAssembler().feed(message) is message
+
+
+def test_round_trip() -> None:
+    message: KernelMessage = ("cell-op", {"data": "x" * 10_000, "n": 1})
+    for frame_max_bytes in (1, 7, 1024, 1 << 20):
+        assembler = FrameAssembler()
+        framed = frames(0, message, frame_max_bytes)
+        assert all(op == FRAME_OP for op, _ in framed)
+        assert feed_all(assembler, framed) == [message]
+        assert assembler.n_pending == 0
+
+
+def test_payload_that_is_a_multiple_of_the_frame_size() -> None:
+    message: KernelMessage = ("op", {"data": b"\0" * 100})
+    payload = framing.dumps(message)
+    framed = frames(0, message, len(payload) // 4)
+    assert len(framed) == 4 + (len(payload) % 4 > 0)
+    assert feed_all(FrameAssembler(), framed) == [message]
+
+
+def test_interleaved_messages() -> None:
+    first: KernelMessage = ("a", {"data": "1" * 5000})
+    second: KernelMessage = ("b", {"data": "2" * 3000})
+    small: KernelMessage = ("c", {})
+    first_frames = frames(0, first, 1000)
+    second_frames = frames(1, second, 1000)
+
+    interleaved: list[KernelMessage] = []
+    for i in range(max(len(first_frames), len(second_frames))):
+        interleaved.extend(first_frames[i : i + 1])
+        interleaved.append(small)
+        interleaved.extend(second_frames[i : i + 1])
+
+    assembler = FrameAssembler()
+    rebuilt = feed_all(assembler, interleaved)
+    assert rebuilt.count(small) == len(first_frames)
+    assert [m for m in rebuilt if m != small] == [second, first]
+    assert assembler.n_pending == 0
+
+
+def test_message_with_missing_frame_is_dropped() -> None:
+    message: KernelMessage = ("a", {"data": "x" * 5000})
+    framed = frames(0, message, 1000)
+    assembler = FrameAssembler()
+    assert feed_all(assembler, framed[:1] + framed[2:]) == []
+    # the rest of the message is neither rebuilt nor kept
+    assert assembler.n_pending <= 1
+
+    # later messages are unaffected
+    other: KernelMessage = ("b", {"data": "y" * 5000})
+    assert feed_all(assembler, frames(1, other, 1000)) == [other]
+
+
+def test_round_trip_over_a_pipe() -> None:
+    receiver, sender = mp.Pipe(duplex=False)
+    small: KernelMessage = ("small", {"n": 1})
+    large: KernelMessage = ("large", {"data": bytes(range(256)) * 1000})
+
+    def send() -> None:
+        # sent the way the kernel's stream sends them
+        sender.send_bytes(framing.dumps(small))
+        for frame in framing.split(7, framing.dumps(large), 10_000):
+            sender.send(frame)
+
+    # the pipe's buffer holds less than the large message
+    thread = threading.Thread(target=send, daemon=True)
+    thread.start()
+    try:
+        assembler = FrameAssembler()
+        received: list[Any] = []
+        while len(received) < 2:
+            result = assembler.feed(receiver.recv())
+            if result is not None:
+                received.append(result)
+        assert received == [small, large]
+        thread.join()
+    finally:
+        receiver.close()
+        sender.close()
@@ -0,0 +1,134 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from typing import Optional
+
+from marimo._ast.cell import CellId_t
+from marimo._ast.compiler import compile_cell
+from marimo._runtime import dataflow
+from marimo._runtime.cell_runner import Runner
+from marimo._runtime.marimo_pdb import MarimoPdb
+
+
+def make_runner(
+    codes: dict[str, str], cell_ids: Optional[set[str]] = None
+) -> Runner:
+    graph = dataflow.DirectedGraph()
+    for cell_id, code in codes.items():
+        graph.register_cell(cell_id, compile_cell(code, cell_id=cell_id))
+    return Runner(
+        cell_ids=set(codes) if cell_ids is None else cell_ids,
+        graph=graph,
+        glbls={},
+        debugger=MarimoPdb(stdout=None, stdin=None),
+    )
+
+
+def pop_all(runner: Runner) -> list[CellId_t]:
+    popped = []
+    while (cell_id := runner.pop_ready_cell()) is not None:
+        popped.append(cell_id)
+    return popped
+
+
+def test_independent_cells_are_ready_together() -> None:
+    runner = make_runner({"0": "x = 0", "1": "y = 0", "2": "z = 0"})
+    assert sorted(pop_all(runner)) == ["0", "1", "2"]
+    assert not runner.pending()
+
+
+def test_cells_are_ready_once_their_parents_finish() -> None:
+    # 0 -> 1 -> 3, 2 -> 3
+    runner = make_runner(
+        {"0": "x = 0", "1": "y = x", "2": "z = 0", "3": "w = y + z"}
+    )
+    assert sorted(pop_all(runner)) == ["0", "2"]
+
+    runner.finish("0")
+    assert pop_all(runner) == ["1"]
+    runner.finish("1")
+    # 3 still waits on 2
+    assert pop_all(runner) == []
+    runner.finish("2")
+    assert pop_all(runner) == ["3"]
+    runner.finish("3")
+    assert not runner.pending()
+
+
+def test_only_parents_in_the_run_are_waited_on() -> None:
+    runner = make_runner(
+        {"0": "x = 0", "1": "y = x", "2": "z = y"}, cell_ids={"1", "2"}
+    )
+    assert pop_all(runner) == ["1"]
+    runner.finish("1")
+    assert pop_all(runner) == ["2"]
+
+
+def test_deferred_cell_is_ready_after_another_finishes() -> None:
+    runner = make_runner({"0": "x = 0", "1": "y = 0", "2": "z = 0"})
+    first = runner.pop_ready_cell()
+    second = runner.pop_ready_cell()
+    assert first is not None and second is not None
+    runner.defer(second)
+    assert runner.pending()
+
+    third = runner.pop_ready_cell()
+    assert third is not None and third not in (first, second)
+    # the deferred cell waits for a cell to finish
+    assert runner.pop_ready_cell() is None
+
+    runner.finish(first)
+    assert runner.pop_ready_cell() == second
+    runner.finish(second)
+    runner.finish(third)
+    assert not runner.pending()
+
+
+def test_deferred_cell_when_nothing_else_runs() -> None:
+    runner = make_runner({"0": "x = 0"})
+    cell_id = runner.pop_ready_cell()
+    assert cell_id == "0"
+    runner.defer(cell_id)
+    # nothing is in flight, so the deferred cell can't wait on another
+    assert runner.pop_ready_cell() == "0"
+    runner.finish("0")
+    assert runner.pop_ready_cell() is None
+    assert not runner.pending()
+
+
+def test_related_to_any() -> None:
+    runner = make_runner(
+        {"0": "x = 0", "1": "y = x", "2": "z = y", "3": "w = 0"}
+    )
+    assert runner.related_to_any("2", ["0"])
+    assert runner.related_to_any("0", ["3", "2"])
+    assert not runner.related_to_any("3", ["0", "1", "2"])
+    assert not runner.related_to_any("0", [])
+
+
+def test_cancel_if_failed_cancels_descendants() -> None:
+    runner = make_runner(
+        {"0": "x = 1 / 0", "1": "y = x", "2": "z = y", "3": "w = 0"}
+    )
+    assert sorted(pop_all(runner)) == ["0", "3"]
+    run_result = runner.run("0")
+    assert isinstance(run_result.exception, ZeroDivisionError)
+    runner.cancel_if_failed("0", run_result)
+    assert runner.cancelled("1") and runner.cancelled("2")
+    assert not runner.cancelled("3")
+
+    # the kernel still finishes the cancelled cells, without running them
+    runner.finish("0")
+    assert pop_all(runner) == ["1"]
+    runner.finish("1")
+    assert pop_all(runner) == ["2"]
+
+
+def test_cancel_if_failed_ignores_success() -> None:
+    runner = make_runner({"0": "x = 1", "1": "y = x"})
+    assert pop_all(runner) == ["0"]
+    run_result = runner.run("0")
+    assert run_result.success()
+    runner.cancel_if_failed("0", run_result)
+    assert not runner.cancelled("1")
+    assert runner.glbls["x"] == 1
@@ -0,0 +1,114 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any
+
+from marimo._runtime.control_queue import ControlQueueReader
+from marimo._runtime.requests import (
+    ControlRequest,
+    ExecutionRequest,
+    SetUIElementValueRequest,
+)
+
+
+def set_value(*ids_and_values: tuple[str, Any]) -> SetUIElementValueRequest:
+    return SetUIElementValueRequest(ids_and_values=list(ids_and_values))
+
+
+def make_reader(
+    windows: dict[str, float] | None = None,
+) -> tuple[queue.Queue[ControlRequest], ControlQueueReader]:
+    control_queue: queue.Queue[ControlRequest] = queue.Queue()
+    reader = ControlQueueReader(
+        control_queue,
+        debounce_window=lambda object_id: (windows or {}).get(object_id, 0),
+    )
+    return control_queue, reader
+
+
+def test_merges_waiting_updates() -> None:
+    control_queue, reader = make_reader()
+    control_queue.put(set_value(("a", 1)))
+    control_queue.put(set_value(("b", 1), ("a", 2)))
+    control_queue.put(set_value(("a", 3)))
+
+    request = reader.get()
+    assert isinstance(request, SetUIElementValueRequest)
+    # the last value of each element, in the order of the latest updates
+    assert request.ids_and_values == [("b", 1), ("a", 3)]
+    assert reader.dropped == {"a": 2}
+    assert control_queue.empty()
+
+
+def test_other_requests_are_not_reordered() -> None:
+    control_queue, reader = make_reader()
+    execution = ExecutionRequest(cell_id="0", code="x = 0")
+    control_queue.put(set_value(("a", 1)))
+    control_queue.put(set_value(("a", 2)))
+    control_queue.put(execution)
+    control_queue.put(set_value(("a", 3)))
+
+    request = reader.get()
+    assert isinstance(request, SetUIElementValueRequest)
+    assert request.ids_and_values == [("a", 2)]
+    assert reader.get() is execution
+    # `dropped` describes the last request returned
+    assert reader.dropped == {}
+    request = reader.get()
+    assert isinstance(request, SetUIElementValueRequest)
+    assert request.ids_and_values == [("a", 3)]
+
+
+def test_other_requests_are_returned_as_is() -> None:
+    control_queue, reader = make_reader()
+    execution = ExecutionRequest(cell_id="0", code="x = 0")
+    control_queue.put(execution)
+    control_queue.put(set_value(("a", 1)))
+    assert reader.get() is execution
+
+
+def test_update_without_window_is_not_delayed() -> None:
+    control_queue, reader = make_reader()
+    control_queue.put(set_value(("a", 1)))
+    start = time.monotonic()
+    reader.get()
+    assert time.monotonic() - start < 0.1
+
+
+def test_debounce_window_absorbs_later_updates() -> None:
+    control_queue, reader = make_reader({"slider": 0.3})
+    control_queue.put(set_value(("slider", 1)))
+
+    def send_more() -> None:
+        for value in (2, 3):
+            time.sleep(0.05)
+            control_queue.put(set_value(("slider", value)))
+
+    thread = threading.Thread(target=send_more)
+    thread.start()
+    start = time.monotonic()
+    request = reader.get()
+    elapsed = time.monotonic() - start
+    thread.join()
+
+    assert isinstance(request, SetUIElementValueRequest)
+    assert request.ids_and_values == [("slider", 3)]
+    assert reader.dropped == {"slider": 2}
+    # held back until the window closed, counted from the first update
+    assert 0.25 <= elapsed < 1
+
+
+def test_debounce_window_ends_early_for_other_requests() -> None:
+    control_queue, reader = make_reader({"slider": 5})
+    execution = ExecutionRequest(cell_id="0", code="x = 0")
+    control_queue.put(set_value(("slider", 1)))
+    control_queue.put(execution)
+
+    start = time.monotonic()
+    request = reader.get()
+    assert time.monotonic() - start < 1
+    assert isinstance(request, SetUIElementValueRequest)
+    assert reader.get() is execution
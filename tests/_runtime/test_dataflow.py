@@ -0,0 +1,171 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import random
+
+from marimo._ast.cell import Cell, CellId_t
+from marimo._ast.compiler import compile_cell
+from marimo._runtime import dataflow
+
+
+def register(graph: dataflow.DirectedGraph, cell_id: str, code: str) -> None:
+    graph.register_cell(cell_id, compile_cell(code, cell_id=cell_id))
+
+
+def assert_topological(graph: dataflow.DirectedGraph) -> None:
+    order = graph.topological_order()
+    assert sorted(order) == sorted(graph.cells)
+    position = {cell_id: i for i, cell_id in enumerate(order)}
+    for parent, children in graph.children.items():
+        for child in children:
+            assert position[parent] < position[child]
+
+
+def test_order_of_chain_registered_in_reverse() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "2", "z = y + 1")
+    register(graph, "1", "y = x + 1")
+    register(graph, "0", "x = 0")
+    assert graph.topological_order() == ["0", "1", "2"]
+    assert graph.order.valid
+
+
+def test_order_of_random_graphs() -> None:
+    rng = random.Random(0)
+    for _ in range(20):
+        graph = dataflow.DirectedGraph()
+        n_cells = 30
+        codes: list[tuple[str, str]] = []
+        for i in range(n_cells):
+            refs = rng.sample(range(i), min(i, rng.randint(0, 3)))
+            expr = " + ".join(f"v{j}" for j in refs) or "0"
+            codes.append((str(i), f"v{i} = {expr}"))
+        rng.shuffle(codes)
+        for cell_id, code in codes:
+            register(graph, cell_id, code)
+            assert_topological(graph)
+
+        # deleting cells keeps the order valid
+        for cell_id, _ in codes[: n_cells // 2]:
+            graph.delete_cell(cell_id)
+            assert_topological(graph)
+
+
+def test_topological_sort_of_subset() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "c", "z = y")
+    register(graph, "b", "y = x")
+    register(graph, "a", "x = 0")
+    register(graph, "d", "w = 1")
+    assert dataflow.topological_sort(graph, {"c", "a"}) == ["a", "c"]
+
+
+def test_cycle_invalidates_order_until_broken() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = 0")
+    register(graph, "1", "y = x; z")
+    register(graph, "2", "z = y")
+    assert not graph.order.valid
+    assert graph.cycles
+    # cells on the cycle are omitted
+    assert graph.topological_order() == ["0"]
+    # ... unless the cycle is outside the cells being sorted
+    assert dataflow.topological_sort(graph, {"0", "1"}) == ["0", "1"]
+
+    graph.delete_cell("2")
+    assert not graph.cycles
+    assert graph.order.valid
+    assert graph.topological_order() == ["0", "1"]
+
+
+def test_cycle_with_cell_registered_later() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = y")
+    register(graph, "1", "y = x")
+    register(graph, "2", "w = 1")
+    assert graph.cycles
+    assert graph.topological_order() == ["2"]
+
+
+def test_referring_cells_index() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = 0")
+    register(graph, "1", "y = x")
+    register(graph, "2", "z = x + y")
+    assert graph.get_referring_cells("x") == {"1", "2"}
+    assert graph.children["0"] == {"1", "2"}
+
+    graph.delete_cell("1")
+    assert graph.get_referring_cells("x") == {"2"}
+    assert graph.get_referring_cells("y") == {"2"}
+    assert "y" not in graph.definitions
+
+
+def test_get_path() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = 0")
+    register(graph, "1", "y = x")
+    register(graph, "2", "z = y")
+    path: list[tuple[CellId_t, CellId_t]] = graph.get_path("0", "2")
+    assert path == [("0", "1"), ("1", "2")]
+    assert graph.get_path("2", "0") == []
+
+
+def disabled_cell(cell_id: str, code: str) -> Cell:
+    return compile_cell(code, cell_id=cell_id).configure({"disabled": True})
+
+
+def test_disabled_cells_registered() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = 0")
+    graph.register_cell("1", disabled_cell("1", "y = x"))
+    register(graph, "2", "z = y")
+    register(graph, "3", "w = x")
+    assert graph.disabled_cells == {"1", "2"}
+
+    # a disabled parent registered later disables its descendants
+    graph.register_cell("4", disabled_cell("4", "v = 0"))
+    register(graph, "5", "u = v")
+    assert graph.disabled_cells == {"1", "2", "4", "5"}
+
+
+def test_disable_and_enable_cell() -> None:
+    graph = dataflow.DirectedGraph()
+    register(graph, "0", "x = 0")
+    register(graph, "1", "y = x")
+    register(graph, "2", "z = y")
+
+    graph.cells["0"].configure({"disabled": True})
+    graph.disable_cell("0")
+    assert graph.disabled_cells == {"0", "1", "2"}
+    assert graph.cells["1"].disabled_transitively
+
+    graph.cells["0"].configure({"disabled": False})
+    assert graph.enable_cell("0") == set()
+    assert graph.disabled_cells == set()
+    assert not graph.cells["1"].disabled_transitively
+
+
+def test_enable_keeps_cells_disabled_by_other_parents() -> None:
+    graph = dataflow.DirectedGraph()
+    graph.register_cell("0", disabled_cell("0", "x = 0"))
+    graph.register_cell("1", disabled_cell("1", "y = 0"))
+    register(graph, "2", "z = x + y")
+    assert graph.disabled_cells == {"0", "1", "2"}
+
+    graph.cells["0"].configure({"disabled": False})
+    graph.enable_cell("0")
+    assert graph.disabled_cells == {"1", "2"}
+
+
+def test_delete_disabled_cell_enables_descendants() -> None:
+    graph = dataflow.DirectedGraph()
+    graph.register_cell("0", disabled_cell("0", "x = 0"))
+    register(graph, "1", "y = x")
+    register(graph, "2", "z = y")
+    graph.register_cell("3", disabled_cell("3", "w = y"))
+    assert graph.disabled_cells == {"0", "1", "2", "3"}
+
+    graph.delete_cell("0")
+    assert graph.disabled_cells == {"3"}
+    assert not graph.is_disabled("2")
@@ -0,0 +1,127 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from marimo._messaging.cell_output import CellChannel, CellOutput
+from marimo._server.session.console_buffer import ConsoleBuffer
+
+
+def text(buffer: ConsoleBuffer) -> str:
+    return "".join(
+        output.data
+        for output in buffer.to_list()
+        if isinstance(output.data, str)
+    )
+
+
+def assert_counts(buffer: ConsoleBuffer) -> None:
+    """The running counts match the buffered outputs."""
+    outputs = list(buffer)
+    assert buffer.n_bytes == sum(
+        len(o.data) for o in outputs if isinstance(o.data, str)
+    )
+    assert buffer.n_lines == sum(
+        o.data.count("\n") if isinstance(o.data, str) else 1
+        for o in outputs
+    )
+    assert buffer.n_bytes <= buffer.max_bytes
+    assert buffer.n_lines <= buffer.max_lines
+
+
+def test_coalesces_adjacent_outputs() -> None:
+    buffer = ConsoleBuffer()
+    for i in range(100):
+        buffer.append(CellOutput.stdout(f"{i}\n"))
+    buffer.append(CellOutput.stderr("error\n"))
+    buffer.append(CellOutput.stdout("done\n"))
+    assert len(buffer) == 3
+    assert [output.channel for output in buffer.to_list()] == [
+        CellChannel.STDOUT,
+        CellChannel.STDERR,
+        CellChannel.STDOUT,
+    ]
+    assert buffer.to_list()[0].data == "".join(f"{i}\n" for i in range(100))
+    assert_counts(buffer)
+
+
+def test_line_limit_drops_oldest_lines() -> None:
+    buffer = ConsoleBuffer(max_bytes=10_000, max_lines=10)
+    for i in range(25):
+        buffer.append(CellOutput.stdout(f"line {i}\n"))
+        assert_counts(buffer)
+    assert buffer.n_lines == 10
+    assert buffer.n_truncated_lines == 15
+
+    marker, output = buffer.to_list()
+    assert marker.channel == CellChannel.STDERR
+    assert "15 earlier lines" in marker.data
+    assert output.data == "".join(f"line {i}\n" for i in range(15, 25))
+
+
+def test_byte_limit_drops_oldest_characters() -> None:
+    buffer = ConsoleBuffer(max_bytes=100, max_lines=1000)
+    buffer.append(CellOutput.stdout("a" * 80))
+    buffer.append(CellOutput.stderr("b" * 50))
+    assert_counts(buffer)
+    assert buffer.n_bytes == 100
+    assert buffer.n_truncated_bytes == 30
+    assert text(buffer).endswith("a" * 50 + "b" * 50)
+
+    # an output larger than the limit keeps only its end
+    buffer.append(CellOutput.stdout("c" * 150))
+    assert_counts(buffer)
+    assert list(buffer)[-1].data == "c" * 100
+
+
+def test_large_output_is_not_coalesced_further() -> None:
+    buffer = ConsoleBuffer()
+    buffer.append(CellOutput.stdout("a" * 5000))
+    buffer.append(CellOutput.stdout("b"))
+    assert len(buffer) == 2
+    # ... but is merged when listed
+    assert len(buffer.to_list()) == 1
+    assert_counts(buffer)
+
+
+def test_structured_outputs_count_as_one_line() -> None:
+    buffer = ConsoleBuffer(max_bytes=1000, max_lines=3)
+    error = CellOutput(
+        channel=CellChannel.MARIMO_ERROR,
+        mimetype="application/vnd.marimo+error",
+        data=[],
+    )
+    buffer.append(error)
+    buffer.append(CellOutput.stdout("1\n2\n"))
+    assert_counts(buffer)
+    buffer.append(CellOutput.stdout("3\n"))
+    assert_counts(buffer)
+    assert list(buffer)[0].data == "1\n2\n3\n"
+    assert buffer.n_truncated_lines == 1
+
+
+def test_clear_resets_counts() -> None:
+    buffer = ConsoleBuffer(max_bytes=10, max_lines=10)
+    buffer.append(CellOutput.stdout("x" * 20))
+    assert buffer.truncated
+    buffer.clear()
+    assert len(buffer) == 0
+    assert not buffer.truncated
+    assert buffer.to_list() == []
+    assert_counts(buffer)
+
+
+def test_answer_stdin_keeps_counts() -> None:
+    buffer = ConsoleBuffer(max_bytes=1000, max_lines=2)
+    buffer.append(CellOutput.stdout("before\n"))
+    buffer.append(CellOutput.stdin("name?"))
+    assert_counts(buffer)
+
+    assert buffer.answer_stdin("marimo")
+    assert_counts(buffer)
+    assert text(buffer) == "before\nname? marimo\n"
+    # no prompt is waiting anymore
+    assert not buffer.answer_stdin("again")
+
+    # the answer's newline counts towards the line limit
+    buffer.append(CellOutput.stdout("after\n"))
+    assert_counts(buffer)
+    assert text(buffer).endswith("name? marimo\nafter\n")
@@ -0,0 +1,193 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Optional
+
+from marimo._messaging.types import KernelMessage
+from marimo._server.session.outbound_queue import OutboundMessageQueue
+
+
+def cell_op(
+    cell_id: str,
+    output: Optional[str] = None,
+    console: Any = None,
+    status: Optional[str] = None,
+) -> KernelMessage:
+    return (
+        "cell-op",
+        {
+            "cell_id": cell_id,
+            "output": output,
+            "console": console,
+            "status": status,
+            "timestamp": 0,
+        },
+    )
+
+
+def get_all(message_queue: OutboundMessageQueue) -> list[KernelMessage]:
+    return asyncio.run(message_queue.get_all())
+
+
+def test_merges_cell_ops_of_a_cell() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    message_queue.put(cell_op("a", status="running", console=[]))
+    message_queue.put(cell_op("a", console="1"))
+    message_queue.put(cell_op("b", output="b"))
+    message_queue.put(cell_op("a", output="x", console=["2", "3"]))
+    message_queue.put(cell_op("a", output="y"))
+
+    messages = get_all(message_queue)
+    assert [data["cell_id"] for _, data in messages] == ["a", "a", "b"]
+    # an op that clears the console isn't merged with the next one
+    assert messages[0][1]["console"] == []
+    assert messages[1][1]["output"] == "y"
+    assert messages[1][1]["console"] == ["1", "2", "3"]
+    assert message_queue.stats()["messages_merged"] == 2
+
+
+def test_status_change_is_not_merged() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    message_queue.put(cell_op("a", status="queued"))
+    message_queue.put(cell_op("a", status="running"))
+    message_queue.put(cell_op("a", status="running", output="x"))
+    messages = get_all(message_queue)
+    assert [data["status"] for _, data in messages] == ["queued", "running"]
+    assert messages[1][1]["output"] == "x"
+
+
+def test_other_messages_stop_merging() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    message_queue.put(cell_op("a", output="x"))
+    message_queue.put(("remove-ui-elements", {"cell_id": "a"}))
+    message_queue.put(cell_op("a", output="y"))
+    messages = get_all(message_queue)
+    assert [op for op, _ in messages] == [
+        "cell-op",
+        "remove-ui-elements",
+        "cell-op",
+    ]
+
+
+def test_merging_after_messages_were_taken() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    message_queue.put(cell_op("a", output="x"))
+    assert len(get_all(message_queue)) == 1
+    message_queue.put(cell_op("b", output="1"))
+    message_queue.put(cell_op("a", output="y"))
+    message_queue.put(cell_op("a", output="z"))
+    messages = get_all(message_queue)
+    assert [data["output"] for _, data in messages] == ["1", "z"]
+
+
+def test_backpressure() -> None:
+    events: list[str] = []
+    message_queue = OutboundMessageQueue(max_size=4, flush_interval=0)
+    message_queue.attach(
+        on_full=lambda: events.append("full"),
+        on_drained=lambda: events.append("drained"),
+    )
+    for i in range(4):
+        message_queue.put(("banner", {"i": i}))
+    assert events == []
+    message_queue.put(("banner", {"i": 4}))
+    message_queue.put(("banner", {"i": 5}))
+    # the producer is told to pause once
+    assert events == ["full"]
+
+    assert len(get_all(message_queue)) == 6
+    assert events == ["full", "drained"]
+    stats = message_queue.stats()
+    assert stats["times_full"] == 1
+    assert stats["max_queue_depth"] == 6
+
+
+def test_attach_when_full_and_detach() -> None:
+    events: list[str] = []
+    message_queue = OutboundMessageQueue(max_size=1, flush_interval=0)
+    message_queue.put(("banner", {}))
+    message_queue.put(("banner", {}))
+    message_queue.attach(
+        on_full=lambda: events.append("full"),
+        on_drained=lambda: events.append("drained"),
+    )
+    assert events == ["full"]
+    # a consumer that goes away lets the producer resume
+    message_queue.detach()
+    assert events == ["full", "drained"]
+    message_queue.put(("banner", {}))
+    assert events == ["full", "drained"]
+
+
+def test_get_all_waits_for_a_message() -> None:
+    async def run() -> list[KernelMessage]:
+        message_queue = OutboundMessageQueue(flush_interval=0.01)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, message_queue.put, cell_op("a", output="x"))
+        loop.call_later(0.015, message_queue.put, cell_op("a", output="y"))
+        return await asyncio.wait_for(message_queue.get_all(), timeout=5)
+
+    messages = asyncio.run(run())
+    # messages that arrive within the flush interval are merged
+    assert [data["output"] for _, data in messages] == ["y"]
+
+
+def test_record_sent() -> None:
+    message_queue = OutboundMessageQueue()
+    message_queue.record_sent(100)
+    message_queue.record_sent(50)
+    stats = message_queue.stats()
+    assert stats["messages_sent"] == 2
+    assert stats["bytes_sent"] == 150
+    assert stats["bytes_per_second"] > 0
+
+
+def append(cell_id: str, index: int) -> KernelMessage:
+    return (
+        "cell-output-append",
+        {"cell_id": cell_id, "index": index, "output": {}},
+    )
+
+
+def test_keeps_one_waiting_incremental_op() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    for index in range(3):
+        message_queue.put(append("a", index))
+        message_queue.put(append("b", index))
+    message_queue.put(("variables-delta", {"variables": [], "removed": []}))
+    message_queue.put(("variables-delta", {"variables": [], "removed": []}))
+
+    messages = get_all(message_queue)
+    # each is expanded to the latest state when sent
+    assert [(op, data.get("index")) for op, data in messages] == [
+        ("cell-output-append", 0),
+        ("cell-output-append", 0),
+        ("variables-delta", None),
+    ]
+    assert message_queue.stats()["messages_merged"] == 5
+
+    # once sent, the next one waits again
+    message_queue.put(append("a", 3))
+    assert get_all(message_queue) == [append("a", 3)]
+
+
+def test_whole_state_resets_incremental_ops() -> None:
+    message_queue = OutboundMessageQueue(flush_interval=0)
+    message_queue.put(append("a", 0))
+    message_queue.put(cell_op("a", output="x"))
+    message_queue.put(append("a", 0))
+    message_queue.put(("variables-delta", {"variables": [], "removed": []}))
+    message_queue.put(("variables", {"variables": []}))
+    message_queue.put(("variables-delta", {"variables": [], "removed": []}))
+
+    # a later append or delta isn't merged into one queued before the
+    # whole output or variables, which would show the whole state last
+    assert [op for op, _ in get_all(message_queue)] == [
+        "cell-output-append",
+        "cell-op",
+        "cell-output-append",
+        "variables-delta",
+        "variables",
+        "variables-delta",
+    ]
@@ -0,0 +1,76 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from marimo._messaging.cell_output import CellChannel, CellOutput
+from marimo._messaging.ops import CellOp, CellOutputAppend, serialize
+from marimo._server.session.session_view import SessionView
+
+
+def html(data: str) -> CellOutput:
+    return CellOutput(
+        channel=CellChannel.OUTPUT, mimetype="text/html", data=data
+    )
+
+
+def add(view: SessionView, operation: CellOp | CellOutputAppend) -> None:
+    view.add_raw_operation((operation.name, serialize(operation)))
+
+
+def output_data(view: SessionView, cell_id: str) -> str:
+    cell_op = view.get_cell_operation(cell_id)
+    assert cell_op is not None and cell_op.output is not None
+    assert isinstance(cell_op.output.data, str)
+    return cell_op.output.data
+
+
+def test_appended_items_are_stacked() -> None:
+    view = SessionView()
+    add(view, CellOp(cell_id="a", status="running"))
+    for index, item in enumerate(["first", "second", "third"]):
+        add(
+            view,
+            CellOutputAppend(cell_id="a", index=index, output=html(item)),
+        )
+
+    data = output_data(view, "a")
+    assert data.count("<div>") == 3
+    assert data.index("first") < data.index("second") < data.index("third")
+    cell_op = view.get_cell_operation("a")
+    assert cell_op is not None and cell_op.status == "running"
+
+    # replayed operations have the stacked output too
+    (replayed,) = [op for op in view.operations if isinstance(op, CellOp)]
+    assert replayed.output is not None
+    assert replayed.output.data == data
+
+
+def test_index_zero_starts_a_new_stack() -> None:
+    view = SessionView()
+    add(view, CellOutputAppend(cell_id="a", index=0, output=html("old")))
+    add(view, CellOutputAppend(cell_id="a", index=1, output=html("old")))
+    assert output_data(view, "a").count("old") == 2
+
+    add(view, CellOutputAppend(cell_id="a", index=0, output=html("new")))
+    data = output_data(view, "a")
+    assert "old" not in data and "new" in data
+
+
+def test_whole_output_replaces_stack() -> None:
+    view = SessionView()
+    add(view, CellOutputAppend(cell_id="a", index=0, output=html("item")))
+    add(view, CellOp(cell_id="a", output=html("whole")))
+    assert output_data(view, "a") == "whole"
+
+    # an append that doesn't follow the current stack is dropped
+    add(view, CellOutputAppend(cell_id="a", index=1, output=html("item")))
+    assert output_data(view, "a") == "whole"
+
+
+def test_status_change_keeps_stacked_output() -> None:
+    view = SessionView()
+    add(view, CellOp(cell_id="a", status="running"))
+    add(view, CellOutputAppend(cell_id="a", index=0, output=html("item")))
+    add(view, CellOp(cell_id="a", status="idle"))
+    cell_op = view.get_cell_operation("a")
+    assert cell_op is not None and cell_op.status == "idle"
+    assert "item" in output_data(view, "a")
@@ -0,0 +1,319 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+import pytest
+
+from marimo._messaging.cell_output import CellChannel, CellOutput
+from marimo._messaging.ops import (
+    CellOp,
+    CellOutputAppend,
+    VariableDeclaration,
+    Variables,
+    VariablesDelta,
+    serialize,
+)
+from marimo._plugins.ui._impl.dataframes.transforms import Transformations
+from marimo._runtime.requests import (
+    ControlRequest,
+    CreationRequest,
+    DeleteRequest,
+    ExecuteMultipleRequest,
+    SetUIElementValueRequest,
+    StopRequest,
+)
+from marimo._utils.parse_dataclass import parse_raw, to_snake
+
+
+def reference_build(value: Any, cls: Any) -> Any:
+    """Decode `value` by inspecting `cls` on every call.
+
+    The decoder that `parse_raw` used before decoders were compiled and
+    cached; compiled decoders must build the same values.
+    """
+    origin_cls = get_origin(cls)
+    if origin_cls in (list, set):
+        (arg_type,) = get_args(cls)
+        return origin_cls(reference_build(v, arg_type) for v in value)
+    elif origin_cls == tuple:
+        arg_types = get_args(cls)
+        if len(arg_types) == 2 and arg_types[1] is Ellipsis:
+            return tuple(reference_build(v, arg_types[0]) for v in value)
+        return tuple(reference_build(v, t) for v, t in zip(value, arg_types))
+    elif origin_cls == dict:
+        key_type, value_type = get_args(cls)
+        return {
+            reference_build(k, key_type): reference_build(v, value_type)
+            for k, v in value.items()
+        }
+    elif origin_cls == Union:
+        for arg_type in get_args(cls):
+            try:
+                return reference_build(value, arg_type)
+            except Exception:
+                continue
+        raise ValueError(f"Value '{value}' does not fit any type of the union")
+    elif origin_cls is Literal:
+        arg_types = get_args(cls)
+        first_arg_type = arg_types[0]
+        if (
+            len(arg_types) == 1
+            and isinstance(first_arg_type, Enum)
+            and first_arg_type.value == value
+        ):
+            return first_arg_type
+        if value not in arg_types:
+            raise ValueError(
+                f"Value '{value}' does not fit any type of the literal"
+            )
+        return value
+    elif type(cls) == type(Enum) and issubclass(cls, Enum):
+        return cls(value)
+    elif dataclasses.is_dataclass(cls):
+        types = get_type_hints(cls)
+        return cls(
+            **{
+                to_snake(k): reference_build(v, types[to_snake(k)])
+                for k, v in value.items()
+            }
+        )
+    return value
+
+
+def assert_equivalent(message: dict[str, Any], cls: Type[Any]) -> Any:
+    expected = reference_build(message, cls)
+    assert parse_raw(message, cls) == expected
+    assert parse_raw(json.dumps(message).encode(), cls) == expected
+    return expected
+
+
+class Color(Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+@dataclass
+class Leaf:
+    name: str
+    weight: float = 1.0
+
+
+@dataclass
+class Tree:
+    leaves: List[Leaf]
+    tags: Set[str]
+    pair: Tuple[int, Leaf]
+    rest: Tuple[Leaf, ...]
+    by_name: Dict[str, Leaf]
+    color: Color
+    mode: Literal["a", "b"]
+    only_red: Literal[Color.RED]
+    parent: Optional[Leaf] = None
+    children: Optional[List[Tree]] = None
+
+
+def test_containers_and_camel_case() -> None:
+    tree = assert_equivalent(
+        {
+            "leaves": [{"name": "x"}, {"name": "y", "weight": 2}],
+            "tags": ["a", "b", "a"],
+            "pair": [1, {"name": "p"}],
+            "rest": [{"name": "r1"}, {"name": "r2"}],
+            "byName": {"k": {"name": "v"}},
+            "color": "blue",
+            "mode": "b",
+            "onlyRed": "red",
+            "parent": None,
+            "children": [
+                {
+                    "leaves": [],
+                    "tags": [],
+                    "pair": [2, {"name": "q"}],
+                    "rest": [],
+                    "by_name": {},
+                    "color": "red",
+                    "mode": "a",
+                    "only_red": "red",
+                    "parent": {"name": "root"},
+                }
+            ],
+        },
+        Tree,
+    )
+    assert tree.tags == {"a", "b"}
+    assert tree.pair == (1, Leaf(name="p"))
+    assert tree.color is Color.BLUE
+    assert tree.only_red is Color.RED
+    assert tree.children[0].parent == Leaf(name="root")
+
+
+def test_invalid_literal_raises() -> None:
+    message = {"leaves": [], "tags": [], "pair": [0, {"name": "p"}]}
+    message.update(
+        {"rest": [], "byName": {}, "color": "red", "onlyRed": "red"}
+    )
+    message["mode"] = "c"
+    with pytest.raises(ValueError):
+        reference_build(message, Tree)
+    with pytest.raises(ValueError):
+        parse_raw(message, Tree)
+
+
+def test_discriminated_union() -> None:
+    transformations = assert_equivalent(
+        {
+            "transforms": [
+                {
+                    "type": "aggregate",
+                    "columnIds": ["a"],
+                    "aggregations": ["sum", "mean"],
+                },
+                {
+                    "type": "column_conversion",
+                    "columnId": "a",
+                    "dataType": "int64",
+                    "errors": "raise",
+                },
+                {
+                    "type": "filter_rows",
+                    "operation": "keep_rows",
+                    "where": [
+                        {"columnId": "a", "operator": ">", "value": 1},
+                        {"columnId": "b", "operator": "is_nan"},
+                    ],
+                },
+                {
+                    "type": "group_by",
+                    "columnIds": ["a", "b"],
+                    "dropNa": True,
+                    "aggregation": "count",
+                },
+                {
+                    "type": "rename_column",
+                    "columnId": "a",
+                    "newColumnId": "c",
+                },
+                {"type": "select_columns", "columnIds": ["c"]},
+                {
+                    "type": "sort_column",
+                    "columnId": "c",
+                    "ascending": False,
+                    "naPosition": "last",
+                },
+                {"type": "shuffle_rows", "seed": 1},
+                {"type": "sample_rows", "n": 3, "replace": True, "seed": 2},
+            ]
+        },
+        Transformations,
+    )
+    assert [type(t).__name__ for t in transformations.transforms] == [
+        "AggregateTransform",
+        "ColumnConversionTransform",
+        "FilterRowsTransform",
+        "GroupByTransform",
+        "RenameColumnTransform",
+        "SelectColumnsTransform",
+        "SortColumnTransform",
+        "ShuffleRowsTransform",
+        "SampleRowsTransform",
+    ]
+
+
+def test_discriminated_union_with_invalid_arm_raises() -> None:
+    message = {"transforms": [{"type": "shuffle_rows", "seed": 1, "x": 2}]}
+    with pytest.raises(Exception):
+        reference_build(message, Transformations)
+    with pytest.raises(ValueError):
+        parse_raw(message, Transformations)
+
+
+@dataclass
+class Requests:
+    requests: List[ControlRequest]
+
+
+def test_union_decoded_by_first_fit() -> None:
+    requests = assert_equivalent(
+        {
+            "requests": [
+                {"executionRequests": [{"cellId": "0", "code": "x = 0"}]},
+                {
+                    "executionRequests": [{"cellId": "1", "code": "y"}],
+                    "setUiElementValueRequest": {
+                        "idsAndValues": [["a", 1], ["b", [1, 2]]]
+                    },
+                },
+                {"cellId": "2"},
+                {"idsAndValues": [["a", {"k": "v"}]]},
+                {},
+            ]
+        },
+        Requests,
+    )
+    assert [type(r) for r in requests.requests] == [
+        ExecuteMultipleRequest,
+        CreationRequest,
+        DeleteRequest,
+        SetUIElementValueRequest,
+        # an empty request is the first union type without fields
+        StopRequest,
+    ]
+    creation = requests.requests[1]
+    assert isinstance(creation.execution_requests, tuple)
+    assert creation.set_ui_element_value_request.ids_and_values == [
+        ("a", 1),
+        ("b", [1, 2]),
+    ]
+
+
+def test_union_that_fits_no_type_raises() -> None:
+    with pytest.raises(ValueError):
+        parse_raw({"requests": [{"unknown": 1}]}, Requests)
+
+
+def test_round_trip_of_kernel_messages() -> None:
+    output = CellOutput(
+        channel=CellChannel.OUTPUT, mimetype="text/html", data="<p>x</p>"
+    )
+    operations = [
+        CellOp(
+            cell_id="a",
+            output=output,
+            console=[CellOutput.stdout("1\n"), CellOutput.stderr("2\n")],
+            status="running",
+        ),
+        CellOp(cell_id="a", console=CellOutput.stdout("1\n")),
+        CellOutputAppend(cell_id="a", index=2, output=output),
+        Variables(
+            variables=[
+                VariableDeclaration(name="x", declared_by=["a"], used_by=[])
+            ]
+        ),
+        VariablesDelta(
+            variables=[
+                VariableDeclaration(name="y", declared_by=["a"], used_by=["b"])
+            ],
+            removed=["x"],
+        ),
+    ]
+    for operation in operations:
+        parsed = assert_equivalent(serialize(operation), type(operation))
+        assert parsed == operation
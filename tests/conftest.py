@@ -0,0 +1,8 @@
+# Copyright 2024 Marimo. All rights reserved.
+import os
+import sys
+
+# marimo is vendored in the addon's directory
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "marimo_blender")
+)